@@ -0,0 +1,130 @@
+"""
+benchmarks/bench_crawler.py
+
+Crawl speed with the site-wide collectors on (link graph, anchor and
+keyword indexes, word counts) on a local site where every page is also
+reachable through a redirect, and a check that each page is counted once.
+
+Usage:
+    python benchmarks/bench_crawler.py [--pages 500] [--concurrency 16]
+
+The home page links to every page /p/i twice: directly and through /r/i,
+a 301 to /p/i. Every page links back to /p/0 with the anchor "home page".
+Whichever of /p/i and /r/i is fetched first, the page must be processed
+once: n + 1 pages, n redirects skipped as duplicates, /p/0 with exactly
+n + 1 inlinks in the anchor index, "home page" on exactly n pages of the
+keyword index and n occurrences of "home" in the word counts. The script
+exits with an error if any count is off.
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "seo_bundle"))
+
+from core.anchor_index import AnchorIndex  # noqa: E402
+from core.crawler import Crawler  # noqa: E402
+from core.heavy_hitters import WordFrequencySketch  # noqa: E402
+from core.keyword_index import SiteKeywordIndex  # noqa: E402
+from core.link_graph import LinkGraphBuilder  # noqa: E402
+
+
+def serve(pages: int, port_queue) -> None:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        wbufsize = 1 << 16
+
+        def do_GET(self):
+            if self.path.startswith("/r/"):
+                self.send_response(301)
+                self.send_header("Location", "/p/" + self.path[3:])
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            if self.path == "/":
+                links = "".join(f'<a href="/p/{i}">page {i}</a><a href="/r/{i}">alias {i}</a>' for i in range(pages))
+                body = f"<html><head><title>Site index</title></head><body>{links}</body></html>"
+            elif self.path.startswith("/p/"):
+                i = self.path[3:]
+                body = (f"<html><head><title>Page {i}</title></head><body><h1>Page {i}</h1>"
+                        f"<p>Words of page {i}.</p><a href=\"/p/0\">home page</a></body></html>")
+            else:
+                self.send_response(404)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            data = body.encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    port_queue.put(server.server_address[1])
+    server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=500, help="pages besides the home page")
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+
+    port_queue = multiprocessing.Queue()
+    server = multiprocessing.Process(target=serve, args=(args.pages, port_queue), daemon=True)
+    server.start()
+    base = f"http://127.0.0.1:{port_queue.get()}"
+
+    crawler = Crawler(
+        [base + "/"],
+        max_depth=2,
+        max_pages=3 * args.pages,
+        concurrency=args.concurrency,
+        per_host=args.concurrency,
+        crawl_delay=0,
+        respect_robots=False,
+        link_graph=LinkGraphBuilder(),
+        anchor_index=AnchorIndex(),
+        keyword_index=SiteKeywordIndex(["home page"]),
+        word_frequency=WordFrequencySketch(),
+    )
+    start = time.perf_counter()
+    yielded = sum(1 for _ in crawler.crawl())
+    crawl_s = time.perf_counter() - start
+    server.terminate()
+
+    n = args.pages
+    graph = crawler.link_graph.build()
+    checks = {
+        "pages yielded": (yielded, n + 1),
+        "redirects skipped": (crawler.stats["duplicates"], n),
+        "link graph crawled pages": (int(graph.crawled.sum()), n + 1),
+        "anchor index pages": (crawler.anchor_index.pages, n + 1),
+        "inlinks of /p/0": (crawler.anchor_index.inlinks(base + "/p/0"), n + 1),
+        "keyword index pages": (len(crawler.keyword_index), n + 1),
+        "pages with 'home page'": (next(crawler.keyword_index.report())["pages"], n),
+        "word count pages": (crawler.word_frequency.pages, n + 1),
+        "count of 'home'": (crawler.word_frequency.words.count("home"), n),
+    }
+    print(f"pages: {n + 1:,} (+{n:,} redirects)  crawl: {crawl_s:.2f} s  "
+          f"({crawler.stats['fetched'] / crawl_s:.0f} fetches/s, concurrency {args.concurrency})")
+    failed = False
+    for name, (got, expected) in checks.items():
+        ok = got == expected
+        failed |= not ok
+        print(f"{name:28} {got:>8,}  {'ok' if ok else f'expected {expected:,}'}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+benchmarks/bench_fetch_engine.py
+
+Compares the sequential bulk loop (tool.run(url) per URL) against
+FetchEngine.run_tools() on URLs served by a local HTTP server that adds a
+fixed latency to every response.
+
+Usage:
+    python benchmarks/bench_fetch_engine.py [--urls 1000] [--latency 0.05]
+        [--concurrency 64] [--processes 0] [--sequential-sample 100]
+
+The server runs in its own process so it does not compete with the client for
+the GIL. The sequential loop is timed on a sample of the URLs and
+extrapolated, since running it over the full list just measures
+latency * urls. Fetch-only and fetch-plus-tool timings are reported
+separately: once the network wait is overlapped, the tool's parse time is
+what is left, and it only shrinks further with --processes on a multi-core
+machine.
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "seo_bundle"))
+
+from core.document import fetch_document  # noqa: E402
+from core.fetch_engine import FetchEngine  # noqa: E402
+from tools.h1_tag_extractor.h1_tag_extractor import H1TagExtractor  # noqa: E402
+
+PAGE = (
+    "<html><head><title>Benchmark page</title></head><body>"
+    "<h1>Benchmark</h1>" + "<p>Lorem ipsum dolor sit amet.</p>" * 200 +
+    "</body></html>"
+).encode()
+
+
+def serve(latency: float, port_queue) -> None:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Send headers and body in one write so Nagle/delayed ACK does not add latency
+        wbufsize = 1 << 16
+
+        def do_GET(self):
+            time.sleep(latency)
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(PAGE)))
+            self.end_headers()
+            self.wfile.write(PAGE)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    server.request_queue_size = 1024
+    port_queue.put(server.server_address[1])
+    server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--urls", type=int, default=1000)
+    parser.add_argument("--latency", type=float, default=0.05, help="server latency per response in seconds")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--processes", type=int, default=0, help="worker processes for running the tool")
+    parser.add_argument("--sequential-sample", type=int, default=100)
+    args = parser.parse_args()
+
+    port_queue = multiprocessing.Queue()
+    server = multiprocessing.Process(target=serve, args=(args.latency, port_queue), daemon=True)
+    server.start()
+    base = f"http://127.0.0.1:{port_queue.get()}"
+    urls = [f"{base}/page/{i}" for i in range(args.urls)]
+    tool = H1TagExtractor()
+
+    sample = urls[:args.sequential_sample]
+    start = time.perf_counter()
+    for url in sample:
+        fetch_document(url)
+    sequential_fetch = (time.perf_counter() - start) / len(sample) * len(urls)
+
+    start = time.perf_counter()
+    for url in sample:
+        tool.run(url)
+    sequential = (time.perf_counter() - start) / len(sample) * len(urls)
+
+    engine = FetchEngine(concurrency=args.concurrency, per_host=args.concurrency, processes=args.processes)
+    start = time.perf_counter()
+    fetched = sum(1 for result in engine.fetch_all(urls) if result.document is not None)
+    concurrent_fetch = time.perf_counter() - start
+
+    start = time.perf_counter()
+    analyzed = sum(1 for _ in engine.run_tools({"h1": tool}, urls))
+    concurrent = time.perf_counter() - start
+
+    engine.close()
+    server.terminate()
+    print(f"urls: {len(urls)} (fetched {fetched}, analyzed {analyzed}), latency: {args.latency * 1000:.0f} ms, "
+          f"concurrency: {args.concurrency}, processes: {args.processes}, cpus: {os.cpu_count()}")
+    print(f"{'':24}{'sequential*':>12}{'FetchEngine':>12}{'speedup':>9}")
+    print(f"{'fetch only':24}{sequential_fetch:11.2f}s{concurrent_fetch:11.2f}s{sequential_fetch / concurrent_fetch:8.1f}x")
+    print(f"{'fetch + H1TagExtractor':24}{sequential:11.2f}s{concurrent:11.2f}s{sequential / concurrent:8.1f}x")
+    print(f"* extrapolated from the first {len(sample)} URLs")
+
+
+if __name__ == "__main__":
+    main()
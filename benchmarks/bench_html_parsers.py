@@ -0,0 +1,116 @@
+"""
+benchmarks/bench_html_parsers.py
+
+Parse time and peak memory per HTML parser backend:
+
+    bs4+html.parser   BeautifulSoup with the pure-Python parser (the old default)
+    bs4+lxml          BeautifulSoup with lxml (make_soup default)
+    lxml.html         a bare lxml.html tree (make_lxml_tree)
+
+Usage:
+    python benchmarks/bench_html_parsers.py [corpus_dir] [--repeat 3]
+
+corpus_dir should contain saved .html pages. Without it, a synthetic corpus
+of large product-listing style pages (0.5, 2 and 8 MB) is generated in the
+system temp directory.
+
+Each backend/page pair runs in a fresh child process so peak RSS reflects
+that parse alone; it includes libxml2's C allocations, which tracemalloc
+cannot see.
+"""
+
+import argparse
+import glob
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "seo_bundle"))
+
+BACKENDS = ("bs4+html.parser", "bs4+lxml", "lxml.html")
+
+
+def synthetic_page(target_bytes: int) -> bytes:
+    row = (
+        '<div class="product"><h2><a href="/p/{i}">Product {i}</a></h2>'
+        '<img src="/img/{i}.jpg" alt="Product {i}"><p class="price">$ {i}.99</p>'
+        '<p>Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod tempor.</p></div>\n'
+    )
+    parts = ['<!DOCTYPE html><html><head><meta charset="utf-8"><title>Listing</title></head><body>']
+    size, i = 0, 0
+    while size < target_bytes:
+        chunk = row.format(i=i)
+        parts.append(chunk)
+        size += len(chunk)
+        i += 1
+    parts.append("</body></html>")
+    return "".join(parts).encode()
+
+
+def parse_once(backend: str, path: str, repeat: int, queue) -> None:
+    from core.utils import make_lxml_tree, make_soup
+
+    with open(path, "rb") as f:
+        content = f.read()
+    text = content.decode("utf-8", errors="replace")
+    baseline_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        if backend == "bs4+html.parser":
+            tree = make_soup(text, "html.parser")
+        elif backend == "bs4+lxml":
+            tree = make_soup(text, "lxml")
+        else:
+            tree = make_lxml_tree(content, encoding="utf-8")
+        timings.append(time.perf_counter() - start)
+        del tree
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    queue.put((min(timings), max(0, peak_kb - baseline_kb) / 1024))
+
+
+def measure(backend: str, path: str, repeat: int):
+    queue = multiprocessing.Queue()
+    proc = multiprocessing.Process(target=parse_once, args=(backend, path, repeat, queue))
+    proc.start()
+    result = queue.get()
+    proc.join()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("corpus_dir", nargs="?")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.corpus_dir:
+        pages = sorted(glob.glob(os.path.join(args.corpus_dir, "*.html")))
+    else:
+        corpus = os.path.join(tempfile.gettempdir(), "seo_bundle_parser_corpus")
+        os.makedirs(corpus, exist_ok=True)
+        pages = []
+        for mb in (0.5, 2, 8):
+            path = os.path.join(corpus, f"listing_{mb}mb.html")
+            if not os.path.exists(path):
+                with open(path, "wb") as f:
+                    f.write(synthetic_page(int(mb * 1024 * 1024)))
+            pages.append(path)
+
+    print(f"{'page':28}{'size MB':>9}  " + "".join(f"{b:>26}" for b in BACKENDS))
+    print(f"{'':28}{'':>9}  " + "".join(f"{'time s / peak MB':>26}" for _ in BACKENDS))
+    for path in pages:
+        size_mb = os.path.getsize(path) / (1024 * 1024)
+        cells = []
+        for backend in BACKENDS:
+            seconds, peak_mb = measure(backend, path, args.repeat)
+            cells.append(f"{seconds:14.3f} / {peak_mb:8.1f}")
+        print(f"{os.path.basename(path)[:28]:28}{size_mb:9.2f}  " + "".join(f"{c:>26}" for c in cells))
+
+
+if __name__ == "__main__":
+    main()
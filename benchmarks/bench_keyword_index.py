@@ -0,0 +1,81 @@
+"""
+benchmarks/bench_keyword_index.py
+
+Checking a keyword list against one page: a scan of the token list per
+keyword (what KeywordPositionEstimator used to do) against the positional
+index of core/keyword_index.py.
+
+Usage:
+    python benchmarks/bench_keyword_index.py [--words 5000] [--keywords 500]
+
+The page has --words Zipf-distributed words, a title and 20 headings. The
+keyword list mixes one-, two- and three-word phrases taken from the text
+with phrases that do not occur. The scan is given the same phrases and
+matches them token by token; its title/heading checks are left out, so it
+does less work than the index does.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "seo_bundle"))
+
+from core.keyword_index import PageKeywordIndex  # noqa: E402
+from core.text import tokenize  # noqa: E402
+
+VOCABULARY = 3000
+
+
+def scan(tokens, phrase):
+    n = len(phrase)
+    return [i for i in range(len(tokens) - n + 1) if tokens[i:i + n] == phrase]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--words", type=int, default=5000, help="words on the page")
+    parser.add_argument("--keywords", type=int, default=500, help="keywords to check")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    vocabulary = [f"word{i}" for i in range(VOCABULARY)]
+    ids = np.minimum(rng.zipf(1.3, args.words) - 1, VOCABULARY - 1)
+    tokens = [vocabulary[i] for i in ids]
+    title = " ".join(tokens[:8])
+    headings = [(2, " ".join(tokens[i:i + 5])) for i in range(0, args.words, max(args.words // 20, 1))]
+
+    keywords = []
+    for k in range(args.keywords):
+        length = 1 + k % 3
+        if k % 4 == 3:
+            keywords.append(" ".join(vocabulary[i] for i in rng.integers(0, VOCABULARY, length)))
+        else:
+            start = int(rng.integers(0, args.words - length))
+            keywords.append(" ".join(tokens[start:start + length]))
+
+    start = time.perf_counter()
+    scanned = [scan(tokens, tokenize(keyword)) for keyword in keywords]
+    scan_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    index = PageKeywordIndex(tokens, title, headings)
+    build_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    hits = index.lookup_many(keywords)
+    lookup_s = time.perf_counter() - start
+
+    assert [hit["positions"] for hit in hits] == scanned
+    found = sum(1 for hit in hits if hit["occurrences"])
+    print(f"words: {args.words:,}  keywords: {len(keywords):,}  found: {found:,}")
+    print(f"scan per keyword   {scan_s * 1000:8.1f} ms")
+    print(f"build index        {build_s * 1000:8.1f} ms")
+    print(f"lookup_many        {lookup_s * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
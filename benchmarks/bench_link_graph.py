@@ -0,0 +1,88 @@
+"""
+benchmarks/bench_link_graph.py
+
+Build time, memory and analysis time of the internal link graph
+(core/link_graph.py) for a synthetic site.
+
+Usage:
+    python benchmarks/bench_link_graph.py [--pages 500000] [--links 10]
+
+Pages form a hierarchy (page i links to its children 10i+1..10i+10) and
+every page also links to the 20 "navigation" pages plus --links related
+pages drawn with a skew towards low page numbers, like category and
+popular pages on a real site. One page in fifty is left out of the link
+structure and only listed in the sitemap, so it shows up as an orphan;
+its children are then only reachable through related links.
+"""
+
+import argparse
+import os
+import resource
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "seo_bundle"))
+
+from core.link_graph import LinkGraphBuilder  # noqa: E402
+
+NAV_PAGES = 20
+
+
+def page_url(i: int) -> str:
+    return f"https://www.example.com/category-{i % 97}/page-{i}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=500_000, help="number of crawled pages")
+    parser.add_argument("--links", type=int, default=10, help="content links per page (plus navigation)")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    urls = [page_url(i) for i in range(args.pages)]
+    linked = np.array([i for i in range(args.pages) if i % 50 != 49])
+    nav = [urls[i] for i in range(NAV_PAGES)]
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    start = time.perf_counter()
+    builder = LinkGraphBuilder()
+    for i in range(args.pages):
+        if i % 50 == 49:
+            continue
+        related = linked[np.minimum((rng.pareto(1.2, args.links) * 50).astype(np.int64), len(linked) - 1)]
+        children = [child for child in range(10 * i + 1, min(10 * i + 11, args.pages)) if child % 50 != 49]
+        builder.add_page(urls[i], nav + [urls[t] for t in children] + [urls[t] for t in related])
+    builder.add_sitemap_urls(urls)
+    collect_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    graph = builder.build()
+    build_s = time.perf_counter() - start
+    del builder
+    rss_mb = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before) / 1024
+
+    start = time.perf_counter()
+    rank = graph.pagerank()
+    pagerank_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    depth = graph.click_depth(urls[0])
+    depth_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    orphans, dead_ends = graph.orphans(), graph.dead_ends()
+    orphan_s = time.perf_counter() - start
+
+    print(f"pages: {graph.n_nodes:,}  links: {graph.n_edges:,}")
+    print(f"CSR arrays: {graph.nbytes / 1e6:.1f} MB   peak RSS growth (with URL strings): {rss_mb:.0f} MB")
+    print(f"collect edges      {collect_s:7.2f} s")
+    print(f"build CSR          {build_s:7.2f} s")
+    print(f"pagerank           {pagerank_s:7.2f} s   top page: {graph.urls[int(rank.argmax())]}")
+    print(f"click depth        {depth_s:7.2f} s   max depth: {depth.max()}, unreachable: {(depth < 0).sum():,}")
+    print(f"orphans/dead ends  {orphan_s:7.2f} s   {len(orphans):,} orphans, {len(dead_ends):,} dead ends")
+
+
+if __name__ == "__main__":
+    main()
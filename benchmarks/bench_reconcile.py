@@ -0,0 +1,79 @@
+"""
+benchmarks/bench_reconcile.py
+
+Time and memory of sitemap-vs-crawl reconciliation (core/reconcile.py)
+for a synthetic site.
+
+Usage:
+    python benchmarks/bench_reconcile.py [--urls 1000000] [--links 10]
+
+The sitemap lists --urls pages. The crawl reaches 95% of them plus 5%
+pages that are not in the sitemap, each linking to --links pages drawn at
+random. One crawled page in a hundred answers 404, one in a hundred
+redirects and one in fifty has a canonical tag pointing elsewhere.
+"""
+
+import argparse
+import os
+import resource
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "seo_bundle"))
+
+from core.reconcile import SitemapReconciler  # noqa: E402
+
+
+def page_url(i: int) -> str:
+    return f"https://www.example.com/category-{i % 97}/page-{i}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--urls", type=int, default=1_000_000, help="URLs in the sitemap")
+    parser.add_argument("--links", type=int, default=10, help="links per crawled page")
+    args = parser.parse_args()
+
+    n = args.urls
+    rng = np.random.default_rng(42)
+    crawled = [i for i in range(n) if i % 20] + list(range(n, n + n // 20))
+    targets = rng.integers(0, n + n // 20, (len(crawled), args.links)).tolist()
+    urls = [page_url(i) for i in range(n + n // 20)]
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    with SitemapReconciler() as reconciler:
+        start = time.perf_counter()
+        reconciler.add_sitemap_urls(urls[:n])
+        sitemap_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for i, page_targets in zip(crawled, targets):
+            redirected = i % 100 == 7
+            status = 404 if i % 100 == 1 else 301 if redirected else 200
+            reconciler.add_page(urls[i], status, [urls[t] for t in page_targets],
+                                canonical=urls[i - 2] if i % 50 == 3 else None,
+                                final_url=urls[i - 1] if redirected else None,
+                                final_status=200 if redirected else None)
+        crawl_s = time.perf_counter() - start
+        rss_mb = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before) / 1024
+
+        start = time.perf_counter()
+        result = reconciler.reconcile()
+        reconcile_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        rows = sum(1 for _ in result.rows())
+        rows_s = time.perf_counter() - start
+
+    print(f"sitemap URLs: {n:,}  crawled pages: {len(crawled):,}  links: {len(crawled) * args.links:,}")
+    print(f"peak RSS growth while collecting: {rss_mb:.0f} MB")
+    print(f"collect sitemap    {sitemap_s:7.2f} s")
+    print(f"collect crawl      {crawl_s:7.2f} s")
+    print(f"reconcile          {reconcile_s:7.2f} s   {result.counts}")
+    print(f"write {rows:,} rows {rows_s:7.2f} s")
+
+
+if __name__ == "__main__":
+    main()
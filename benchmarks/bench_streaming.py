@@ -0,0 +1,110 @@
+"""
+benchmarks/bench_streaming.py
+
+Peak memory and time for analyzing one very large page with the
+streamable tools, in two modes:
+
+    document   fetch_document() + run_document() (body kept, lxml tree built)
+    streaming  stream_document() + run_document() (chunks fed to the indexer)
+
+Usage:
+    python benchmarks/bench_streaming.py [--mb 30] [--max-mb 50]
+
+The page is a synthetic product listing served from a local HTTP server in
+its own process. Each mode runs in a fresh child process so peak RSS
+reflects that mode alone.
+"""
+
+import argparse
+import multiprocessing
+import os
+import resource
+import sys
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "seo_bundle"))
+
+from bench_html_parsers import synthetic_page  # noqa: E402
+
+TOOLS = (
+    ("h1_tag_extractor", "H1TagExtractor"),
+    ("heading_tag_structure_analyzer", "HeadingTagStructureAnalyzer"),
+    ("image_alt_tag_checker", "ImageAltTagChecker"),
+    ("social_meta_tag_extractor", "SocialMetaTagExtractor"),
+    ("canonical_tag_checker", "CanonicalTagChecker"),
+    ("meta_title_length_checker", "MetaTitleLengthChecker"),
+    ("internal_link_counter", "InternalLinkCounter"),
+)
+
+
+def serve(page: bytes, port_queue) -> None:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(page)))
+            self.end_headers()
+            try:
+                self.wfile.write(page)
+            except ConnectionError:
+                pass  # the streaming client hung up at its size limit
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    port_queue.put(server.server_address[1])
+    server.serve_forever()
+
+
+def analyze(mode: str, url: str, max_bytes: int, queue) -> None:
+    import importlib
+
+    from core.document import fetch_document
+    from core.streaming import stream_document
+
+    tools = [getattr(importlib.import_module(f"tools.{module}.{module}"), cls)() for module, cls in TOOLS]
+    baseline_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    start = time.perf_counter()
+    if mode == "streaming":
+        doc = stream_document(url, max_bytes=max_bytes)
+    else:
+        doc = fetch_document(url)
+    results = [tool.run_document(doc) for tool in tools]
+    seconds = time.perf_counter() - start
+
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    images = next(r["total_images"] for r in results if "total_images" in r)
+    queue.put((seconds, max(0, peak_kb - baseline_kb) / 1024, images, doc.truncated))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mb", type=float, default=30, help="size of the synthetic page")
+    parser.add_argument("--max-mb", type=float, default=50, help="streaming body size limit")
+    args = parser.parse_args()
+
+    port_queue = multiprocessing.Queue()
+    server = multiprocessing.Process(target=serve, args=(synthetic_page(int(args.mb * 1024 * 1024)), port_queue),
+                                     daemon=True)
+    server.start()
+    url = f"http://127.0.0.1:{port_queue.get()}/listing"
+
+    print(f"page: {args.mb:.0f} MB, {len(TOOLS)} tools, streaming limit: {args.max_mb:.0f} MB")
+    print(f"{'mode':12}{'time s':>9}{'peak MB':>10}{'images':>9}  truncated")
+    for mode in ("document", "streaming"):
+        queue = multiprocessing.Queue()
+        proc = multiprocessing.Process(target=analyze, args=(mode, url, int(args.max_mb * 1024 * 1024), queue))
+        proc.start()
+        seconds, peak_mb, images, truncated = queue.get()
+        proc.join()
+        print(f"{mode:12}{seconds:9.2f}{peak_mb:10.1f}{images:9d}  {truncated}")
+    server.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+benchmarks/bench_tfidf.py
+
+Keyword density and TF-IDF for a corpus of pages (core/tfidf.py) versus
+looping the Keyword Density Calculator over the same pages.
+
+Usage:
+    python benchmarks/bench_tfidf.py [--pages 100000] [--words 300]
+
+Page text is drawn from a Zipf-distributed vocabulary of 50,000 words plus
+a few page-specific words, so common words are on nearly every page and
+the distinctive ones are not. Both paths start from the page text: the
+HTML parsing they share is left out by setting each document's visible
+text directly.
+"""
+
+import argparse
+import os
+import resource
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "seo_bundle"))
+
+from core.document import PageDocument  # noqa: E402
+from core.tfidf import TermMatrixBuilder  # noqa: E402
+from tools.keyword_density_calculator.keyword_density_calculator import KeywordDensityCalculator  # noqa: E402
+
+VOCABULARY = 50_000
+
+
+def synthetic_texts(pages: int, words: int):
+    rng = np.random.default_rng(42)
+    vocabulary = np.array([f"word{i}" for i in range(VOCABULARY)])
+    for i in range(pages):
+        ranks = np.minimum(rng.zipf(1.3, words), VOCABULARY) - 1
+        yield f"Product {i} page{i} page{i} " + " ".join(vocabulary[ranks])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=100_000, help="number of pages")
+    parser.add_argument("--words", type=int, default=300, help="words per page")
+    args = parser.parse_args()
+
+    docs = []
+    for i, text in enumerate(synthetic_texts(args.pages, args.words)):
+        doc = PageDocument(f"https://www.example.com/page-{i}", b"")
+        doc.__dict__["visible_text"] = text  # skip the HTML parse both paths share
+        docs.append(doc)
+
+    tool = KeywordDensityCalculator()
+    start = time.perf_counter()
+    for doc in docs:
+        tool.run_document(doc)
+    loop_s = time.perf_counter() - start
+
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    builder = TermMatrixBuilder()
+    for doc in docs:
+        builder.add_document(doc.url, doc.visible_text)
+    tokenize_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    matrix = builder.build()
+    del builder
+    build_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    weights = matrix.tfidf()
+    matrix.density()
+    matrix.top_terms(weights, 10)
+    analyze_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    rows = sum(1 for _ in matrix.report())
+    report_s = time.perf_counter() - start
+    rss_mb = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before) / 1024
+
+    print(f"pages: {matrix.n_docs:,}  terms: {matrix.n_terms:,}  stored entries: {len(matrix.indices):,}")
+    print(f"CSR arrays: {matrix.nbytes / 1e6:.1f} MB   peak RSS growth: {rss_mb:.0f} MB")
+    print(f"tool loop (top 10 per page)       {loop_s:7.2f} s")
+    print(f"tokenize into shared vocabulary   {tokenize_s:7.2f} s")
+    print(f"build CSR                         {build_s:7.2f} s")
+    print(f"tf-idf, density, top 10 per page  {analyze_s:7.2f} s")
+    print(f"report rows ({rows:,})             {report_s:7.2f} s")
+
+
+if __name__ == "__main__":
+    main()
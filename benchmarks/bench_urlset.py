@@ -0,0 +1,91 @@
+"""
+benchmarks/bench_urlset.py
+
+Memory and time per million URLs for the crawler's seen-URL set:
+
+    set[str]        a plain Python set of URL strings (strings included)
+    set[int]        a Python set of 64-bit url_hash() values
+    HashedUrlSet    64-bit hashes in an array-backed open-addressing table
+    Bloom 1%        BloomFilter sized for the URL count at 1% false positives
+    Bloom 0.1%      BloomFilter at 0.1%
+
+Usage:
+    python benchmarks/bench_urlset.py [--urls 1000000] [--probes 100000]
+
+Memory is what tracemalloc sees held after building the structure, and at
+its peak while building (plus the URL strings for set[str], which the set
+keeps alive). "false +" is the share of
+never-added URLs reported as seen.
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "seo_bundle"))
+
+from core.urlset import BloomFilter, HashedUrlSet, url_hash  # noqa: E402
+
+
+def make_urls(count: int, prefix: str = "page"):
+    return [f"https://www.example.com/category-{i % 997}/{prefix}-{i}?ref=nav&sort=price" for i in range(count)]
+
+
+def build(kind: str, urls):
+    if kind == "set[str]":
+        return set(urls)
+    if kind == "set[int]":
+        return {url_hash(url) for url in urls}
+    if kind == "HashedUrlSet":
+        seen = HashedUrlSet()
+    elif kind == "Bloom 1%":
+        seen = BloomFilter(capacity=len(urls), error_rate=0.01)
+    else:
+        seen = BloomFilter(capacity=len(urls), error_rate=0.001)
+    for url in urls:
+        seen.add(url)
+    return seen
+
+
+def contains(kind: str, seen, url: str) -> bool:
+    return (url_hash(url) in seen) if kind == "set[int]" else (url in seen)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--urls", type=int, default=1_000_000, help="number of distinct URLs to add")
+    parser.add_argument("--probes", type=int, default=100_000, help="unseen URLs used to measure false positives")
+    args = parser.parse_args()
+
+    per_million = 1_000_000 / args.urls
+    probes = make_urls(args.probes, prefix="unseen")
+    print(f"{args.urls:,} URLs, {args.probes:,} unseen probes")
+    print(f"{'structure':14}{'MB / 1M URLs':>14}{'peak MB':>9}{'bytes/URL':>11}{'add s':>8}{'false +':>10}")
+    for kind in ("set[str]", "set[int]", "HashedUrlSet", "Bloom 1%", "Bloom 0.1%"):
+        urls = make_urls(args.urls)
+        start = time.perf_counter()
+        seen = build(kind, urls)
+        seconds = time.perf_counter() - start
+        del seen
+
+        # Built again under tracemalloc, which slows allocation down too much to time it
+        tracemalloc.start()
+        seen = build(kind, urls)
+        size, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        if kind == "set[str]":
+            # The set keeps the URL strings alive, so they count towards it
+            strings = sum(sys.getsizeof(url) for url in urls)
+            size, peak = size + strings, peak + strings
+
+        false_positives = sum(contains(kind, seen, url) for url in probes)
+        print(f"{kind:14}{size * per_million / 1e6:14.1f}{peak * per_million / 1e6:9.1f}"
+              f"{size / args.urls:11.1f}{seconds * per_million:8.2f}"
+              f"{false_positives / args.probes:10.3%}")
+        del seen, urls
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+benchmarks/bench_word_frequency.py
+
+Site-wide word and bigram counts over a synthetic crawl: exact Counters
+against the bounded-memory WordFrequencySketch of core/heavy_hitters.py.
+
+Usage:
+    python benchmarks/bench_word_frequency.py [--pages 5000] [--words 800] [--error 0.0001]
+
+Each page has --words Zipf-distributed words in sentences of 15. Both
+sides count the same pages (one Counter of the page, merged into the
+totals); memory is the size of the dicts and their key strings. The
+sketch's top 100 is then checked against the exact counts.
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import Counter
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "seo_bundle"))
+
+from core.heavy_hitters import WordFrequencySketch  # noqa: E402
+from core.text import PageText  # noqa: E402
+
+SENTENCE = 15
+TOP = 100
+
+
+def dict_mb(counts) -> float:
+    return (sys.getsizeof(counts) + sum(sys.getsizeof(key) for key in counts)) / 1e6
+
+
+def page_text(rng, words: int) -> PageText:
+    ids = rng.zipf(1.1, words)
+    tokens = [f"w{i}" for i in ids]
+    text = ". ".join(" ".join(tokens[i:i + SENTENCE]) for i in range(0, words, SENTENCE))
+    return PageText(text + ".")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=5000, help="pages in the crawl")
+    parser.add_argument("--words", type=int, default=800, help="words per page")
+    parser.add_argument("--error", type=float, default=0.0001, help="error bound of the sketch")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    pages = [page_text(rng, args.words) for _ in range(args.pages)]
+
+    start = time.perf_counter()
+    words, bigrams = Counter(), Counter()
+    for page in pages:
+        tokens = page.tokens
+        words.update(Counter(tokens))
+        page_bigrams = Counter()
+        for first, last in page.sentences:
+            sentence = tokens[first:last]
+            page_bigrams.update(map(" ".join, zip(sentence, sentence[1:])))
+        bigrams.update(page_bigrams)
+    exact_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    sketch = WordFrequencySketch(args.error)
+    for page in pages:
+        sketch.add_page(page)
+    sketch_s = time.perf_counter() - start
+
+    print(f"pages: {args.pages:,}  words: {sketch.words.total:,}  bigrams: {sketch.bigrams.total:,}")
+    print(f"exact Counters   {exact_s:7.2f} s   {len(words):>9,} words {len(bigrams):>11,} bigrams"
+          f"   {dict_mb(words) + dict_mb(bigrams):8.1f} MB")
+    print(f"sketch           {sketch_s:7.2f} s   {len(sketch.words):>9,} words {len(sketch.bigrams):>11,} bigrams"
+          f"   {dict_mb(sketch.words._counts) + dict_mb(sketch.bigrams._counts):8.1f} MB")
+    for name, exact, summary in (("words", words, sketch.words), ("bigrams", bigrams, sketch.bigrams)):
+        top = summary.top(TOP)
+        exact_top = {term for term, _ in exact.most_common(TOP)}
+        worst = max(exact[term] - count for term, count in top)
+        print(f"top {TOP} {name:8} {len(exact_top & {term for term, _ in top}):3} in the exact top {TOP}, "
+              f"largest undercount {worst:,} (bound {summary.offset:,} = "
+              f"{summary.offset / summary.total:.5%} of {summary.total:,})")
+
+
+if __name__ == "__main__":
+    main()
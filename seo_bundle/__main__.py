@@ -0,0 +1,13 @@
+"""
+Entry point for ``python -m seo_bundle`` (see cli.py).
+"""
+
+import os
+import sys
+
+# Modules in this directory import each other as top-level packages (core, tools)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from cli import main  # noqa: E402
+
+sys.exit(main())
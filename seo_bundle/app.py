@@ -4,6 +4,7 @@ import requests
 from urllib.parse import urlparse
 from typing import Dict, Any, List
 from streamlit_lottie import st_lottie
+from core.utils import streamlit_event_handler
 
 # ==============================================================================
 # LOTTIE ANIMATION HELPER
@@ -19,52 +20,12 @@ def load_lottie_url(url: str) -> Dict[str, Any] | None:
         return None
 
 # ==============================================================================
-# IMPORT ALL 40 SEO TOOLS (Place your tool classes here)
+# LOAD ALL 40 SEO TOOLS
 # ==============================================================================
-# NOTE: Assumes these tool classes exist in the 'tools' directory.
-# You must have these files and classes defined for the code to run fully.
-# The code below will work assuming these are correctly set up.
+# Tools are listed in tools/registry.py (shared with the command-line runner).
 try:
-    from tools.meta_title_length_checker.meta_title_length_checker import MetaTitleLengthChecker
-    from tools.meta_description_length_checker.meta_description_length_checker import MetaDescriptionLengthChecker
-    from tools.keyword_density_calculator.keyword_density_calculator import KeywordDensityCalculator
-    from tools.h1_tag_extractor.h1_tag_extractor import H1TagExtractor
-    from tools.image_alt_tag_checker.image_alt_tag_checker import ImageAltTagChecker
-    from tools.word_count_checker.word_count_checker import WordCountChecker
-    from tools.url_slug_optimizer.url_slug_optimizer import URLSlugOptimizer
-    from tools.canonical_tag_checker.canonical_tag_checker import CanonicalTagChecker
-    from tools.robots_txt_fetcher_parser.robots_txt_fetcher_parser import RobotsTxtFetcherParser
-    from tools.sitemap_xml_fetcher_validator.sitemap_xml_fetcher_validator import SitemapXmlFetcherValidator
-    from tools.broken_link_checker.broken_link_checker import BrokenLinkChecker
-    from tools.page_load_time_tester.page_load_time_tester import PageLoadTimeTester
-    from tools.internal_link_counter.internal_link_counter import InternalLinkCounter
-    from tools.external_link_counter.external_link_counter import ExternalLinkCounter
-    from tools.anchor_text_analyzer.anchor_text_analyzer import AnchorTextAnalyzer
-    from tools.favicon_checker.favicon_checker import FaviconChecker
-    from tools.structured_data_json_ld_finder.structured_data_json_ld_finder import StructuredDataFinder
-    from tools.heading_tag_structure_analyzer.heading_tag_structure_analyzer import HeadingTagStructureAnalyzer
-    from tools.mobile_responsive_check.mobile_responsive_check import MobileResponsiveCheck
-    from tools.social_meta_tag_extractor.social_meta_tag_extractor import SocialMetaTagExtractor
-    from tools.schema_markup_presence_checker.schema_markup_presence_checker import SchemaMarkupPresenceChecker
-    from tools.link_redirect_checker.link_redirect_checker import LinkRedirectChecker
-    from tools.page_status_code_checker.page_status_code_checker import PageStatusCodeChecker
-    from tools.keyword_suggestions_from_related_words.keyword_suggestions_from_related_words import KeywordSuggestionsFromRelatedWords
-    from tools.readability_score_calculator.readability_score_calculator import ReadabilityScoreCalculator
-    from tools.keyword_case_converter.keyword_case_converter import KeywordCaseConverter
-    from tools.html_minifier.html_minifier import HtmlMinifier
-    from tools.css_minifier.css_minifier import CssMinifier
-    from tools.js_minifier.js_minifier import JsMinifier
-    from tools.serp_preview_simulator.serp_preview_simulator import SerpPreviewSimulator
-    from tools.open_graph_preview.open_graph_preview import OpenGraphPreview
-    from tools.twitter_card_preview.twitter_card_preview import TwitterCardPreview
-    from tools.alt_tag_missing_finder.alt_tag_missing_finder import AltTagMissingFinder
-    from tools.word_frequency_counter.word_frequency_counter import WordFrequencyCounter
-    from tools.keyword_position_estimator.keyword_position_estimator import KeywordPositionEstimator
-    from tools.backlink_list_parser.backlink_list_parser import BacklinkListParser
-    from tools.youtube_video_tag_extractor.youtube_video_tag_extractor import YoutubeVideoTagExtractor
-    from tools.text_to_keyword_generator.text_to_keyword_generator import TextToKeywordGenerator
-    from tools.domain_age_checker.domain_age_checker import DomainAgeChecker
-    from tools.email_obfuscator_generator.email_obfuscator_generator import EmailObfuscatorGenerator
+    from tools.registry import create_all_tools
+    TOOLS_INSTANCES = create_all_tools()
 except ImportError as e:
     st.error(f"Error importing a tool. Make sure all tool files are correctly placed in the 'tools' directory. Details: {e}")
     st.stop()
@@ -385,30 +346,7 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Tool instances and categories
-TOOLS_INSTANCES = {
-    "Meta Title Length Checker": MetaTitleLengthChecker(), "Meta Description Length Checker": MetaDescriptionLengthChecker(),
-    "Keyword Density Calculator": KeywordDensityCalculator(), "H1 Tag Extractor": H1TagExtractor(),
-    "Image Alt Tag Checker": ImageAltTagChecker(), "Word Count Checker": WordCountChecker(),
-    "URL Slug Optimizer": URLSlugOptimizer(), "Canonical Tag Checker": CanonicalTagChecker(),
-    "Robots.txt Fetcher & Parser": RobotsTxtFetcherParser(), "Sitemap.xml Fetcher & Validator": SitemapXmlFetcherValidator(),
-    "Broken Link Checker": BrokenLinkChecker(), "Page Load Time Tester": PageLoadTimeTester(),
-    "Internal Link Counter": InternalLinkCounter(), "External Link Counter": ExternalLinkCounter(),
-    "Anchor Text Analyzer": AnchorTextAnalyzer(), "Favicon Checker": FaviconChecker(),
-    "Structured Data Finder": StructuredDataFinder(), "Heading Tag Structure Analyzer": HeadingTagStructureAnalyzer(),
-    "Mobile Responsive Check": MobileResponsiveCheck(), "Social Meta Tag Extractor": SocialMetaTagExtractor(),
-    "Schema Markup Presence Checker": SchemaMarkupPresenceChecker(), "Link Redirect Checker": LinkRedirectChecker(),
-    "Page Status Code Checker": PageStatusCodeChecker(), "Keyword Suggestions from Related Words": KeywordSuggestionsFromRelatedWords(),
-    "Readability Score Calculator": ReadabilityScoreCalculator(), "Keyword Case Converter": KeywordCaseConverter(),
-    "HTML Minifier": HtmlMinifier(), "CSS Minifier": CssMinifier(),
-    "JS Minifier": JsMinifier(), "SERP Preview Simulator": SerpPreviewSimulator(),
-    "Open Graph Preview": OpenGraphPreview(), "Twitter Card Preview": TwitterCardPreview(),
-    "Alt Tag Missing Finder": AltTagMissingFinder(), "Word Frequency Counter": WordFrequencyCounter(),
-    "Keyword Position Estimator": KeywordPositionEstimator(), "Backlink List Parser": BacklinkListParser(),
-    "YouTube Video Tag Extractor": YoutubeVideoTagExtractor(), "Text-to-Keyword Generator": TextToKeywordGenerator(),
-    "Domain Age Checker": DomainAgeChecker(), "Email Obfuscator Generator": EmailObfuscatorGenerator(),
-}
-
+# Tool categories (instances are created above from tools/registry.py)
 TOOL_CATEGORIES = {
     "🛠️ Meta & Tags": ["Meta Title Length Checker", "Meta Description Length Checker", "H1 Tag Extractor", "Image Alt Tag Checker", "Social Meta Tag Extractor", "Canonical Tag Checker", "Schema Markup Presence Checker", "Alt Tag Missing Finder", "Structured Data Finder", "Heading Tag Structure Analyzer", "Favicon Checker"],
     "📝 Content Analysis": ["Keyword Density Calculator", "Word Count Checker", "Readability Score Calculator", "Word Frequency Counter", "Text-to-Keyword Generator"],
@@ -517,7 +455,8 @@ def main():
                 with st.spinner(f"Running '{st.session_state.selected_tool}' on {st.session_state.url_input}..."):
                     try:
                         selected_tool = TOOLS_INSTANCES[st.session_state.selected_tool]
-                        results = selected_tool.run(st.session_state.url_input)
+                        with selected_tool.subscribed(streamlit_event_handler()):
+                            results = selected_tool.run(st.session_state.url_input)
 
                         st.markdown("### Analysis Complete!")
                         st.json(results, expanded=False)
@@ -0,0 +1,283 @@
+"""
+cli.py
+
+Headless command-line runner for the tools.
+
+Runs one or more tools over a list of URLs (one per line, from a file or
+stdin) and writes one JSON object per URL to stdout as soon as its results
+are ready (JSON Lines). Pages are fetched once per URL by the concurrent
+FetchEngine and shared by every selected tool. Streamlit is never imported.
+
+Usage:
+    python -m seo_bundle --list
+    python -m seo_bundle -t h1_tag_extractor -t canonical_tag_checker urls.txt
+    cat urls.txt | python -m seo_bundle -t all --concurrency 64 --cache cache.db > results.jsonl
+    echo https://example.com/ | python -m seo_bundle --crawl --sitemap --max-pages 50000 -t h1_tag_extractor
+
+Each output line looks like:
+    {"index": 0, "url": "https://example.com/", "results": {"h1_tag_extractor": {...}}}
+
+Lines are written in completion order; "index" is the URL's position in the input.
+With --crawl the input URLs are seeds, every page reached from them is
+analyzed, "index" is the crawl order and each line also has "depth" and
+"status_code".
+"""
+
+import argparse
+import json
+import os
+import sys
+from contextlib import closing
+from typing import Iterable, Iterator, List, Optional
+
+from core import http_client
+from core.anchor_index import AnchorIndex
+from core.config import STREAMING_CONFIG, WORD_FREQUENCY_CONFIG
+from core.crawler import Crawler
+from core.fetch_engine import FetchEngine
+from core.heavy_hitters import WordFrequencySketch
+from core.keyword_index import SiteKeywordIndex
+from core.link_graph import LinkGraphBuilder
+from core.reconcile import SitemapReconciler
+from core.urls import normalize_url
+from core.urlset import BloomFilter
+from tools.registry import TOOL_REGISTRY, create_tool, resolve_tool_name
+
+
+# Crawl frontier cap; also sizes the Bloom filter together with --max-pages
+MAX_FRONTIER = 100_000
+
+
+def read_urls(lines: Iterable[str]) -> Iterator[str]:
+    """Yield non-empty lines, skipping # comments."""
+    for line in lines:
+        line = line.strip()
+        if line and not line.startswith("#"):
+            yield line
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m seo_bundle",
+        description="Run SEO tools over a list of URLs and write JSON Lines results.",
+    )
+    parser.add_argument("input", nargs="?", default="-",
+                        help="file with one URL per line (default: read from stdin)")
+    parser.add_argument("-t", "--tool", action="append", dest="tools", metavar="TOOL",
+                        help="tool id, class or display name; repeat for several tools, or 'all'")
+    parser.add_argument("--list", action="store_true", help="list the available tools and exit")
+    parser.add_argument("--keyword", action="append", dest="keyword_list", metavar="KEYWORD",
+                        help="keyword looked up by keyword_position_estimator; repeat for several")
+    parser.add_argument("-o", "--output", help="write results to this file instead of stdout")
+    parser.add_argument("--concurrency", type=int, default=32, help="requests in flight overall (default: 32)")
+    parser.add_argument("--per-host", type=int, default=8, help="requests in flight per host (default: 8)")
+    parser.add_argument("--timeout", type=float, help="seconds per request (default: HTTP_CONFIG['timeout'])")
+    parser.add_argument("--processes", type=int, default=0,
+                        help="run tools in this many worker processes (default: threads)")
+    parser.add_argument("--cache", metavar="PATH", help="SQLite file for the persistent HTTP response cache")
+    parser.add_argument("--cache-max-mb", type=float, help="size limit of the response cache in MB")
+    parser.add_argument("--stream", action="store_true",
+                        help="index pages while downloading instead of building a tree (streamable tools only)")
+    parser.add_argument("--max-mb", type=float,
+                        help=f"body size limit in streaming mode (default: "
+                             f"{STREAMING_CONFIG['max_body_bytes'] // (1024 * 1024)} MB)")
+
+    crawl = parser.add_argument_group("crawling")
+    crawl.add_argument("--crawl", action="store_true", help="treat the input URLs as seeds and crawl their sites")
+    crawl.add_argument("--max-depth", type=int, default=3, help="link depth limit from the seeds (default: 3)")
+    crawl.add_argument("--max-pages", type=int, default=1000, help="stop after this many pages (default: 1000)")
+    crawl.add_argument("--crawl-delay", type=float, default=0.5,
+                       help="seconds between requests to the same host (default: 0.5)")
+    crawl.add_argument("--sitemap", action="store_true", help="also seed the crawl from each site's sitemap.xml")
+    crawl.add_argument("--link-report", metavar="PATH",
+                       help="after the crawl, write internal link metrics per page (PageRank, click depth, "
+                            "inlinks, orphan and dead-end flags) to this JSON Lines file")
+    crawl.add_argument("--anchor-report", metavar="PATH",
+                       help="after the crawl, write the anchor texts used for each internal link target "
+                            "(counts, top anchors, generic-only flag) to this JSON Lines file")
+    crawl.add_argument("--reconcile-report", metavar="PATH",
+                       help="compare the crawl with the full sitemap and write one JSON line per sitemap URL "
+                            "not linked, linked URL not in the sitemap, non-200 sitemap URL or sitemap URL "
+                            "canonicalized elsewhere to this file (counts go to stderr)")
+    crawl.add_argument("--keywords", metavar="PATH",
+                       help="file with one keyword or phrase per line, for --keyword-report")
+    crawl.add_argument("--keyword-report", metavar="PATH",
+                       help="after the crawl, write one JSON line per keyword from --keywords (pages using it "
+                            "in the text, title and headings, and the pages using it most) to this file")
+    crawl.add_argument("--word-report", metavar="PATH",
+                       help="after the crawl, write the site's most frequent words and bigrams (counted in "
+                            "bounded memory, with error bounds) to this JSON Lines file")
+    crawl.add_argument("--word-error", type=float, metavar="RATE",
+                       help="largest undercount of --word-report counts as a fraction of all words "
+                            f"(default: {WORD_FREQUENCY_CONFIG['error']})")
+    crawl.add_argument("--ignore-robots", action="store_true",
+                       help="crawl URLs that robots.txt disallows and ignore its Crawl-delay")
+    crawl.add_argument("--bloom-error-rate", type=float, metavar="RATE",
+                       help="track seen URLs in a Bloom filter with this false-positive rate (e.g. 0.001) "
+                            "instead of an exact hash table")
+    return parser
+
+
+def list_tools(out) -> None:
+    for name, (tool_id, class_name) in TOOL_REGISTRY.items():
+        out.write(f"{tool_id:40} {name}\n")
+
+
+def select_tools(keys: List[str]) -> dict:
+    """
+    Instantiate the requested tools, keyed by tool id.
+
+    Raises:
+        KeyError: If a tool is unknown.
+    """
+    if "all" in keys:
+        names = list(TOOL_REGISTRY)
+    else:
+        names = list(dict.fromkeys(resolve_tool_name(key) for key in keys))
+    return {TOOL_REGISTRY[name][0]: create_tool(name) for name in names}
+
+
+def write_jsonl(path: str, rows: Iterable[dict]) -> None:
+    with open(path, "w", encoding="utf-8") as out:
+        for row in rows:
+            out.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+
+def write_link_report(crawler: Crawler, path: str) -> None:
+    """Write one JSON line of link metrics per page of the crawl, click depth counted from the first seed."""
+    graph = crawler.link_graph.build()
+    start = normalize_url(crawler.seeds[0]) if crawler.seeds else None
+    write_jsonl(path, graph.report(start))
+
+
+def run(args: argparse.Namespace, tools: dict, urls: Iterable[str]) -> Iterator[dict]:
+    """Yield one output record per analyzed URL."""
+    max_bytes = int(args.max_mb * 1024 * 1024) if args.max_mb else None
+    if args.crawl:
+        seen = None
+        if args.bloom_error_rate:
+            seen = BloomFilter(capacity=args.max_pages + MAX_FRONTIER, error_rate=args.bloom_error_rate)
+        keywords = []
+        if args.keyword_report:
+            with open(args.keywords, encoding="utf-8") as lines:
+                keywords = list(read_urls(lines))
+        crawler = Crawler(
+            urls,
+            tools=tools,
+            max_depth=args.max_depth,
+            max_pages=args.max_pages,
+            concurrency=args.concurrency,
+            per_host=args.per_host,
+            crawl_delay=args.crawl_delay,
+            use_sitemap=args.sitemap,
+            timeout=args.timeout,
+            stream=args.stream,
+            max_bytes=max_bytes,
+            max_frontier=MAX_FRONTIER,
+            seen=seen,
+            respect_robots=not args.ignore_robots,
+            link_graph=LinkGraphBuilder() if args.link_report else None,
+            anchor_index=AnchorIndex() if args.anchor_report else None,
+            reconciler=SitemapReconciler() if args.reconcile_report else None,
+            keyword_index=SiteKeywordIndex(keywords) if args.keyword_report else None,
+            word_frequency=(WordFrequencySketch(args.word_error or WORD_FREQUENCY_CONFIG["error"])
+                            if args.word_report else None),
+        )
+        with closing(crawler.crawl()) as pages:
+            for index, page in enumerate(pages):
+                yield {"index": index, "url": page.url, "depth": page.depth, "status_code": page.status_code,
+                       "results": page.results}
+        if crawler.link_graph is not None:
+            write_link_report(crawler, args.link_report)
+        if crawler.anchor_index is not None:
+            write_jsonl(args.anchor_report, crawler.anchor_index.report())
+        if crawler.reconciler is not None:
+            with closing(crawler.reconciler):
+                reconciliation = crawler.reconciler.reconcile()
+                write_jsonl(args.reconcile_report, reconciliation.rows())
+            sys.stderr.write(f"reconcile: {json.dumps(reconciliation.counts)}\n")
+        if crawler.keyword_index is not None:
+            write_jsonl(args.keyword_report, crawler.keyword_index.report())
+        if crawler.word_frequency is not None:
+            write_jsonl(args.word_report, crawler.word_frequency.report())
+        return
+
+    engine = FetchEngine(
+        concurrency=args.concurrency,
+        per_host=args.per_host,
+        timeout=args.timeout,
+        processes=args.processes,
+        stream=args.stream,
+        max_bytes=max_bytes,
+    )
+    with closing(engine), closing(engine.run_tools(tools, urls)) as results_stream:
+        for index, url, results in results_stream:
+            yield {"index": index, "url": url, "results": results}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if args.list:
+        list_tools(sys.stdout)
+        return 0
+    if not args.tools and not args.crawl:
+        parser.error("choose at least one tool with -t/--tool (see --list)")
+
+    try:
+        tools = select_tools(args.tools or [])
+    except KeyError as e:
+        parser.error(f"{e.args[0]} (see --list)")
+
+    if args.keyword_list:
+        estimator = tools.get(TOOL_REGISTRY["Keyword Position Estimator"][0])
+        if estimator is None:
+            parser.error("--keyword needs -t keyword_position_estimator")
+        estimator.keywords = args.keyword_list
+
+    if bool(args.keywords) != bool(args.keyword_report):
+        parser.error("--keywords and --keyword-report go together")
+    if args.word_error is not None and not 0 < args.word_error < 1:
+        parser.error("--word-error must be between 0 and 1")
+
+    if args.stream:
+        unsupported = [tool_id for tool_id, tool in tools.items() if tool.accepts_document and not tool.streamable]
+        if unsupported:
+            parser.error(f"these tools need the full page and cannot run with --stream: {', '.join(unsupported)}")
+
+    overrides = {}
+    if args.cache:
+        overrides["cache_path"] = args.cache
+    if args.cache_max_mb:
+        overrides["cache_max_bytes"] = int(args.cache_max_mb * 1024 * 1024)
+    if overrides:
+        http_client.configure(**overrides)
+
+    try:
+        source = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+        out = sys.stdout if not args.output else open(args.output, "w", encoding="utf-8")
+    except OSError as e:
+        parser.error(str(e))
+    try:
+        with closing(run(args, tools, read_urls(source))) as records:
+            for record in records:
+                out.write(json.dumps(record, default=str, ensure_ascii=False) + "\n")
+                out.flush()
+    except KeyboardInterrupt:
+        return 130
+    except BrokenPipeError:
+        # The reader went away (e.g. piped into head); silence the flush at interpreter exit
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if out is not sys.stdout:
+            out.close()
+        cache_stats = http_client.cache_stats()
+        http_client.close()
+
+    if cache_stats:
+        sys.stderr.write(f"cache: {json.dumps(cache_stats)}\n")
+    return 0
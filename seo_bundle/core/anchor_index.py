@@ -0,0 +1,134 @@
+"""
+core/anchor_index.py
+
+Site-wide anchor text index: target URL -> anchor text -> number of links.
+
+Pages are added one at a time as they are analyzed (during a crawl or a
+bulk run), so questions like "which anchors point at this URL" or "which
+pages are only ever linked with 'click here'" are answered from the index
+without fetching or parsing any page again.
+
+Anchor texts are whitespace-collapsed and lowercased, and both texts and
+URLs are interned, so a navigation link repeated on every page costs one
+counter increment rather than new strings.
+"""
+
+import sys
+import threading
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from core.urls import resolve_url, url_host
+
+# Anchor texts that say nothing about the target page
+GENERIC_ANCHOR_TEXTS = frozenset({
+    "click here", "more", "read more", "learn more", "here", "this link", "link",
+})
+
+
+def normalize_anchor_text(text: str) -> str:
+    return " ".join(text.split()).lower()
+
+
+class AnchorIndex:
+    """
+    Inverted index of anchor texts by target URL. Safe to update from
+    several threads.
+
+    Args:
+        hosts: Only index links to these hosts (e.g. the crawled site). By
+            default links to the host of the page they appear on are indexed.
+        generic_texts: Anchor texts counted as generic.
+    """
+
+    def __init__(self, hosts: Optional[Iterable[str]] = None, generic_texts: Iterable[str] = GENERIC_ANCHOR_TEXTS):
+        self.hosts: Optional[Set[str]] = {host.lower() for host in hosts} if hosts is not None else None
+        self.generic_texts = frozenset(normalize_anchor_text(text) for text in generic_texts)
+        self._targets: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+        self.pages = 0
+        self.links = 0
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def add_page(self, page_url: str, anchors: Iterable[Tuple[str, str]]) -> int:
+        """
+        Index the (href, text) anchors of a page (e.g. doc.index.anchors).
+        Returns the number of links indexed.
+        """
+        page_host = url_host(page_url)
+        resolved = []
+        for href, text in anchors:
+            target = resolve_url(page_url, href)
+            if target is None:
+                continue
+            host = url_host(target)
+            if (host not in self.hosts) if self.hosts is not None else (host != page_host):
+                continue
+            resolved.append((sys.intern(target), sys.intern(normalize_anchor_text(text))))
+
+        with self._lock:
+            for target, text in resolved:
+                counts = self._targets.get(target)
+                if counts is None:
+                    counts = self._targets[target] = {}
+                counts[text] = counts.get(text, 0) + 1
+            self.pages += 1
+            self.links += len(resolved)
+        return len(resolved)
+
+    def __len__(self) -> int:
+        """Number of target URLs."""
+        return len(self._targets)
+
+    def __contains__(self, url: str) -> bool:
+        return url in self._targets
+
+    def anchors_for(self, url: str) -> Dict[str, int]:
+        """Anchor text counts of links to a (normalized) URL; empty if nothing links to it."""
+        with self._lock:
+            return dict(self._targets.get(url, {}))
+
+    def top_anchors(self, url: str, n: int = 10) -> List[Tuple[str, int]]:
+        """The n most used anchor texts for a URL, most used first ("" is an empty anchor)."""
+        return sorted(self.anchors_for(url).items(), key=lambda item: (-item[1], item[0]))[:n]
+
+    def inlinks(self, url: str) -> int:
+        """Number of indexed links to a URL."""
+        return sum(self.anchors_for(url).values())
+
+    def is_generic(self, text: str) -> bool:
+        return not text or text in self.generic_texts
+
+    def only_generic(self, url: str) -> bool:
+        """True if a URL has links and every one of them has an empty or generic anchor."""
+        counts = self.anchors_for(url)
+        return bool(counts) and all(self.is_generic(text) for text in counts)
+
+    def targets_with_only_generic_anchors(self) -> Iterator[str]:
+        """URLs whose links all have empty or generic anchors."""
+        with self._lock:
+            urls = list(self._targets)
+        for url in urls:
+            if self.only_generic(url):
+                yield url
+
+    def report(self, top: int = 20) -> Iterator[dict]:
+        """One row per target URL: link count, top anchors and whether all anchors are generic."""
+        with self._lock:
+            urls = list(self._targets)
+        for url in urls:
+            counts = self.anchors_for(url)
+            yield {
+                "url": url,
+                "inlinks": sum(counts.values()),
+                "distinct_anchors": len(counts),
+                "top_anchors": sorted(counts.items(), key=lambda item: (-item[1], item[0]))[:top],
+                "only_generic": all(self.is_generic(text) for text in counts),
+            }
@@ -1 +1,73 @@
 TOOL_CONFIG = {}
+
+# Shared HTTP client settings (see core/http_client.py)
+HTTP_CONFIG = {
+    "timeout": 10,                  # default seconds per request when a call does not pass one
+    "user_agent": "SEO-Toolbundle/1.0 (+https://github.com/listandsouzaq/seo-toolbundle)",
+    "pool_connections": 32,         # number of per-host connection pools kept alive
+    "pool_maxsize": 16,             # keep-alive connections per host pool
+    "pool_block": False,            # block instead of opening extra connections when a pool is full
+    "max_retries": 0,               # connection-level retries (not HTTP status retries)
+    "cache_path": None,             # SQLite file for the response cache (see core/http_cache.py); None disables it
+    "cache_max_bytes": 256 * 1024 * 1024,  # LRU eviction keeps stored bodies under this size
+}
+
+# HTML parser backend used by core.utils.make_soup: "lxml" (fast, default) or "html.parser" (pure Python).
+# Falls back to "html.parser" automatically when lxml is not installed.
+HTML_PARSER = "lxml"
+
+# Streaming extraction (core/streaming.py): the body is parsed chunk by chunk into a PageIndex
+# without building a tree or keeping the body in memory.
+STREAMING_CONFIG = {
+    "chunk_size": 64 * 1024,            # bytes read from the socket and fed to the parser at a time
+    "max_body_bytes": 50 * 1024 * 1024,  # stop reading after this many bytes and flag the document as truncated
+}
+
+# URL normalization (core/urls.py), shared by the link tools and the crawler
+URL_CONFIG = {
+    "memo_size": 100_000,       # entries kept in each LRU memo of normalized and resolved URLs
+    # Query parameters dropped by normalize_url(); a trailing * matches any name with that prefix
+    "tracking_params": (
+        "utm_*", "gclid", "dclid", "gbraid", "wbraid", "fbclid", "msclkid", "yclid", "twclid",
+        "mc_cid", "mc_eid", "_ga", "_gl", "igshid", "_hsenc", "_hsmi", "mkt_tok",
+    ),
+}
+
+# Sitemap reading (core/sitemap.py)
+SITEMAP_CONFIG = {
+    "max_urls": 50_000,                 # protocol limit on entries per sitemap file
+    "max_bytes": 50 * 1024 * 1024,      # protocol limit on uncompressed bytes per sitemap file
+    "max_sitemaps": 1000,               # sitemap files read per run, including index children
+    "workers": 4,                       # sitemap files downloaded and parsed concurrently
+    "queue_batches": 8,                 # parsed batches (one per downloaded chunk) buffered ahead of the consumer
+}
+
+# robots.txt handling (core/robots.py)
+ROBOTS_CONFIG = {
+    "ttl": 24 * 3600,           # seconds a fetched robots.txt is trusted (RFC 9309 suggests at most 24 hours)
+    "error_ttl": 10 * 60,       # seconds the disallow-all fallback is kept after a 5xx or network error
+    "max_hosts": 10_000,        # hosts whose rules are cached
+    "max_bytes": 500 * 1024,    # content parsed per robots.txt; the rest is ignored (RFC 9309 minimum)
+    "max_crawl_delay": 60,      # upper bound on the Crawl-delay the crawler will honour
+}
+
+# Redirect chain resolution (core/redirects.py)
+REDIRECT_CONFIG = {
+    "max_hops": 10,             # redirects followed before a chain is reported as too long
+    "max_entries": 100_000,     # hops (URL -> status, Location) kept in memory; least recently used dropped
+    "error_ttl": 60,            # seconds a network error or 5xx hop is kept before the URL is requested again
+    "workers": 16,              # concurrent requests in RedirectResolver.resolve_many()
+}
+
+# Readability scoring (core/readability.py)
+READABILITY_CONFIG = {
+    "lang": "en_US",                # pyphen hyphenation dictionary used to count syllables
+    "syllable_cache_size": 200_000,  # words whose syllable count is kept; least recently used dropped
+    "syllable_cache_path": None,    # JSON file the syllable cache is loaded from and saved to; None keeps it in memory
+}
+
+# Site-wide word and bigram frequencies (core/heavy_hitters.py)
+WORD_FREQUENCY_CONFIG = {
+    "error": 0.0001,    # counts may be low by at most this fraction of all words; keeps about 2 / error counters
+    "top": 100,         # words and bigrams reported by WordFrequencySketch.top() and report()
+}
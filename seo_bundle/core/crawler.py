@@ -0,0 +1,446 @@
+"""
+core/crawler.py
+
+Site crawler with a prioritized frontier and a per-host politeness scheduler.
+
+Starting from seed URLs (and optionally the site's sitemap.xml), pages are
+fetched concurrently, their internal links are added to the frontier, and
+any selected tools run on every crawled page. The frontier is split into
+one priority queue per host plus a heap of hosts ordered by the time they
+may next be contacted, so each host gets at most ``per_host`` requests in
+flight and at least ``crawl_delay`` seconds between request starts, while
+other hosts keep the workers busy.
+
+robots.txt is honoured by default: disallowed URLs are skipped (once a
+host's rules are cached they are dropped before they reach the frontier)
+and a host's Crawl-delay raises its delay, up to
+ROBOTS_CONFIG["max_crawl_delay"].
+
+A page is processed once however many URLs lead to it: when a fetch
+redirects, its final URL is marked seen too, and if it was already seen
+(crawled or queued under that URL) the redirect is not processed again.
+Every collector (link graph, anchor and keyword indexes, word counts) keys
+a page on its final URL.
+
+Results are yielded as pages complete and are not retained, the frontier is
+capped and seen URLs are kept as 64-bit hashes, so memory stays bounded on
+long crawls.
+"""
+
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing, nullcontext
+from typing import AsyncIterator, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+import requests
+from lxml import etree
+
+from core import http_client
+from core.anchor_index import AnchorIndex
+from core.config import ROBOTS_CONFIG
+from core.document import PageDocument, fetch_document
+from core.fetch_engine import FetchResult, _run_tools
+from core.heavy_hitters import WordFrequencySketch
+from core.keyword_index import SiteKeywordIndex
+from core.link_graph import LinkGraphBuilder
+from core.reconcile import SitemapReconciler
+from core.robots import RobotsCache
+from core.sitemap import SitemapReader, default_sitemap_url
+from core.streaming import stream_document
+from core.urls import normalize_url, resolve_url, url_host, url_origin
+from core.urlset import HashedUrlSet
+
+
+class CrawlResult:
+    """
+    Outcome of crawling one page.
+
+    Attributes:
+        url: The crawled URL.
+        depth: Link distance from the nearest seed (seeds are depth 0).
+        status_code: HTTP status of the final response, or None if the fetch failed.
+        redirect_status: HTTP status of the first response if the URL redirected.
+        error: The exception raised while fetching or parsing the page, if any.
+        links: Absolute URLs of the in-scope links found on the page.
+        results: Tool results keyed by tool name.
+        blocked: True if robots.txt disallows the URL; it was not fetched.
+        crawl_delay: Crawl-delay from the host's robots.txt, if any.
+        final_url: URL of the final response, after redirects (normalized).
+        duplicate: True if the URL redirected to a page already crawled or
+            queued; the page was not processed again.
+        canonical: Absolute URL of the page's canonical tag (only looked up
+            when the crawl feeds a reconciler).
+    """
+
+    __slots__ = ("url", "depth", "status_code", "error", "links", "results", "blocked", "crawl_delay",
+                 "final_url", "canonical", "duplicate", "redirect_status")
+
+    def __init__(self, url: str, depth: int):
+        self.url = url
+        self.depth = depth
+        self.status_code = None
+        self.error = None
+        self.links: List[str] = []
+        self.results: Dict[str, dict] = {}
+        self.blocked = False
+        self.crawl_delay = None
+        self.final_url: Optional[str] = None
+        self.canonical: Optional[str] = None
+        self.duplicate = False
+        self.redirect_status: Optional[int] = None
+
+
+class Crawler:
+    """
+    Crawls a site breadth-first within depth, page and politeness limits.
+
+    Args:
+        seeds: Start URLs. Their hosts define the crawl scope unless
+            allowed_hosts is given.
+        tools: Tools to run on every crawled page, keyed by name.
+        max_depth: Links further than this from a seed are not followed.
+        max_pages: Stop after fetching this many pages.
+        concurrency: Maximum requests in flight overall.
+        per_host: Maximum requests in flight to one host.
+        crawl_delay: Minimum seconds between request starts to one host.
+        use_sitemap: Also seed from each seed host's /sitemap.xml.
+        allowed_hosts: Hosts the crawl may visit (defaults to the seed hosts).
+        max_frontier: Maximum number of queued URLs; further discoveries are
+            dropped (and counted in stats) until the frontier drains.
+        timeout: Per-request timeout in seconds.
+        stream: Fetch pages in streaming mode (see core/streaming.py).
+        max_bytes: Body size limit in streaming mode.
+        seen: Set of URLs already queued (see core/urlset.py). Defaults to a
+            HashedUrlSet; pass a BloomFilter sized for max_pages + max_frontier
+            to trade a small chance of skipping a page for less memory.
+        respect_robots: Skip URLs disallowed by robots.txt for our User-Agent
+            and honour its Crawl-delay.
+        link_graph: If given, every fetched page and its internal links (and
+            the sitemap URLs) are recorded in it (see core/link_graph.py).
+            Links are then extracted at max_depth too, so the deepest pages
+            are not mistaken for dead ends.
+        anchor_index: If given, the anchors of every fetched page are added
+            to it (see core/anchor_index.py).
+        reconciler: If given, every URL of the seed sites' sitemaps and every
+            fetched page with its status, links and canonical tag are recorded
+            in it (see core/reconcile.py). Links are then extracted at
+            max_depth too.
+        keyword_index: If given, every fetched page is indexed in it for its
+            keyword list (see core/keyword_index.py). Pages fetched in
+            streaming mode have no text and are left out.
+        word_frequency: If given, the words and bigrams of every fetched page
+            are counted in it (see core/heavy_hitters.py). Pages fetched in
+            streaming mode are left out.
+    """
+
+    def __init__(self, seeds: Iterable[str], tools: Optional[Dict[str, object]] = None, max_depth: int = 3,
+                 max_pages: int = 1000, concurrency: int = 16, per_host: int = 2, crawl_delay: float = 0.5,
+                 use_sitemap: bool = False, allowed_hosts: Optional[Iterable[str]] = None,
+                 max_frontier: int = 100_000, timeout: Optional[float] = None, stream: bool = False,
+                 max_bytes: Optional[int] = None, seen=None, respect_robots: bool = True,
+                 link_graph: Optional[LinkGraphBuilder] = None, anchor_index: Optional[AnchorIndex] = None,
+                 reconciler: Optional[SitemapReconciler] = None,
+                 keyword_index: Optional[SiteKeywordIndex] = None,
+                 word_frequency: Optional[WordFrequencySketch] = None):
+        self.seeds = list(seeds)
+        self.tools = tools or {}
+        self.max_depth = max_depth
+        self.max_pages = max_pages
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.crawl_delay = crawl_delay
+        self.use_sitemap = use_sitemap
+        self.allowed_hosts: Set[str] = ({host.lower() for host in allowed_hosts} if allowed_hosts
+                                        else {url_host(url) for url in self.seeds})
+        self.max_frontier = max_frontier
+        self.timeout = timeout
+        self.stream = stream
+        self.max_bytes = max_bytes
+        self.robots = RobotsCache(timeout=timeout) if respect_robots else None
+        self.link_graph = link_graph
+        self.anchor_index = anchor_index
+        self.reconciler = reconciler
+        self.keyword_index = keyword_index
+        self.word_frequency = word_frequency
+        self.stats = {"fetched": 0, "errors": 0, "queued": 0, "dropped": 0, "blocked": 0, "duplicates": 0}
+
+        self._seen = seen if seen is not None else HashedUrlSet()
+        # Redirect targets are marked seen from the worker threads
+        self._seen_lock = threading.Lock()
+        self._host_queues: Dict[str, List[Tuple[int, int, str]]] = {}
+        self._host_ready: List[Tuple[float, str]] = []
+        self._host_next: Dict[str, float] = {}
+        self._host_delay: Dict[str, float] = {}
+        self._host_active: Dict[str, int] = {}
+        self._host_waiting: Set[str] = set()
+        self._counter = itertools.count()
+        self._queued = 0
+
+        if stream:
+            unsupported = [name for name, tool in self.tools.items() if tool.accepts_document and not tool.streamable]
+            if unsupported:
+                raise ValueError(f"These tools need the full page and cannot run in streaming mode: {', '.join(unsupported)}")
+        # Own pooled session while crawling if the shared one keeps fewer than per_host connections
+        self._session = None
+
+    # Frontier
+
+    def add(self, url: str, depth: int = 0) -> bool:
+        """
+        Queue a URL if it is in scope, within max_depth and not seen before.
+        URLs are normalized first (see core/urls.py). Returns True if it was queued.
+        """
+        url = normalize_url(url)
+        host = url_host(url)
+        if not url.startswith(("http://", "https://")) or host not in self.allowed_hosts:
+            return False
+        if depth > self.max_depth:
+            return False
+        with self._seen_lock:
+            if url in self._seen:
+                return False
+            if self._queued >= self.max_frontier:
+                self.stats["dropped"] += 1
+                return False
+            self._seen.add(url)
+        rules = self.robots.peek(url) if self.robots is not None else None
+        if rules is not None and not rules.is_allowed(url):
+            self.stats["blocked"] += 1
+            return False
+        heapq.heappush(self._host_queues.setdefault(host, []), (depth, next(self._counter), url))
+        self._queued += 1
+        self.stats["queued"] += 1
+        self._wake(host)
+        return True
+
+    def _wake(self, host: str) -> None:
+        # Put a host with queued URLs and a free slot on the ready heap (once)
+        if host in self._host_waiting or not self._host_queues.get(host):
+            return
+        if self._host_active.get(host, 0) >= self.per_host:
+            return
+        self._host_waiting.add(host)
+        heapq.heappush(self._host_ready, (self._host_next.get(host, 0.0), host))
+
+    def _next_url(self, now: float) -> Optional[Tuple[str, int]]:
+        """Pop the best URL from the first host whose delay has passed, or None."""
+        if not self._host_ready or self._host_ready[0][0] > now:
+            return None
+        _, host = heapq.heappop(self._host_ready)
+        self._host_waiting.discard(host)
+        depth, _, url = heapq.heappop(self._host_queues[host])
+        if not self._host_queues[host]:
+            del self._host_queues[host]
+        self._queued -= 1
+        self._host_active[host] = self._host_active.get(host, 0) + 1
+        self._host_next[host] = now + self._host_delay.get(host, self.crawl_delay)
+        self._wake(host)
+        return url, depth
+
+    def _release(self, url: str, crawl_delay: Optional[float] = None) -> None:
+        host = url_host(url)
+        if crawl_delay is not None:
+            self._host_delay[host] = max(self.crawl_delay, min(crawl_delay, ROBOTS_CONFIG["max_crawl_delay"]))
+        self._host_active[host] -= 1
+        if not self._host_active[host]:
+            del self._host_active[host]
+        self._wake(host)
+
+    def _seconds_until_ready(self, now: float) -> Optional[float]:
+        return max(0.0, self._host_ready[0][0] - now) if self._host_ready else None
+
+    # Fetching
+
+    def _visit(self, url: str, depth: int) -> CrawlResult:
+        """Fetch one page, extract its links and run the tools. Runs on a worker thread."""
+        result = CrawlResult(url, depth)
+        if self.robots is not None:
+            rules = self.robots.rules_for(url)
+            result.crawl_delay = rules.crawl_delay()
+            if not rules.is_allowed(url):
+                result.blocked = True
+                return result
+        fetched = FetchResult(0, url)
+        try:
+            if self.stream:
+                fetched.document = stream_document(url, timeout=self.timeout, max_bytes=self.max_bytes,
+                                                   session=self._session)
+            else:
+                fetched.document = fetch_document(url, self.timeout, session=self._session)
+        except requests.exceptions.RequestException as e:
+            fetched.error = result.error = e
+        doc: Optional[PageDocument] = fetched.document
+        if doc is not None:
+            result.status_code = doc.status_code
+            result.redirect_status = doc.redirect_status
+            result.final_url = normalize_url(doc.final_url)
+            if result.final_url != url and not self._claim(result.final_url):
+                # Redirected to a page that is crawled on its own; process it only there
+                result.duplicate = True
+                return result
+            html = doc.ok and doc.is_html
+            if html and not doc.streamed:
+                try:
+                    # Parse up front so a page lxml cannot read fails on its own, not halfway through the collectors
+                    doc.index
+                except etree.LxmlError as e:
+                    result.error = e
+                    html = False
+            if html and (depth < self.max_depth or self.link_graph is not None or self.reconciler is not None):
+                result.links = self.extract_links(doc)
+            if html and self.reconciler is not None:
+                canonical = doc.index.links_with_rel("canonical")
+                if canonical and canonical[0].get("href"):
+                    result.canonical = resolve_url(doc.final_url, canonical[0]["href"])
+            if html and self.anchor_index is not None:
+                self.anchor_index.add_page(result.final_url, doc.index.anchors)
+            if html and self.keyword_index is not None and not doc.streamed:
+                self.keyword_index.add_document(result.final_url, doc)
+            if html and self.word_frequency is not None and not doc.streamed:
+                self.word_frequency.add_page(doc.page_text)
+        if self.tools:
+            doc_tools = {name: tool for name, tool in self.tools.items() if tool.accepts_document}
+            url_tools = {name: tool for name, tool in self.tools.items() if not tool.accepts_document}
+            result.results = _run_tools(fetched, doc_tools=doc_tools, url_tools=url_tools)
+        return result
+
+    def _reconcile(self, result: CrawlResult) -> None:
+        # A redirect is recorded under the requested URL and its target under the final one,
+        # unless the target is crawled on its own
+        final_url = result.final_url or result.url
+        if final_url != result.url:
+            self.reconciler.add_page(result.url, result.redirect_status or result.status_code,
+                                     final_url=final_url, final_status=result.status_code)
+        if not result.duplicate:
+            self.reconciler.add_page(final_url, result.status_code, result.links, canonical=result.canonical)
+
+    def _claim(self, url: str) -> bool:
+        """Mark a redirect target as seen; False if it already was."""
+        with self._seen_lock:
+            if url in self._seen:
+                return False
+            self._seen.add(url)
+            return True
+
+    def _sitemap_seeds(self, site: str) -> List[str]:
+        """
+        Page URLs from a site's sitemaps (those listed in robots.txt, else
+        /sitemap.xml), up to what the frontier can hold. With a reconciler,
+        the sitemaps are read to the end and every URL is recorded in it.
+        Runs on a worker thread.
+        """
+        sitemaps = self.robots.rules_for(site).sitemaps if self.robots is not None else []
+        entries = SitemapReader(timeout=self.timeout).iter_entries(sitemaps or [default_sitemap_url(site)])
+        with closing(entries):
+            if self.reconciler is None:
+                return [entry.loc for entry in itertools.islice(entries, self.max_frontier)]
+            seeds = []
+            for entry in entries:
+                self.reconciler.add_sitemap_url(entry.loc)
+                if len(seeds) < self.max_frontier:
+                    seeds.append(entry.loc)
+            return seeds
+
+    def extract_links(self, doc: PageDocument) -> List[str]:
+        """Normalized, in-scope http(s) links of a page, in page order."""
+        base = doc.final_url
+        links = []
+        for href, _ in doc.index.anchors:
+            link = resolve_url(base, href)
+            if link is not None and url_host(link) in self.allowed_hosts:
+                links.append(link)
+        return list(dict.fromkeys(links))
+
+    async def crawl_async(self) -> AsyncIterator[CrawlResult]:
+        """
+        Crawl until the frontier is empty or max_pages is reached, yielding results as pages complete.
+        Redirects to a page that is crawled under its own URL are counted in stats["duplicates"], not yielded.
+        """
+        loop = asyncio.get_running_loop()
+        for url in self.seeds:
+            self.add(url, 0)
+        if self.use_sitemap or self.reconciler is not None:
+            hosts = {url_origin(url) for url in self.seeds}
+            for site in hosts:
+                urls = await loop.run_in_executor(None, self._sitemap_seeds, site)
+                if not self.use_sitemap:
+                    continue
+                for url in urls:
+                    self.add(url, 0)
+                if self.link_graph is not None:
+                    self.link_graph.add_sitemap_urls(normalize_url(url) for url in urls)
+
+        started = 0
+        in_flight: Set[asyncio.Future] = set()
+        self._session = http_client.sized_session(self.per_host)
+        # The session is closed after the executor has let running fetches finish
+        with closing(self._session) if self._session is not None else nullcontext(), \
+                ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="crawl") as executor:
+            try:
+                while True:
+                    now = time.monotonic()
+                    while len(in_flight) < self.concurrency and started < self.max_pages:
+                        item = self._next_url(now)
+                        if item is None:
+                            break
+                        in_flight.add(loop.run_in_executor(executor, self._visit, *item))
+                        started += 1
+
+                    wait = self._seconds_until_ready(time.monotonic()) if started < self.max_pages else None
+                    if not in_flight:
+                        if wait is None:
+                            break
+                        await asyncio.sleep(wait)
+                        continue
+
+                    done, in_flight = await asyncio.wait(in_flight, timeout=wait,
+                                                         return_when=asyncio.FIRST_COMPLETED)
+                    for future in done:
+                        result = future.result()
+                        self._release(result.url, result.crawl_delay)
+                        if result.blocked:
+                            # Not fetched, so it does not count towards max_pages
+                            self.stats["blocked"] += 1
+                            started -= 1
+                            continue
+                        self.stats["fetched"] += 1
+                        if self.reconciler is not None:
+                            self._reconcile(result)
+                        if result.duplicate:
+                            self.stats["duplicates"] += 1
+                            continue
+                        if self.link_graph is not None and result.status_code is not None and result.status_code < 400:
+                            self.link_graph.add_page(result.final_url or result.url, result.links)
+                        if result.error is not None:
+                            self.stats["errors"] += 1
+                        if result.depth < self.max_depth:
+                            for link in result.links:
+                                self.add(link, result.depth + 1)
+                        yield result
+            finally:
+                for future in in_flight:
+                    future.cancel()
+
+    def crawl(self) -> Iterator[CrawlResult]:
+        """Synchronous wrapper around crawl_async()."""
+        loop = asyncio.new_event_loop()
+        agen = self.crawl_async()
+        try:
+            while True:
+                try:
+                    yield loop.run_until_complete(agen.__anext__())
+                except StopAsyncIteration:
+                    break
+        finally:
+            loop.run_until_complete(agen.aclose())
+            loop.close()
+
+    @property
+    def frontier_size(self) -> int:
+        """Number of URLs queued and not yet fetched."""
+        return self._queued
+
@@ -0,0 +1,161 @@
+"""
+core/document.py
+
+A fetched web page that can be shared by every tool.
+
+The page is downloaded once; the parse trees, the tag index and the visible
+text are only built the first time a tool asks for them and are then reused.
+"""
+
+import time
+from functools import cached_property
+from typing import Optional
+
+import requests
+from bs4 import BeautifulSoup
+from requests.structures import CaseInsensitiveDict
+
+from core import http_client
+from core.config import HTTP_CONFIG
+from core.extract import PageIndex, build_index
+from core.keyword_index import PageKeywordIndex
+from core.text import PageText
+from core.utils import get_text_from_html, make_lxml_tree, make_soup
+
+# Content-Types parsed as HTML; pages without a Content-Type are assumed to be HTML too
+HTML_CONTENT_TYPES = frozenset({"text/html", "application/xhtml+xml"})
+
+
+class PageDocument:
+    """
+    The raw response of a single page fetch plus lazily derived views of it.
+
+    Attributes:
+        url: The URL that was requested.
+        final_url: The URL after following redirects.
+        status_code: HTTP status code of the final response.
+        redirect_status: Status code of the first response if the request
+            was redirected (e.g. 301), otherwise None.
+        headers: Response headers (case-insensitive mapping).
+        content: Raw response body as bytes.
+        encoding: Declared or detected character encoding of the body.
+        elapsed: Seconds spent fetching the page.
+        truncated: True if the body was cut off at the streaming size limit.
+        from_cache: True if the response came from the HTTP response cache
+            (core/http_cache.py), so elapsed is not a network time.
+        streamed: True if the page was indexed while downloading (see
+            core/streaming.py); only ``index`` is available, not the body or trees.
+    """
+
+    def __init__(self, url: str, content: bytes, status_code: int = 200, headers=None,
+                 final_url: Optional[str] = None, encoding: Optional[str] = None,
+                 elapsed: float = 0.0, index: Optional[PageIndex] = None, truncated: bool = False,
+                 redirect_status: Optional[int] = None, from_cache: bool = False):
+        self.url = url
+        self.final_url = final_url or url
+        self.status_code = status_code
+        self.redirect_status = redirect_status
+        self.from_cache = from_cache
+        self.headers = headers if headers is not None else CaseInsensitiveDict()
+        self.content = content
+        self.encoding = encoding
+        self.elapsed = elapsed
+        self.truncated = truncated
+        self.streamed = index is not None
+        if index is not None:
+            self.__dict__["index"] = index
+
+    @classmethod
+    def from_response(cls, url: str, response: requests.Response, elapsed: Optional[float] = None) -> "PageDocument":
+        """
+        Build a document from a completed requests.Response.
+        """
+        return cls(
+            url=url,
+            content=response.content,
+            status_code=response.status_code,
+            headers=response.headers,
+            final_url=response.url,
+            encoding=response.encoding,
+            elapsed=response.elapsed.total_seconds() if elapsed is None else elapsed,
+            redirect_status=response.history[0].status_code if response.history else None,
+            from_cache=getattr(response, "from_cache", False),
+        )
+
+    @property
+    def is_html(self) -> bool:
+        """True if the Content-Type is an HTML type, or missing."""
+        content_type = self.headers.get("Content-Type", "").split(";")[0].strip().lower()
+        return not content_type or content_type in HTML_CONTENT_TYPES
+
+    @property
+    def ok(self) -> bool:
+        """True if the final response was not a 4xx/5xx error."""
+        return self.status_code < 400
+
+    @cached_property
+    def text(self) -> str:
+        """The response body decoded to a string."""
+        self._require_body()
+        encoding = self.encoding or "utf-8"
+        try:
+            return self.content.decode(encoding, errors="replace")
+        except LookupError:
+            return self.content.decode("utf-8", errors="replace")
+
+    @cached_property
+    def soup(self) -> BeautifulSoup:
+        """The BeautifulSoup parse tree, built on first access with the configured backend."""
+        return make_soup(self.text)
+
+    @cached_property
+    def tree(self):
+        """An lxml.html element tree for XPath/CSS queries, built on first access."""
+        self._require_body()
+        return make_lxml_tree(self.content, encoding=self.encoding)
+
+    @cached_property
+    def index(self) -> PageIndex:
+        """Headings, images, meta tags, links, anchors and JSON-LD, collected in one pass over the tree."""
+        return build_index(self.tree)
+
+    @cached_property
+    def visible_text(self) -> str:
+        """All visible text of the page with whitespace collapsed."""
+        return get_text_from_html(self.soup)
+
+    @cached_property
+    def page_text(self) -> PageText:
+        """The visible text split into word tokens and sentences (see core/text.py)."""
+        return PageText(self.visible_text)
+
+    @cached_property
+    def keyword_index(self) -> PageKeywordIndex:
+        """Positional indexes of the words of the text, title and headings (see core/keyword_index.py)."""
+        return PageKeywordIndex.from_document(self)
+
+    def _require_body(self) -> None:
+        if self.streamed:
+            raise ValueError(f"{self.url} was fetched in streaming mode; only doc.index is available")
+
+    def __repr__(self) -> str:
+        return f"<PageDocument {self.final_url} [{self.status_code}] {len(self.content)} bytes>"
+
+
+def fetch_document(url: str, timeout: Optional[float] = None,
+                   session: Optional[requests.Session] = None, cache: bool = True) -> PageDocument:
+    """
+    Download a URL once and wrap the response in a PageDocument.
+
+    Unlike get_page_content, HTTP error statuses are not treated as failures;
+    check ``doc.ok`` instead. The request goes through the shared pooled session
+    unless another one is given; timeout defaults to HTTP_CONFIG["timeout"].
+    With cache=False the response cache is bypassed.
+
+    Raises:
+        requests.exceptions.RequestException: If the page could not be fetched.
+    """
+    start = time.perf_counter()
+    response = http_client.get(url, timeout=timeout or HTTP_CONFIG["timeout"], session=session, cache=cache)
+    elapsed = time.perf_counter() - start
+    return PageDocument.from_response(url, response, elapsed=elapsed)
@@ -0,0 +1,118 @@
+"""
+core/extract.py
+
+Single-pass extraction of the tag-level facts most tools need.
+
+Instead of every tool searching the whole tree again (find_all per heading
+level, per meta property, per link rel, ...), the page is walked once and the
+relevant elements are filed into a PageIndex: the title, headings in
+document order, images, meta tags by name/property, <link> rels, anchors and
+JSON-LD scripts. Tools then read from the index.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+HEADING_TAGS = {"h1": 1, "h2": 2, "h3": 3, "h4": 4, "h5": 5, "h6": 6}
+
+# Tags whose text content the index keeps
+TEXT_TAGS = {"title", "a", "script", *HEADING_TAGS}
+
+
+class PageIndex:
+    """
+    Tag-level facts about a page, collected in one traversal.
+
+    Attributes:
+        title: Text of the first <title>, or None if there is none.
+        headings: (level, text) for every h1-h6 in document order.
+        images: Attribute dicts of every <img>.
+        metas: Attribute dicts of every <meta>.
+        meta_by_name: First <meta> per exact name attribute.
+        meta_by_property: First <meta> per exact property attribute.
+        links: Attribute dicts of every <link>.
+        anchors: (href, text) for every <a href>, href as written in the page.
+        json_ld: Raw text of every <script type="application/ld+json">.
+    """
+
+    def __init__(self):
+        self.title: Optional[str] = None
+        self.headings: List[Tuple[int, str]] = []
+        self.images: List[Dict[str, str]] = []
+        self.metas: List[Dict[str, str]] = []
+        self.meta_by_name: Dict[str, Dict[str, str]] = {}
+        self.meta_by_property: Dict[str, Dict[str, str]] = {}
+        self.links: List[Dict[str, str]] = []
+        self.anchors: List[Tuple[str, str]] = []
+        self.json_ld: List[str] = []
+
+    def add(self, tag: str, attrs: Dict[str, str], text: Optional[str] = None) -> None:
+        """
+        File one element into the index.
+
+        Args:
+            tag: Lowercase tag name.
+            attrs: The element's attributes.
+            text: The element's text (stripped pieces joined, like
+                get_text(strip=True)); only needed for tags in TEXT_TAGS.
+        """
+        if tag in HEADING_TAGS:
+            self.headings.append((HEADING_TAGS[tag], text or ""))
+        elif tag == "a":
+            if "href" in attrs:
+                self.anchors.append((attrs["href"], text or ""))
+        elif tag == "img":
+            self.images.append(attrs)
+        elif tag == "meta":
+            self.metas.append(attrs)
+            if "name" in attrs:
+                self.meta_by_name.setdefault(attrs["name"], attrs)
+            if "property" in attrs:
+                self.meta_by_property.setdefault(attrs["property"], attrs)
+        elif tag == "link":
+            self.links.append(attrs)
+        elif tag == "title":
+            if self.title is None:
+                self.title = text or ""
+        elif tag == "script":
+            if attrs.get("type", "").strip().lower() == "application/ld+json":
+                self.json_ld.append(text or "")
+
+    def meta_content(self, name: Optional[str] = None, property: Optional[str] = None) -> Optional[str]:
+        """
+        Return the content attribute of the first meta tag with the given name
+        or property, "" if the tag has no content, or None if there is no such tag.
+        """
+        tag = self.meta_by_name.get(name) if name is not None else self.meta_by_property.get(property)
+        if tag is None:
+            return None
+        return tag.get("content", "")
+
+    def links_with_rel(self, rel: str) -> List[Dict[str, str]]:
+        """
+        Return <link> attribute dicts whose rel contains the given token
+        (case-insensitive), e.g. links_with_rel("canonical").
+        """
+        rel = rel.lower()
+        return [link for link in self.links if rel in link.get("rel", "").lower().split()]
+
+
+def build_index(root) -> PageIndex:
+    """
+    Walk an lxml element tree once and return its PageIndex.
+    """
+    index = PageIndex()
+    for el in root.iter():
+        tag = el.tag
+        # Skip comments and processing instructions, whose tag is not a string
+        if not isinstance(tag, str):
+            continue
+        tag = tag.lower()
+        if tag in TEXT_TAGS:
+            if tag == "script":
+                text = el.text or ""
+            else:
+                text = "".join(piece.strip() for piece in el.itertext())
+            index.add(tag, dict(el.attrib), text)
+        elif tag in ("img", "meta", "link"):
+            index.add(tag, dict(el.attrib))
+    return index
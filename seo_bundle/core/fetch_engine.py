@@ -0,0 +1,231 @@
+"""
+core/fetch_engine.py
+
+Concurrent fetch engine for bulk analysis.
+
+Pages are downloaded concurrently on an asyncio event loop with a global
+concurrency limit and a per-host limit, then handed to the tools as shared
+PageDocument objects. The blocking HTTP calls go through the pooled session
+in core/http_client.py on a worker thread pool, so keep-alive connections are
+reused across the whole batch. If the shared pools are smaller than per_host,
+the engine uses its own larger session instead of resizing the shared one.
+
+The concurrency limits only cover downloads: a page's tools run after its
+request slot is released, so slow tools do not keep other pages waiting
+for a connection.
+"""
+
+import asyncio
+from collections import defaultdict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+
+from core import http_client
+from core.document import PageDocument, fetch_document
+from core.streaming import stream_document
+
+
+class FetchResult:
+    """
+    Outcome of fetching one URL.
+
+    Attributes:
+        index: Position of the URL in the input sequence.
+        url: The requested URL.
+        document: The fetched page, or None if the request failed.
+        error: The exception raised while fetching, if any.
+        results: Tool results, when the engine was asked to analyze the page.
+    """
+
+    __slots__ = ("index", "url", "document", "error", "results")
+
+    def __init__(self, index: int, url: str, document: Optional[PageDocument] = None,
+                 error: Optional[Exception] = None):
+        self.index = index
+        self.url = url
+        self.document = document
+        self.error = error
+        self.results = None
+
+
+class FetchEngine:
+    """
+    Downloads many URLs concurrently and optionally runs tools over them.
+
+    Args:
+        concurrency: Maximum number of requests in flight overall.
+        per_host: Maximum number of requests in flight to a single host.
+        timeout: Per-request timeout in seconds (defaults to HTTP_CONFIG["timeout"]).
+        processes: If greater than 0, tools run in a pool of this many worker
+            processes instead of threads, so CPU-bound parsing uses every core.
+        stream: Index pages while they download instead of keeping the body and
+            building a tree (see core/streaming.py). Only streamable tools can run.
+        max_bytes: Body size limit in streaming mode (defaults to
+            STREAMING_CONFIG["max_body_bytes"]); longer pages are marked truncated.
+    """
+
+    def __init__(self, concurrency: int = 32, per_host: int = 8, timeout: Optional[float] = None,
+                 processes: int = 0, stream: bool = False, max_bytes: Optional[int] = None):
+        if concurrency < 1 or per_host < 1:
+            raise ValueError("concurrency and per_host must be at least 1")
+        self.concurrency = concurrency
+        self.per_host = min(per_host, concurrency)
+        self.timeout = timeout
+        self.processes = processes
+        self.stream = stream
+        self.max_bytes = max_bytes
+        # Keep one pooled keep-alive connection available for every request a host may have in flight
+        self.session = http_client.sized_session(self.per_host)
+
+    def close(self) -> None:
+        """Close the engine's own session, if it has one."""
+        if self.session is not None:
+            self.session.close()
+            self.session = None
+
+    async def iter_documents(self, urls: Iterable[str], fetch_pages: bool = True,
+                             process: Optional[Callable[[FetchResult], dict]] = None,
+                             process_executor: Optional[Executor] = None) -> AsyncIterator[FetchResult]:
+        """
+        Fetch URLs concurrently, yielding results in completion order.
+
+        Only a bounded window of requests is scheduled at a time, so the input
+        can be a large or lazy iterable. With fetch_pages=False nothing is
+        downloaded and each result only carries the URL. If process is given it
+        runs on a worker thread (or on process_executor) for every result and its
+        return value is stored in result.results; the document is then released
+        to keep memory flat.
+
+        The concurrency limits are held while a page downloads and released
+        before process runs. With fetch_pages=False, process does the requests
+        itself (URL tools), so it runs under the limits instead.
+        """
+        loop = asyncio.get_running_loop()
+        global_limit = asyncio.Semaphore(self.concurrency)
+        host_limits: Dict[str, asyncio.Semaphore] = defaultdict(lambda: asyncio.Semaphore(self.per_host))
+        max_pending = self.concurrency * 2
+
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="fetch") as executor, \
+                ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="tools") as tool_executor:
+
+            async def run_process(result: FetchResult) -> None:
+                result.results = await loop.run_in_executor(process_executor or tool_executor, process, result)
+                result.document = None
+
+            async def fetch(index: int, url: str) -> FetchResult:
+                result = FetchResult(index, url)
+                async with host_limits[urlparse(url).netloc], global_limit:
+                    if fetch_pages:
+                        try:
+                            result.document = await loop.run_in_executor(executor, self._fetch, url)
+                        except requests.exceptions.RequestException as e:
+                            result.error = e
+                    elif process is not None:
+                        await run_process(result)
+                        return result
+                if process is not None:
+                    await run_process(result)
+                return result
+
+            pending = set()
+            try:
+                for index, url in enumerate(urls):
+                    pending.add(asyncio.ensure_future(fetch(index, url)))
+                    if len(pending) >= max_pending:
+                        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                        for task in done:
+                            yield task.result()
+                while pending:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        yield task.result()
+            finally:
+                for task in pending:
+                    task.cancel()
+
+    def _fetch(self, url: str) -> PageDocument:
+        if self.stream:
+            return stream_document(url, timeout=self.timeout, max_bytes=self.max_bytes, session=self.session)
+        return fetch_document(url, self.timeout, session=self.session)
+
+    async def analyze(self, tools: Dict[str, object], urls: Iterable[str]) -> AsyncIterator[Tuple[int, str, Dict[str, dict]]]:
+        """
+        Fetch every URL once and run each tool on the shared document.
+
+        Yields:
+            (index, url, {tool_name: result}) tuples in completion order. In
+            streaming mode, results for a page cut off at max_bytes carry
+            "truncated": True.
+
+        Raises:
+            ValueError: In streaming mode, if a page tool is not streamable.
+        """
+        doc_tools = {name: tool for name, tool in tools.items() if tool.accepts_document}
+        url_tools = {name: tool for name, tool in tools.items() if not tool.accepts_document}
+        if self.stream:
+            unsupported = [name for name, tool in doc_tools.items() if not tool.streamable]
+            if unsupported:
+                raise ValueError(f"These tools need the full page and cannot run in streaming mode: {', '.join(unsupported)}")
+
+        process = partial(_run_tools, doc_tools=doc_tools, url_tools=url_tools)
+
+        pool = ProcessPoolExecutor(max_workers=self.processes) if self.processes > 0 else None
+        try:
+            async for fetched in self.iter_documents(urls, fetch_pages=bool(doc_tools), process=process,
+                                                     process_executor=pool):
+                yield fetched.index, fetched.url, fetched.results
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+
+    def run_tools(self, tools: Dict[str, object], urls: Iterable[str]) -> Iterator[Tuple[int, str, Dict[str, dict]]]:
+        """
+        Synchronous wrapper around analyze() that streams results as they complete.
+        """
+        loop = asyncio.new_event_loop()
+        agen = self.analyze(tools, urls)
+        try:
+            while True:
+                try:
+                    yield loop.run_until_complete(agen.__anext__())
+                except StopAsyncIteration:
+                    break
+        finally:
+            loop.run_until_complete(agen.aclose())
+            loop.close()
+
+    def fetch_all(self, urls: Iterable[str]) -> List[FetchResult]:
+        """
+        Fetch every URL and return the results in input order.
+        """
+        async def collect():
+            return [result async for result in self.iter_documents(urls)]
+
+        return sorted(asyncio.run(collect()), key=lambda r: r.index)
+
+
+def _run_tools(fetched: FetchResult, doc_tools: Dict[str, object], url_tools: Dict[str, object]) -> Dict[str, dict]:
+    """
+    Run tools against one fetched URL, isolating failures per tool.
+    """
+    results = {}
+    for name, tool in doc_tools.items():
+        try:
+            if fetched.document is None:
+                results[name] = tool.fetch_error(fetched.url, fetched.error)
+            else:
+                results[name] = tool.run_document(fetched.document)
+                if fetched.document.truncated:
+                    results[name]["truncated"] = True
+        except Exception as e:
+            results[name] = {"error": f"An unexpected error occurred: {e}"}
+    for name, tool in url_tools.items():
+        try:
+            results[name] = tool.run(fetched.url)
+        except Exception as e:
+            results[name] = {"error": f"An unexpected error occurred: {e}"}
+    return results
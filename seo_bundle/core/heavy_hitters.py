@@ -0,0 +1,178 @@
+"""
+core/heavy_hitters.py
+
+Site-wide word and bigram frequencies in bounded memory.
+
+An exact Counter over every token and bigram of a large crawl grows with
+the vocabulary (and the number of distinct bigrams grows much faster than
+that). HeavyHitters keeps a Misra-Gries summary instead (the mergeable
+form of Space-Saving): at most 2 / error counters, however many items and
+occurrences go through it, with these guarantees after N occurrences:
+
+    - every item occurring more than error * N times has a counter
+    - a counter undercounts its item by at most `offset`, which never
+      exceeds error * N (the true count is in [count, count + offset])
+
+Updates are weighted, so a page is counted exactly first (a Counter of
+its own tokens) and merged in with one update per distinct word. When the
+table reaches 2 / error entries it is reduced: the (1 / error)-th largest
+count is subtracted from every counter and the ones that reach zero are
+dropped. Two summaries merge with the same guarantees, so summaries built
+in worker processes can be combined.
+
+WordFrequencySketch keeps one summary for words and one for bigrams
+(adjacent words within a sentence) and can report the site-level top N at
+any point while pages are still being added.
+"""
+
+import math
+import threading
+from collections import Counter
+from typing import Dict, Iterator, List, Mapping, Tuple
+
+import numpy as np
+
+from core.config import WORD_FREQUENCY_CONFIG
+from core.text import PageText
+
+
+class HeavyHitters:
+    """
+    Misra-Gries frequent items summary.
+
+    Args:
+        error: Largest undercount as a fraction of all occurrences counted;
+            the summary keeps about 1 / error items (up to twice that
+            between reductions).
+
+    Attributes:
+        total: Occurrences counted so far (N).
+        offset: Upper bound on how much any count is below the true one.
+    """
+
+    def __init__(self, error: float = WORD_FREQUENCY_CONFIG["error"]):
+        if not 0 < error < 1:
+            raise ValueError("error must be between 0 and 1")
+        self.error = error
+        self.capacity = math.ceil(1 / error)
+        self.total = 0
+        self.offset = 0
+        self._counts: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        """Number of counters kept."""
+        return len(self._counts)
+
+    def add(self, item: str, count: int = 1) -> None:
+        self.update({item: count})
+
+    def update(self, counts: Mapping[str, int]) -> None:
+        """Count items with their number of occurrences (e.g. a Counter of one page)."""
+        table = self._counts
+        added = 0
+        for item, count in counts.items():
+            table[item] = table.get(item, 0) + count
+            added += count
+        self.total += added
+        if len(table) >= 2 * self.capacity:
+            self._reduce()
+
+    def merge(self, other: "HeavyHitters") -> None:
+        """Add the counts of another summary (built with the same error)."""
+        self.update(other._counts)
+        self.total += other.total - sum(other._counts.values())
+        self.offset += other.offset
+        if len(self._counts) >= 2 * self.capacity:
+            self._reduce()
+
+    def _reduce(self) -> None:
+        # Subtract the capacity-th largest count from every counter; at least capacity
+        # counters lose that much each time, which is what bounds offset by total / capacity
+        counts = np.fromiter(self._counts.values(), dtype=np.int64, count=len(self._counts))
+        cut = int(np.partition(counts, len(counts) - self.capacity)[len(counts) - self.capacity])
+        self.offset += cut
+        self._counts = {item: count - cut for item, count in self._counts.items() if count > cut}
+
+    def count(self, item: str) -> int:
+        """Lower bound of an item's count (0 if it has no counter)."""
+        return self._counts.get(item, 0)
+
+    def top(self, n: int) -> List[Tuple[str, int]]:
+        """The n items with the highest counts, highest first (ties by item)."""
+        return sorted(self._counts.items(), key=lambda item: (-item[1], item[0]))[:n]
+
+
+class WordFrequencySketch:
+    """
+    Site-level word and bigram frequencies, added one page at a time.
+    Safe to update from several threads.
+
+    Args:
+        error: Error bound of each summary (see HeavyHitters).
+    """
+
+    def __init__(self, error: float = WORD_FREQUENCY_CONFIG["error"]):
+        self.words = HeavyHitters(error)
+        self.bigrams = HeavyHitters(error)
+        self.pages = 0
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def add_page(self, page_text: PageText) -> None:
+        """Count the words of a page (e.g. doc.page_text) and the bigrams within its sentences."""
+        tokens = page_text.tokens
+        words = Counter(tokens)
+        bigrams = Counter()
+        for start, end in page_text.sentences:
+            sentence = tokens[start:end]
+            bigrams.update(map(" ".join, zip(sentence, sentence[1:])))
+        with self._lock:
+            self.words.update(words)
+            self.bigrams.update(bigrams)
+            self.pages += 1
+
+    def merge(self, other: "WordFrequencySketch") -> None:
+        """Add the counts of another sketch, e.g. one filled in a worker process."""
+        with self._lock:
+            self.words.merge(other.words)
+            self.bigrams.merge(other.bigrams)
+            self.pages += other.pages
+
+    def top(self, n: int = WORD_FREQUENCY_CONFIG["top"]) -> dict:
+        """The site-level top n words and bigrams so far, with the counts' error bounds."""
+        with self._lock:
+            return {
+                "pages": self.pages,
+                "total_words": self.words.total,
+                "total_bigrams": self.bigrams.total,
+                "top_words": self.words.top(n),
+                "top_bigrams": self.bigrams.top(n),
+                "max_undercount": {"words": self.words.offset, "bigrams": self.bigrams.offset},
+            }
+
+    def report(self, n: int = WORD_FREQUENCY_CONFIG["top"]) -> Iterator[dict]:
+        """
+        One row per top word, then per top bigram: its count and the range
+        its true count is in.
+        """
+        with self._lock:
+            rows = [(kind, summary.top(n), summary.offset, summary.total)
+                    for kind, summary in (("word", self.words), ("bigram", self.bigrams))]
+        for kind, top, offset, total in rows:
+            for rank, (term, count) in enumerate(top, 1):
+                yield {
+                    "type": kind,
+                    "rank": rank,
+                    "term": term,
+                    "count": count,
+                    "max_count": count + offset,
+                    "share_percent": round(count / total * 100, 4) if total else 0.0,
+                }
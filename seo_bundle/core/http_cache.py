@@ -0,0 +1,254 @@
+"""
+core/http_cache.py
+
+Persistent HTTP response cache backed by SQLite.
+
+Responses are keyed by normalized URL. Freshness follows Cache-Control
+(max-age, no-cache, no-store) and Expires; stale entries that carry an ETag
+or Last-Modified are revalidated with a conditional request, so a
+304 Not Modified reuses the stored body instead of downloading it again.
+The database is kept under a byte budget by evicting the least recently
+used entries. The stored byte total is tracked in memory, and the access
+times of cache hits are written in batches rather than one commit per hit.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from datetime import timedelta
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from core.urls import normalize_url
+
+# Cache hits whose access time is held in memory before it is written out
+TOUCH_BATCH = 256
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    status_code INTEGER NOT NULL,
+    headers TEXT NOT NULL,
+    body BLOB NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    expires_at REAL NOT NULL,
+    last_access REAL NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access);
+"""
+
+
+def cache_key(url: str) -> str:
+    """
+    Normalize a URL for use as a cache key: lowercase scheme and host,
+    drop default ports and the fragment. The query is kept as sent.
+    """
+    return normalize_url(url, strip_tracking=False, sort_query=False)
+
+
+def freshness_lifetime(headers, now: float) -> Optional[float]:
+    """
+    Return the absolute expiry time for a response, 0 if it must always be
+    revalidated, or None if it must not be stored at all.
+    """
+    directives = {}
+    for item in headers.get("Cache-Control", "").split(","):
+        name, _, value = item.strip().partition("=")
+        if name:
+            directives[name.lower()] = value.strip('"')
+    if "no-store" in directives:
+        return None
+    if "no-cache" in directives:
+        return 0.0
+    if "max-age" in directives:
+        try:
+            return now + max(0, int(directives["max-age"]))
+        except ValueError:
+            return 0.0
+    if "Expires" in headers:
+        try:
+            return parsedate_to_datetime(headers["Expires"]).timestamp()
+        except (TypeError, ValueError):
+            return 0.0
+    return 0.0
+
+
+class HttpCache:
+    """
+    SQLite-backed response cache with conditional revalidation and LRU eviction.
+
+    Args:
+        path: Database file path (":memory:" for a throwaway cache).
+        max_bytes: Upper bound on the total size of stored bodies.
+
+    The counters in ``stats`` are:
+        hits: served from cache without touching the network.
+        revalidated: stale entries confirmed by a 304 Not Modified.
+        misses: full downloads (nothing stored or the entry changed).
+        stores: responses written to the cache.
+        evictions: entries removed to stay under max_bytes.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 256 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.stats = {"hits": 0, "revalidated": 0, "misses": 0, "stores": 0, "evictions": 0}
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.executescript(SCHEMA)
+        self._bytes = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        self._touched = {}
+
+    def get(self, session: requests.Session, url: str, **kwargs) -> requests.Response:
+        """
+        GET a URL through the cache using the given session.
+        """
+        key = cache_key(url)
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT url, status_code, headers, body, etag, last_modified, expires_at FROM responses WHERE key = ?",
+                (key,)
+            ).fetchone()
+
+        if row and row[6] > now:
+            self._touch(key, now)
+            self._count("hits")
+            return self._build_response(row)
+
+        headers = dict(kwargs.pop("headers", None) or {})
+        if row:
+            if row[4]:
+                headers["If-None-Match"] = row[4]
+            if row[5]:
+                headers["If-Modified-Since"] = row[5]
+        response = session.get(url, headers=headers, **kwargs)
+
+        if row and response.status_code == 304:
+            # Merge the refreshed headers into the stored ones and extend freshness
+            stored_headers = CaseInsensitiveDict(json.loads(row[2]))
+            stored_headers.update(response.headers)
+            expires_at = freshness_lifetime(stored_headers, now)
+            with self._lock:
+                self._flush_touches()
+                if expires_at is None:
+                    # The server now says no-store: serve the stored body this once, then forget it
+                    self._delete(key)
+                else:
+                    self._db.execute(
+                        "UPDATE responses SET headers = ?, expires_at = ?, last_access = ? WHERE key = ?",
+                        (json.dumps(dict(stored_headers)), expires_at, now, key)
+                    )
+                self._db.commit()
+            self._count("revalidated")
+            return self._build_response((row[0], row[1], json.dumps(dict(stored_headers)), row[3]))
+
+        self._count("misses")
+        self._store(key, response, now)
+        return response
+
+    def _store(self, key: str, response: requests.Response, now: float) -> None:
+        if response.status_code != 200:
+            return
+        expires_at = freshness_lifetime(response.headers, now)
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        # Nothing to gain from an entry that is never fresh and cannot be revalidated
+        if expires_at is None or (expires_at <= now and not (etag or last_modified)):
+            return
+        body = response.content
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            self._flush_touches()
+            old = self._db.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, response.url, response.status_code, json.dumps(dict(response.headers)), body,
+                 etag, last_modified, expires_at, now, len(body))
+            )
+            self._bytes += len(body) - (old[0] if old else 0)
+            if self._bytes > self.max_bytes:
+                self._evict()
+            self._db.commit()
+        self._count("stores")
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until the cache fits in max_bytes. Caller holds the lock."""
+        for key, size in self._db.execute("SELECT key, size FROM responses ORDER BY last_access").fetchall():
+            self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self.stats["evictions"] += 1
+            self._bytes -= size
+            if self._bytes <= self.max_bytes:
+                break
+
+    def _delete(self, key: str) -> None:
+        """Remove one entry. Caller holds the lock."""
+        row = self._db.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+        if row:
+            self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._bytes -= row[0]
+
+    def _touch(self, key: str, now: float) -> None:
+        """Record a cache hit; access times are written once TOUCH_BATCH hits have piled up."""
+        with self._lock:
+            self._touched[key] = now
+            if len(self._touched) >= TOUCH_BATCH:
+                self._flush_touches()
+                self._db.commit()
+
+    def _flush_touches(self) -> None:
+        """Write the pending access times, without committing. Caller holds the lock."""
+        if self._touched:
+            self._db.executemany("UPDATE responses SET last_access = ? WHERE key = ?",
+                                 [(now, key) for key, now in self._touched.items()])
+            self._touched.clear()
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self.stats[name] += 1
+
+    @staticmethod
+    def _build_response(row) -> requests.Response:
+        url, status_code, headers, body = row[:4]
+        response = requests.Response()
+        response.url = url
+        response.status_code = status_code
+        response.headers = CaseInsensitiveDict(json.loads(headers))
+        response._content = body
+        response._content_consumed = True
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.reason = "OK"
+        response.elapsed = timedelta(0)
+        response.from_cache = True
+        return response
+
+    def summary(self) -> dict:
+        """
+        Return the hit/miss counters plus the current number of entries and stored bytes.
+        """
+        with self._lock:
+            entries = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            return {**self.stats, "entries": entries, "bytes": self._bytes}
+
+    def clear(self) -> None:
+        """Remove every stored response."""
+        with self._lock:
+            self._touched.clear()
+            self._db.execute("DELETE FROM responses")
+            self._db.commit()
+            self._bytes = 0
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush_touches()
+            self._db.commit()
+            self._db.close()
@@ -0,0 +1,159 @@
+"""
+core/http_client.py
+
+Shared HTTP layer for the SEO toolkit.
+
+Every tool goes through one requests.Session so TCP/TLS connections are kept
+alive and reused per host instead of being opened for every request. Pool
+sizes, the default timeout and the User-Agent come from HTTP_CONFIG.
+
+When HTTP_CONFIG["cache_path"] is set, plain GETs are served through the
+persistent response cache in core/http_cache.py.
+"""
+
+import threading
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from core.config import HTTP_CONFIG
+from core.http_cache import HttpCache
+
+# Statuses servers use to say they do not support HEAD
+HEAD_NOT_ALLOWED = frozenset({405, 501})
+
+_session: Optional[requests.Session] = None
+_cache: Optional[HttpCache] = None
+_session_lock = threading.Lock()
+
+
+def build_session(config: Optional[dict] = None) -> requests.Session:
+    """
+    Create a requests.Session with pooled, keep-alive adapters for http and https.
+    """
+    config = {**HTTP_CONFIG, **(config or {})}
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=config["pool_connections"],
+        pool_maxsize=config["pool_maxsize"],
+        pool_block=config["pool_block"],
+        max_retries=config["max_retries"],
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["User-Agent"] = config["user_agent"]
+    return session
+
+
+def get_session() -> requests.Session:
+    """
+    Return the process-wide session, creating it on first use.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = build_session()
+    return _session
+
+
+def get_cache() -> Optional[HttpCache]:
+    """
+    Return the shared response cache, or None if caching is disabled.
+    """
+    global _cache
+    if _cache is None and HTTP_CONFIG["cache_path"]:
+        with _session_lock:
+            if _cache is None:
+                _cache = HttpCache(HTTP_CONFIG["cache_path"], max_bytes=HTTP_CONFIG["cache_max_bytes"])
+    return _cache
+
+
+def cache_stats() -> dict:
+    """
+    Return the response cache counters (hits, revalidated, misses, stores,
+    evictions, entries, bytes), or an empty dict if caching is disabled.
+    """
+    cache = get_cache()
+    return cache.summary() if cache else {}
+
+
+def configure(**overrides) -> None:
+    """
+    Update HTTP_CONFIG and rebuild the shared session with the new settings.
+
+    Example:
+        configure(pool_maxsize=64, timeout=20, cache_path="http_cache.sqlite")
+    """
+    unknown = set(overrides) - set(HTTP_CONFIG)
+    if unknown:
+        raise ValueError(f"Unknown HTTP settings: {', '.join(sorted(unknown))}")
+    HTTP_CONFIG.update(overrides)
+    close()
+
+
+def close() -> None:
+    """
+    Close the shared session and cache, releasing pooled connections.
+    """
+    global _session, _cache
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+        if _cache is not None:
+            _cache.close()
+            _cache = None
+
+
+def sized_session(per_host: int) -> Optional[requests.Session]:
+    """
+    A new session whose pools keep per_host connections alive, for a caller
+    that sends that many requests to one host at once (e.g. FetchEngine).
+    Returns None when the shared session's pools are already large enough.
+    The shared session and HTTP_CONFIG are left untouched; close the new
+    session when done.
+    """
+    if HTTP_CONFIG["pool_maxsize"] >= per_host:
+        return None
+    return build_session({"pool_maxsize": per_host})
+
+
+def request(method: str, url: str, session: Optional[requests.Session] = None, cache: bool = True,
+            **kwargs) -> requests.Response:
+    """
+    Send a request through the shared session (or the given one), applying
+    the default timeout. Full-body GETs go through the response cache when
+    it is enabled, unless cache is False.
+    """
+    kwargs.setdefault("timeout", HTTP_CONFIG["timeout"])
+    session = session or get_session()
+    cache = get_cache() if cache else None
+    if (cache is not None and method.upper() == "GET" and not kwargs.get("stream")
+            and "Range" not in (kwargs.get("headers") or {})):
+        return cache.get(session, url, **kwargs)
+    return session.request(method, url, **kwargs)
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    """GET a URL through the shared session."""
+    return request("GET", url, **kwargs)
+
+
+def head(url: str, **kwargs) -> requests.Response:
+    """HEAD a URL through the shared session."""
+    return request("HEAD", url, **kwargs)
+
+
+def head_or_get(url: str, **kwargs) -> requests.Response:
+    """
+    HEAD a URL, falling back to a streamed GET when the server does not
+    support HEAD. The GET's body is never read: the response is closed as
+    soon as its headers are in, so only status and headers are available.
+    """
+    response = head(url, **kwargs)
+    if response.status_code in HEAD_NOT_ALLOWED:
+        response = request("GET", url, stream=True, **kwargs)
+        response.close()
+    return response
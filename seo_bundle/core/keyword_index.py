@@ -0,0 +1,362 @@
+"""
+core/keyword_index.py
+
+Positional inverted indexes of page words: term -> sorted token positions.
+
+A page's tokens (doc.page_text), its title and its headings are each
+indexed once per document and memoized as doc.keyword_index. Every keyword
+question is then answered from the postings instead of scanning the text:
+
+    positions       where a word or multi-word phrase starts in the body
+                    (phrases are matched by intersecting the postings of
+                    their words, starting from the rarest one)
+    first position  the earliest of those
+    proximity       fewest words between two keywords
+    title/headings  whether a keyword occurs in the title or in a heading
+                    (and the levels of those headings)
+
+SiteKeywordIndex checks a keyword list given up front against every page
+of a crawl. It keeps, per page, only the postings of the keywords' words
+(as compact arrays) plus a term -> pages map, so memory grows with how
+often those words occur rather than with the size of the site's text.
+
+Keywords are tokenized like page text (core/text.py), so "E-mail
+Marketing" matches the words "e-mail marketing".
+"""
+
+import threading
+from array import array
+from bisect import bisect_left
+from typing import AbstractSet, Dict, Iterable, Iterator, List, Optional, Sequence, Set
+
+from core.text import tokenize
+
+
+class PositionalIndex:
+    """
+    Positions of every term in a sequence of token segments.
+
+    Segments (e.g. the headings of a page) are numbered one after another
+    with a one-position gap between them, so a phrase never matches across
+    two segments.
+
+    Args:
+        segments: Token lists to index.
+        terms: Only index these terms (every token still takes a position).
+
+    Attributes:
+        postings: Term -> ascending positions (a list, or an array once compacted).
+        starts: Start position of each segment.
+        length: Number of positions used, gaps included.
+    """
+
+    __slots__ = ("postings", "starts", "length", "terms")
+
+    def __init__(self, segments: Iterable[Sequence[str]] = (), terms: Optional[AbstractSet[str]] = None):
+        self.postings: Dict[str, Sequence[int]] = {}
+        self.starts: List[int] = []
+        self.length = 0
+        self.terms = terms
+        for tokens in segments:
+            self.add(tokens)
+
+    def add(self, tokens: Sequence[str]) -> None:
+        """Append one segment."""
+        if self.starts:
+            self.length += 1
+        self.starts.append(self.length)
+        postings, terms = self.postings, self.terms
+        for position, term in enumerate(tokens, self.length):
+            if terms is not None and term not in terms:
+                continue
+            positions = postings.get(term)
+            if positions is None:
+                postings[term] = [position]
+            else:
+                positions.append(position)
+        self.length += len(tokens)
+
+    def positions(self, phrase: Sequence[str]) -> List[int]:
+        """Ascending start positions of a phrase (a list of tokens)."""
+        if not phrase:
+            return []
+        lists = []
+        for term in phrase:
+            positions = self.postings.get(term)
+            if positions is None:
+                return []
+            lists.append(positions)
+        if len(lists) == 1:
+            return list(lists[0])
+        # Candidate starts from the rarest word, then keep those the other words line up
+        # with, shortest list first: a binary search per candidate when there are few
+        # candidates, a set lookup when the candidates are a good part of the list
+        order = sorted(range(len(lists)), key=lambda i: len(lists[i]))
+        rarest = order[0]
+        starts = [p - rarest for p in lists[rarest] if p >= rarest]
+        for offset in order[1:]:
+            positions = lists[offset]
+            n = len(positions)
+            if len(starts) * 8 > n:
+                members = set(positions)
+                starts = [start for start in starts if start + offset in members]
+            else:
+                kept = []
+                for start in starts:
+                    target = start + offset
+                    i = bisect_left(positions, target)
+                    if i < n and positions[i] == target:
+                        kept.append(start)
+                starts = kept
+            if not starts:
+                break
+        return starts
+
+    def segment(self, position: int) -> int:
+        """Index of the segment a position falls in."""
+        return bisect_left(self.starts, position + 1) - 1
+
+    def compact(self) -> None:
+        """Store the postings as 4-byte arrays; the index can no longer be added to."""
+        self.postings = {term: array("I", positions) for term, positions in self.postings.items()}
+
+
+def proximity(first: List[int], first_len: int, second: List[int], second_len: int) -> Optional[int]:
+    """
+    Fewest tokens between an occurrence of one phrase and one of another,
+    given their start positions and lengths (0 if they touch or overlap);
+    None if either never occurs.
+    """
+    if not first or not second:
+        return None
+    best = None
+    n = len(second)
+    for start in first:
+        i = bisect_left(second, start)
+        # The nearest occurrence of the second phrase on each side
+        if i < n:
+            gap = max(second[i] - start - first_len, 0)
+            if best is None or gap < best:
+                best = gap
+        if i:
+            gap = max(start - second[i - 1] - second_len, 0)
+            if best is None or gap < best:
+                best = gap
+        if best == 0:
+            break
+    return best
+
+
+class PageKeywordIndex:
+    """
+    Positional indexes of a page's body text, title and headings.
+
+    Attributes:
+        body: Index of the visible text tokens.
+        title: Index of the title tokens.
+        headings: Index of the headings, one segment per heading.
+        heading_levels: Level (1-6) of each heading segment.
+        terms: The only terms indexed, or None for all of them.
+    """
+
+    __slots__ = ("body", "title", "headings", "heading_levels", "terms")
+
+    def __init__(self, tokens: Sequence[str], title: Optional[str] = None,
+                 headings: Iterable[tuple] = (), terms: Optional[AbstractSet[str]] = None):
+        self.terms = terms
+        self.body = PositionalIndex([tokens], terms)
+        self.title = PositionalIndex([tokenize(title)] if title else [], terms)
+        self.headings = PositionalIndex(terms=terms)
+        self.heading_levels: List[int] = []
+        for level, text in headings:
+            self.headings.add(tokenize(text))
+            self.heading_levels.append(level)
+
+    @classmethod
+    def from_document(cls, doc, terms: Optional[AbstractSet[str]] = None) -> "PageKeywordIndex":
+        """Index a fetched page (its page_text and the title and headings of its tag index)."""
+        return cls(doc.page_text.tokens, doc.index.title, doc.index.headings, terms)
+
+    def compact(self) -> None:
+        """Store the postings as 4-byte arrays (see PositionalIndex.compact())."""
+        for index in (self.body, self.title, self.headings):
+            index.compact()
+
+    @property
+    def empty(self) -> bool:
+        """True if no term was indexed (e.g. none of the terms it was restricted to occurs)."""
+        return not (self.body.postings or self.title.postings or self.headings.postings)
+
+    @property
+    def word_count(self) -> int:
+        return self.body.length
+
+    def positions(self, keyword: str) -> List[int]:
+        """Token positions where a keyword (one or more words) starts in the body text."""
+        return self.body.positions(tokenize(keyword))
+
+    def first_position(self, keyword: str) -> Optional[int]:
+        positions = self.positions(keyword)
+        return positions[0] if positions else None
+
+    def in_title(self, keyword: str) -> bool:
+        return bool(self.title.positions(tokenize(keyword)))
+
+    def heading_hits(self, keyword: str) -> List[int]:
+        """Levels of the headings containing a keyword, in document order (a heading counts once)."""
+        return self._heading_levels(tokenize(keyword))
+
+    def _heading_levels(self, phrase: List[str]) -> List[int]:
+        headings = self.headings
+        segments = dict.fromkeys(headings.segment(p) for p in headings.positions(phrase))
+        return [self.heading_levels[i] for i in segments]
+
+    def proximity(self, first: str, second: str) -> Optional[int]:
+        """Fewest words between the two keywords in the body text (see proximity())."""
+        first_tokens, second_tokens = tokenize(first), tokenize(second)
+        return proximity(self.body.positions(first_tokens), len(first_tokens),
+                         self.body.positions(second_tokens), len(second_tokens))
+
+    def lookup(self, keyword: str) -> dict:
+        """
+        Positions, first occurrence and title/heading hits of one keyword.
+
+        Raises:
+            KeyError: If the index is restricted to terms that do not cover the keyword.
+        """
+        phrase = tokenize(keyword)
+        if self.terms is not None and not self.terms.issuperset(phrase):
+            raise KeyError(f"'{keyword}' has words that are not indexed")
+        positions = self.body.positions(phrase)
+        return {
+            "keyword": " ".join(phrase),
+            "positions": positions,
+            "occurrences": len(positions),
+            "first_position": positions[0] if positions else None,
+            "in_title": bool(self.title.positions(phrase)),
+            "in_headings": self._heading_levels(phrase),
+        }
+
+    def lookup_many(self, keywords: Iterable[str]) -> List[dict]:
+        """lookup() for every keyword, in input order."""
+        return [self.lookup(keyword) for keyword in keywords]
+
+
+class SiteKeywordIndex:
+    """
+    A keyword list checked against many pages, e.g. every page of a crawl.
+    Safe to update from several threads.
+
+    Only the positions of the keywords' words are kept for each page (as
+    4-byte arrays), and pages without any of them are only counted.
+
+    Args:
+        keywords: The keywords and phrases that can be looked up.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords = [keyword for keyword in keywords if tokenize(keyword)]
+        self.terms = frozenset(term for keyword in self.keywords for term in tokenize(keyword))
+        self.pages = 0
+        self.urls: List[str] = []
+        self._pages: List[PageKeywordIndex] = []
+        self._terms: Dict[str, Set[int]] = {}
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def add_document(self, url: str, doc) -> None:
+        """Index a fetched page, keeping only the keywords' words."""
+        self.add_page(url, PageKeywordIndex.from_document(doc, self.terms))
+
+    def add_page(self, url: str, index: PageKeywordIndex) -> None:
+        """
+        Add a page's index. One that is not restricted to the keywords'
+        words (e.g. doc.keyword_index) is re-indexed from its postings.
+        """
+        if index.terms != self.terms:
+            index = _restricted(index, self.terms)
+        index.compact()
+        with self._lock:
+            self.pages += 1
+            if index.empty:
+                return
+            page = len(self.urls)
+            self.urls.append(url)
+            self._pages.append(index)
+            for term in {*index.body.postings, *index.title.postings, *index.headings.postings}:
+                pages = self._terms.get(term)
+                if pages is None:
+                    self._terms[term] = {page}
+                else:
+                    pages.add(page)
+
+    def __len__(self) -> int:
+        """Number of pages added."""
+        return self.pages
+
+    def pages_with(self, keyword: str) -> List[int]:
+        """Ids of the pages containing every word of a keyword (anywhere, not necessarily as a phrase)."""
+        phrase = tokenize(keyword)
+        if not phrase:
+            return []
+        with self._lock:
+            sets = sorted((self._terms.get(term, set()) for term in dict.fromkeys(phrase)), key=len)
+            return sorted(sets[0].intersection(*sets[1:]))
+
+    def lookup(self, keyword: str) -> List[dict]:
+        """
+        PageKeywordIndex.lookup() of a keyword on every page where it occurs, with the page url.
+
+        Raises:
+            KeyError: If the keyword has words that are in none of the indexed keywords.
+        """
+        if not self.terms.issuperset(tokenize(keyword)):
+            raise KeyError(f"'{keyword}' has words that are not indexed")
+        hits = []
+        for page in self.pages_with(keyword):
+            hit = self._pages[page].lookup(keyword)
+            if hit["occurrences"] or hit["in_title"] or hit["in_headings"]:
+                hit["url"] = self.urls[page]
+                hits.append(hit)
+        return hits
+
+    def report(self, top: int = 20) -> Iterator[dict]:
+        """
+        One row per keyword: how many pages use it in the text, title and
+        headings, and the pages using it most (by occurrences, then by
+        earliest first occurrence).
+        """
+        for keyword in self.keywords:
+            hits = self.lookup(keyword)
+            hits.sort(key=lambda hit: (-hit["occurrences"], hit["first_position"] is None,
+                                       hit["first_position"] or 0, hit["url"]))
+            yield {
+                "keyword": " ".join(tokenize(keyword)),
+                "pages": sum(1 for hit in hits if hit["occurrences"]),
+                "occurrences": sum(hit["occurrences"] for hit in hits),
+                "in_title": sum(1 for hit in hits if hit["in_title"]),
+                "in_headings": sum(1 for hit in hits if hit["in_headings"]),
+                "top_pages": [{key: hit[key] for key in
+                               ("url", "occurrences", "first_position", "in_title", "in_headings")}
+                              for hit in hits[:top]],
+            }
+
+
+def _restricted(index: PageKeywordIndex, terms: AbstractSet[str]) -> PageKeywordIndex:
+    """A copy of a page index with only the postings of the given terms."""
+    restricted = PageKeywordIndex((), terms=terms)
+    for source, target in ((index.body, restricted.body), (index.title, restricted.title),
+                           (index.headings, restricted.headings)):
+        target.postings = {term: list(positions) for term, positions in source.postings.items() if term in terms}
+        target.starts = list(source.starts)
+        target.length = source.length
+    restricted.heading_levels = list(index.heading_levels)
+    return restricted
@@ -0,0 +1,263 @@
+"""
+core/link_graph.py
+
+Internal link graph of a crawl, stored as compressed sparse rows (CSR).
+
+Pages are numbered 0..n-1 in discovery order; the out-links of page i are
+``indices[indptr[i]:indptr[i + 1]]`` (int32 page ids, sorted, without
+duplicates or self-links). Edges are collected in flat int32 arrays while
+crawling (LinkGraphBuilder) and converted once at the end, so a graph with
+500k pages and several million links takes a few tens of MB plus the URL
+strings.
+
+Analyses on a built LinkGraph are vectorized with numpy:
+
+    pagerank()       internal link equity (power iteration, dangling pages
+                     spread their rank evenly)
+    click_depth()    fewest clicks from the homepage (breadth-first, one
+                     frontier at a time)
+    orphans()        sitemap pages that no crawled page links to
+    dead_ends()      crawled pages with no internal out-links
+"""
+
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+
+from core.urls import normalize_url
+
+
+class LinkGraphBuilder:
+    """
+    Collects pages and links during a crawl.
+
+    URLs are used as given, so pass normalized ones (core/urls.py; the
+    crawler's are) to make the same page reached through different spellings
+    one node.
+    """
+
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self._urls: List[str] = []
+        self._src = array("i")
+        self._dst = array("i")
+        self._crawled = bytearray()
+        self._in_sitemap = bytearray()
+
+    def node(self, url: str) -> int:
+        """Id of a URL, adding it as a page if it is new."""
+        node = self._ids.get(url)
+        if node is None:
+            node = self._ids[url] = len(self._urls)
+            self._urls.append(url)
+            self._crawled.append(0)
+            self._in_sitemap.append(0)
+        return node
+
+    def add_page(self, url: str, links: Iterable[str]) -> None:
+        """Record a crawled page and its internal links."""
+        src = self.node(url)
+        self._crawled[src] = 1
+        for link in links:
+            dst = self.node(link)
+            if dst != src:
+                self._src.append(src)
+                self._dst.append(dst)
+
+    def add_sitemap_urls(self, urls: Iterable[str]) -> None:
+        """Record pages listed in the sitemap (used to find orphans)."""
+        for url in urls:
+            self._in_sitemap[self.node(url)] = 1
+
+    def __len__(self) -> int:
+        return len(self._urls)
+
+    def build(self) -> "LinkGraph":
+        """Convert the collected edges to CSR (duplicate links are merged)."""
+        n = len(self._urls)
+        src = np.frombuffer(self._src, dtype=np.int32) if len(self._src) else np.empty(0, np.int32)
+        dst = np.frombuffer(self._dst, dtype=np.int32) if len(self._dst) else np.empty(0, np.int32)
+        # Sort by (src, dst) through one int64 key, which also makes duplicates adjacent.
+        # (Sort plus a mask, as np.unique is far slower on arrays of this size.)
+        keys = src.astype(np.int64) * n + dst
+        keys.sort()
+        if len(keys):
+            keep = np.empty(len(keys), dtype=bool)
+            keep[0] = True
+            np.not_equal(keys[1:], keys[:-1], out=keep[1:])
+            keys = keys[keep]
+        indices = (keys % max(n, 1)).astype(np.int32)
+        counts = np.bincount((keys // max(n, 1)).astype(np.int64), minlength=n)
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(counts, out=indptr[1:])
+        return LinkGraph(
+            urls=list(self._urls),
+            indptr=indptr,
+            indices=indices,
+            crawled=np.frombuffer(bytes(self._crawled), dtype=np.uint8).astype(bool),
+            in_sitemap=np.frombuffer(bytes(self._in_sitemap), dtype=np.uint8).astype(bool),
+        )
+
+
+class LinkGraph:
+    """
+    A built internal link graph.
+
+    Attributes:
+        urls: URL of each page id.
+        indptr: int64 array of n + 1 row offsets into indices.
+        indices: int32 array of link targets, grouped by source page.
+        crawled: Whether each page was fetched (pages only seen as link
+            targets or in the sitemap have no out-links of their own).
+        in_sitemap: Whether each page is listed in the sitemap.
+    """
+
+    def __init__(self, urls: List[str], indptr: np.ndarray, indices: np.ndarray,
+                 crawled: np.ndarray, in_sitemap: np.ndarray):
+        self.urls = urls
+        self.indptr = indptr
+        self.indices = indices
+        self.crawled = crawled
+        self.in_sitemap = in_sitemap
+        self._ids: Optional[Dict[str, int]] = None
+
+    @property
+    def n_nodes(self) -> int:
+        return len(self.urls)
+
+    @property
+    def n_edges(self) -> int:
+        return len(self.indices)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes used by the arrays (the URL strings not included)."""
+        return self.indptr.nbytes + self.indices.nbytes + self.crawled.nbytes + self.in_sitemap.nbytes
+
+    def node(self, url: str) -> int:
+        """
+        Id of a URL.
+
+        Raises:
+            KeyError: If the URL is not in the graph.
+        """
+        if self._ids is None:
+            self._ids = {url: i for i, url in enumerate(self.urls)}
+        return self._ids[normalize_url(url)]
+
+    def out_degree(self) -> np.ndarray:
+        return np.diff(self.indptr)
+
+    def in_degree(self) -> np.ndarray:
+        return np.bincount(self.indices, minlength=self.n_nodes)
+
+    def neighbors(self, node: int) -> np.ndarray:
+        return self.indices[self.indptr[node]:self.indptr[node + 1]]
+
+    def pagerank(self, damping: float = 0.85, tol: float = 1e-6, max_iter: int = 100) -> np.ndarray:
+        """
+        PageRank of every page (sums to 1). Iterates until the L1 change is
+        below tol or max_iter is reached.
+        """
+        n = self.n_nodes
+        if n == 0:
+            return np.empty(0)
+        out_degree = self.out_degree()
+        dangling = out_degree == 0
+        inv_out = np.zeros(n)
+        np.divide(1.0, out_degree, out=inv_out, where=~dangling)
+        # Source page of every edge, aligned with indices
+        sources = np.repeat(np.arange(n, dtype=np.int32), out_degree)
+
+        rank = np.full(n, 1.0 / n)
+        for _ in range(max_iter):
+            share = rank * inv_out
+            new = np.bincount(self.indices, weights=share[sources], minlength=n)
+            new *= damping
+            new += (damping * rank[dangling].sum() + 1.0 - damping) / n
+            change = np.abs(new - rank).sum()
+            rank = new
+            if change < tol:
+                break
+        return rank
+
+    def click_depth(self, start: str) -> np.ndarray:
+        """
+        Fewest clicks from the start page (usually the homepage) to every
+        page; -1 for pages it does not link to at all.
+
+        Raises:
+            KeyError: If the start URL is not in the graph.
+        """
+        depth = np.full(self.n_nodes, -1, dtype=np.int32)
+        frontier = np.array([self.node(start)], dtype=np.int64)
+        depth[frontier] = 0
+        level = 0
+        while frontier.size:
+            starts = self.indptr[frontier]
+            counts = self.indptr[frontier + 1] - starts
+            total = int(counts.sum())
+            if not total:
+                break
+            # Positions of all out-links of the frontier in indices, without a Python loop
+            offsets = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(total)
+            reached = self.indices[offsets]
+            reached = reached[depth[reached] < 0]
+            level += 1
+            depth[reached] = level  # duplicates just write the same level twice
+            frontier = np.flatnonzero(depth == level)
+        return depth
+
+    def orphans(self) -> np.ndarray:
+        """Ids of sitemap pages with no inlinks from crawled pages."""
+        return np.flatnonzero(self.in_sitemap & (self.in_degree() == 0))
+
+    def dead_ends(self) -> np.ndarray:
+        """Ids of crawled pages with no internal out-links."""
+        return np.flatnonzero(self.crawled & (self.out_degree() == 0))
+
+    def report(self, start: Optional[str] = None) -> Iterator[dict]:
+        """
+        One row of link metrics per page, in id order. click_depth is
+        measured from start and is None for unreachable pages (or when
+        start is not given or not in the graph).
+        """
+        rank = self.pagerank()
+        in_degree, out_degree = self.in_degree(), self.out_degree()
+        try:
+            depth = self.click_depth(start) if start else None
+        except KeyError:
+            depth = None
+        orphan = self.in_sitemap & (in_degree == 0)
+        dead_end = self.crawled & (out_degree == 0)
+        for i, url in enumerate(self.urls):
+            yield {
+                "url": url,
+                "pagerank": float(rank[i]),
+                "click_depth": int(depth[i]) if depth is not None and depth[i] >= 0 else None,
+                "inlinks": int(in_degree[i]),
+                "outlinks": int(out_degree[i]),
+                "crawled": bool(self.crawled[i]),
+                "in_sitemap": bool(self.in_sitemap[i]),
+                "orphan": bool(orphan[i]),
+                "dead_end": bool(dead_end[i]),
+            }
+
+    def save(self, path: str) -> None:
+        """Save the graph to a compressed .npz file."""
+        urls = np.frombuffer("\n".join(self.urls).encode("utf-8"), dtype=np.uint8)
+        np.savez_compressed(path, urls=urls, indptr=self.indptr, indices=self.indices,
+                            crawled=self.crawled, in_sitemap=self.in_sitemap)
+
+    @classmethod
+    def load(cls, path: str) -> "LinkGraph":
+        with np.load(path) as data:
+            text = data["urls"].tobytes().decode("utf-8")
+            return cls(
+                urls=text.split("\n") if text else [],
+                indptr=data["indptr"],
+                indices=data["indices"],
+                crawled=data["crawled"],
+                in_sitemap=data["in_sitemap"],
+            )
@@ -0,0 +1,230 @@
+"""
+core/readability.py
+
+Readability scores computed in one pass over a page's tokens.
+
+A text is tokenized once (core/text.py) and every word's syllables are
+counted once, through a bounded word -> syllables cache that is shared by
+all pages and can be saved to disk, since a site's vocabulary repeats
+heavily from page to page. The totals then give the whole family of
+scores at once:
+
+    flesch_reading_ease     206.835 - 1.015 * words/sentence - 84.6 * syllables/word
+    flesch_kincaid_grade    0.39 * words/sentence + 11.8 * syllables/word - 15.59
+    gunning_fog             0.4 * (words/sentence + 100 * complex words/words)
+    smog_index              1.043 * sqrt(30 * polysyllables/sentences) + 3.1291
+                            (0 for fewer than three sentences)
+    coleman_liau_index      0.0588 * characters/100 words - 0.296 * sentences/100 words - 15.8
+
+Complex words and polysyllables are words of three or more syllables.
+ReadabilityScorer.score_many() scores large batches in a process pool.
+"""
+
+import json
+import math
+import os
+import threading
+from collections import Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from pyphen import Pyphen
+
+from core.config import READABILITY_CONFIG
+from core.text import PageText
+
+SCORES = ("flesch_reading_ease", "flesch_kincaid_grade", "gunning_fog", "smog_index", "coleman_liau_index")
+
+
+class SyllableCache:
+    """
+    Syllables per word, counted with pyphen hyphenation (as textstat does)
+    and kept in a bounded LRU cache. Safe to use from several threads.
+
+    Args:
+        max_words: Words kept; the least recently used are dropped beyond this.
+        path: JSON file to load the cache from (if it exists) and save() to.
+        lang: pyphen dictionary; a saved cache for another language is ignored.
+    """
+
+    def __init__(self, max_words: Optional[int] = None, path: Optional[str] = None, lang: Optional[str] = None):
+        self.max_words = max_words or READABILITY_CONFIG["syllable_cache_size"]
+        self.path = path if path is not None else READABILITY_CONFIG["syllable_cache_path"]
+        self.lang = lang or READABILITY_CONFIG["lang"]
+        self._pyphen = Pyphen(lang=self.lang)
+        self._words: "OrderedDict[str, int]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0}
+        # Words counted since the last take_new(), when tracking is on (see score_many)
+        self._new: Optional[Dict[str, int]] = None
+        if self.path and os.path.exists(self.path):
+            self.load(self.path)
+
+    def __getstate__(self) -> dict:
+        # Locks and the pyphen dictionary are rebuilt in the receiving process
+        state = self.__dict__.copy()
+        del state["_lock"], state["_pyphen"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+        self._pyphen = Pyphen(lang=self.lang)
+
+    def __len__(self) -> int:
+        return len(self._words)
+
+    def count(self, word: str) -> int:
+        """Syllables in a lowercased word."""
+        with self._lock:
+            syllables = self._words.get(word)
+            if syllables is not None:
+                self._words.move_to_end(word)
+                self.stats["hits"] += 1
+                return syllables
+        syllables = len(self._pyphen.positions(word)) + 1
+        self.update({word: syllables})
+        self.stats["misses"] += 1
+        if self._new is not None:
+            self._new[word] = syllables
+        return syllables
+
+    def track_new(self) -> None:
+        """Start recording newly counted words for take_new()."""
+        self._new = {}
+
+    def take_new(self) -> Dict[str, int]:
+        """Words counted since tracking started or the last call."""
+        new, self._new = self._new or {}, {}
+        return new
+
+    def update(self, words: Dict[str, int]) -> None:
+        """Add known syllable counts (e.g. ones counted in a worker process)."""
+        with self._lock:
+            self._words.update(words)
+            for word in words:
+                self._words.move_to_end(word)
+            while len(self._words) > self.max_words:
+                self._words.popitem(last=False)
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._words)
+
+    def load(self, path: str) -> None:
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("lang") == self.lang:
+            self.update(data.get("words", {}))
+
+    def save(self, path: Optional[str] = None) -> None:
+        """Write the cache to path (default: the one it was created with), replacing the file atomically."""
+        path = path or self.path
+        if not path:
+            raise ValueError("No path given for the syllable cache")
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"lang": self.lang, "words": self.snapshot()}, f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+
+def _round(value: float, digits: int = 2) -> float:
+    return round(value, digits) if math.isfinite(value) else 0.0
+
+
+def readability_scores(page_text: PageText, syllables: SyllableCache) -> dict:
+    """All scores (see the module docstring) for one tokenized text, plus the counts they are based on."""
+    tokens = page_text.tokens
+    words = len(tokens)
+    sentences = max(page_text.sentence_count, 1)
+    count = syllables.count
+    total_syllables = 0
+    polysyllables = 0
+    # Each distinct word is looked up once
+    for token, occurrences in Counter(tokens).items():
+        n = count(token)
+        total_syllables += n * occurrences
+        if n >= 3:
+            polysyllables += occurrences
+    characters = sum(map(len, tokens))
+
+    result = {"words": words, "sentences": page_text.sentence_count, "syllables": total_syllables,
+              "polysyllables": polysyllables}
+    if not words:
+        result.update(dict.fromkeys(SCORES, 0.0))
+        return result
+    words_per_sentence = words / sentences
+    syllables_per_word = total_syllables / words
+    result["flesch_reading_ease"] = _round(206.835 - 1.015 * words_per_sentence - 84.6 * syllables_per_word)
+    result["flesch_kincaid_grade"] = _round(0.39 * words_per_sentence + 11.8 * syllables_per_word - 15.59)
+    result["gunning_fog"] = _round(0.4 * (words_per_sentence + 100.0 * polysyllables / words))
+    result["smog_index"] = (_round(1.043 * math.sqrt(30.0 * polysyllables / sentences) + 3.1291)
+                            if page_text.sentence_count >= 3 else 0.0)
+    result["coleman_liau_index"] = _round(0.0588 * characters * 100.0 / words
+                                          - 0.296 * sentences * 100.0 / words - 15.8)
+    return result
+
+
+class ReadabilityScorer:
+    """
+    Scores texts with a shared syllable cache.
+
+    Args:
+        cache: Syllable cache to use (default: a new one from READABILITY_CONFIG).
+    """
+
+    def __init__(self, cache: Optional[SyllableCache] = None):
+        self.cache = cache or SyllableCache()
+
+    def score(self, page_text: PageText) -> dict:
+        return readability_scores(page_text, self.cache)
+
+    def score_text(self, text: str) -> dict:
+        return self.score(PageText(text))
+
+    def score_many(self, texts: Iterable[str], processes: int = 0, chunk_size: int = 64) -> Iterator[dict]:
+        """
+        Score many texts, yielding results in input order. With processes > 0
+        the texts are scored in chunks in a process pool; each worker starts
+        from a copy of the cache and the syllable counts it adds are merged
+        back into this one.
+        """
+        if processes <= 0:
+            for text in texts:
+                yield self.score_text(text)
+            return
+        with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker,
+                                 initargs=(self.cache.lang, self.cache.max_words, self.cache.snapshot())) as pool:
+            for results, new_words in pool.map(_score_chunk, _chunks(texts, chunk_size)):
+                self.cache.update(new_words)
+                yield from results
+
+
+def _chunks(items: Iterable[str], size: int) -> Iterator[List[str]]:
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+_worker_cache: Optional[SyllableCache] = None
+
+
+def _init_worker(lang: str, max_words: int, words: Dict[str, int]) -> None:
+    global _worker_cache
+    _worker_cache = SyllableCache(max_words=max_words, path="", lang=lang)
+    _worker_cache.update(words)
+    _worker_cache.track_new()
+
+
+def _score_chunk(texts: List[str]) -> Tuple[List[dict], Dict[str, int]]:
+    """Score a chunk in a worker; also returns the syllable counts it had to compute."""
+    results = [readability_scores(PageText(text), _worker_cache) for text in texts]
+    return results, _worker_cache.take_new()
@@ -0,0 +1,293 @@
+"""
+core/reconcile.py
+
+Sitemap-vs-crawl reconciliation.
+
+Sitemap URLs and crawl results are streamed into a SitemapReconciler,
+which keeps only 64-bit URL hashes in memory (core/urlset.py) and spills
+the URL strings to temporary files in arrival order. reconcile() then
+sorts the hash arrays once and answers every question with vectorized
+sorted-array membership (numpy searchsorted), so a site with millions of
+URLs is reconciled in O(n log n) time with a few tens of bytes of memory
+per URL:
+
+    not_linked        in the sitemap, but no crawled page links to it
+    not_in_sitemap    linked from a crawled page, but not in the sitemap
+    non_200           in the sitemap, but the crawl got an error, a status
+                      other than 200 or a redirect
+    canonicalized     in the sitemap, but its canonical tag names another URL
+
+A redirected URL is reported with the status of its own response (301,
+302, ...) and flagged with the URL and status it redirected to.
+
+Report rows are produced by re-reading the spill files alongside the
+result masks, so URL strings are never all held in memory at once.
+"""
+
+import os
+import tempfile
+from array import array
+from typing import Dict, Iterable, Iterator, Optional
+
+import numpy as np
+
+from core.urls import normalize_url
+from core.urlset import HashedUrlSet, url_hash
+
+ISSUES = ("not_linked", "not_in_sitemap", "non_200", "canonicalized")
+
+
+def _hashes(values: array) -> np.ndarray:
+    # A copy: a view would keep the array from growing while the result is alive
+    return np.frombuffer(values, dtype=np.uint64).copy() if len(values) else np.empty(0, np.uint64)
+
+
+def _sorted(values: array) -> np.ndarray:
+    keys = _hashes(values)
+    keys.sort()
+    return keys
+
+
+def _member(values: np.ndarray, sorted_keys: np.ndarray) -> np.ndarray:
+    """Boolean mask: which of values are in sorted_keys."""
+    if not len(sorted_keys):
+        return np.zeros(len(values), dtype=bool)
+    positions = np.searchsorted(sorted_keys, values)
+    np.minimum(positions, len(sorted_keys) - 1, out=positions)
+    return sorted_keys[positions] == values
+
+
+class SitemapReconciler:
+    """
+    Collects sitemap URLs and crawled pages for reconciliation.
+
+    Sitemap and page URLs are normalized (core/urls.py) before hashing, so
+    spellings that differ only cosmetically still match. Links are used as
+    given, as normalizing millions of them would dominate the run time, so
+    pass normalized ones (the crawler's are). Two distinct
+    URLs colliding on a 64-bit hash is possible but negligible (about one
+    chance in a million at ten million URLs).
+
+    Args:
+        workdir: Directory for the spill files (default: the system temp
+            directory). They are removed by close().
+    """
+
+    def __init__(self, workdir: Optional[str] = None):
+        self._dir = tempfile.TemporaryDirectory(prefix="reconcile-", dir=workdir)
+        self._sitemap = _SpilledUrls(os.path.join(self._dir.name, "sitemap.txt"))
+        self._linked = _SpilledUrls(os.path.join(self._dir.name, "linked.txt"))
+        # Every crawled page: hash and status of its own response, the first hop if redirected (0 when the fetch failed)
+        self._page_hashes = array("Q")
+        self._page_status = array("H")
+        # Crawled pages with an issue, in the order of the lines of the issues file
+        self._issue_hashes = array("Q")
+        self._issues_path = os.path.join(self._dir.name, "pages.txt")
+        self._issues_file = open(self._issues_path, "w", encoding="utf-8")
+
+    def __enter__(self) -> "SitemapReconciler":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Delete the spill files."""
+        for spill in (self._sitemap, self._linked):
+            spill.close()
+        self._issues_file.close()
+        self._dir.cleanup()
+
+    def add_sitemap_url(self, url: str) -> None:
+        self._sitemap.add(normalize_url(url))
+
+    def add_sitemap_urls(self, urls: Iterable[str]) -> None:
+        for url in urls:
+            self.add_sitemap_url(url)
+
+    def add_page(self, url: str, status_code: Optional[int], links: Iterable[str] = (),
+                 canonical: Optional[str] = None, final_url: Optional[str] = None,
+                 final_status: Optional[int] = None) -> None:
+        """
+        Record a crawled page.
+
+        Args:
+            url: The URL that was requested.
+            status_code: Status of the response to url, i.e. the redirect's
+                own status (301, 302, ...) if it was redirected; None if the
+                fetch failed.
+            links: Internal links found on the page, normalized.
+            canonical: Absolute URL from its canonical tag, if any.
+            final_url: URL of the final response, if it was redirected.
+            final_status: Status of the final response, if it was redirected.
+        """
+        url = normalize_url(url)
+        h = url_hash(url)
+        self._page_hashes.append(h)
+        self._page_status.append(status_code or 0)
+        for link in links:
+            self._linked.add(link)
+
+        final_url = normalize_url(final_url) if final_url else url
+        canonical = normalize_url(canonical) if canonical else final_url
+        redirected = final_url != url
+        if status_code != 200 or redirected or canonical != final_url:
+            self._issue_hashes.append(h)
+            self._issues_file.write("\t".join((
+                url,
+                str(status_code or ""),
+                final_url if redirected else "",
+                str(final_status or "") if redirected else "",
+                canonical if canonical != final_url else "",
+            )) + "\n")
+
+    def reconcile(self) -> "Reconciliation":
+        """Compare what has been collected so far."""
+        self._sitemap.flush()
+        self._linked.flush()
+        self._issues_file.flush()
+        return Reconciliation(self)
+
+
+class _SpilledUrls:
+    """Distinct URLs: hashes in memory, strings appended to a file in the same order."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.hashes = array("Q")
+        self._seen = HashedUrlSet()
+        self._file = open(path, "w", encoding="utf-8")
+
+    def add(self, url: str) -> None:
+        h = url_hash(url)
+        if self._seen.add_hash(h):
+            self.hashes.append(h)
+            self._file.write(url + "\n")
+
+    def flush(self) -> None:
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __len__(self) -> int:
+        return len(self.hashes)
+
+    def select(self, mask: np.ndarray) -> Iterator[str]:
+        """The URLs whose mask entry is True, in arrival order."""
+        with open(self.path, encoding="utf-8") as lines:
+            for line, selected in zip(lines, mask):
+                if selected:
+                    yield line[:-1]
+
+
+class Reconciliation:
+    """
+    Result of SitemapReconciler.reconcile(). Counts are computed up front;
+    the row iterators read the spill files, so use them before the
+    reconciler is closed.
+    """
+
+    def __init__(self, reconciler: SitemapReconciler):
+        self._reconciler = reconciler
+        sitemap = _hashes(reconciler._sitemap.hashes)
+        linked = _hashes(reconciler._linked.hashes)
+        page_hashes = _hashes(reconciler._page_hashes)
+        issue_hashes = _hashes(reconciler._issue_hashes)
+
+        sitemap_sorted = _sorted(reconciler._sitemap.hashes)
+        linked_sorted = _sorted(reconciler._linked.hashes)
+        # Pages sorted by hash, with their statuses in the same order
+        order = np.argsort(page_hashes, kind="stable")
+        self._pages_sorted = page_hashes[order]
+        self._status_sorted = (np.frombuffer(reconciler._page_status, dtype=np.uint16)[order] if len(order)
+                               else np.empty(0, np.uint16))
+
+        self._not_linked = ~_member(sitemap, linked_sorted)
+        self._not_in_sitemap = ~_member(linked, sitemap_sorted)
+        self._issue_in_sitemap = _member(issue_hashes, sitemap_sorted)
+        self._linked = linked
+
+        self.counts = {
+            "sitemap_urls": len(sitemap),
+            "crawled_pages": len(page_hashes),
+            "linked_urls": len(linked),
+            "sitemap_not_crawled": int((~_member(sitemap, self._pages_sorted)).sum()),
+            "not_linked": int(self._not_linked.sum()),
+            "not_in_sitemap": int(self._not_in_sitemap.sum()),
+            "non_200": 0,
+            "canonicalized": 0,
+        }
+        for row in self._issue_rows():
+            self.counts[row["issue"]] += 1
+
+    def not_linked(self) -> Iterator[dict]:
+        for url in self._reconciler._sitemap.select(self._not_linked):
+            yield {"issue": "not_linked", "url": url}
+
+    def not_in_sitemap(self) -> Iterator[dict]:
+        """
+        Rows carry the crawl status of the URL, or None if it was not crawled.
+        A URL that redirected also carries redirected_to and final_status_code.
+        """
+        linked = self._linked[self._not_in_sitemap]
+        positions = np.searchsorted(self._pages_sorted, linked)
+        crawled = np.zeros(len(linked), dtype=bool)
+        statuses = np.zeros(len(linked), dtype=np.uint16)
+        if len(self._pages_sorted):
+            np.minimum(positions, len(self._pages_sorted) - 1, out=positions)
+            crawled = self._pages_sorted[positions] == linked
+            statuses = self._status_sorted[positions]
+        redirects = self._redirects(linked[crawled & (statuses >= 300) & (statuses < 400)])
+        rows = zip(self._reconciler._linked.select(self._not_in_sitemap), linked, crawled, statuses)
+        for url, h, was_crawled, status in rows:
+            row = {"issue": "not_in_sitemap", "url": url,
+                   "status_code": (int(status) or None) if was_crawled else None}
+            if was_crawled and int(h) in redirects:
+                row.update(redirects[int(h)])
+            yield row
+
+    def _redirects(self, hashes: np.ndarray) -> Dict[int, dict]:
+        """Where the crawled pages with these hashes redirected to, read from the issues file."""
+        wanted = set(hashes.tolist())
+        found = {}
+        if not wanted:
+            return found
+        with open(self._reconciler._issues_path, encoding="utf-8") as lines:
+            for line, h in zip(lines, self._reconciler._issue_hashes):
+                if h in wanted:
+                    _, _, final_url, final_status, _ = line[:-1].split("\t")
+                    if final_url:
+                        found[h] = _redirect_fields(final_url, final_status)
+        return found
+
+    def non_200(self) -> Iterator[dict]:
+        return (row for row in self._issue_rows() if row["issue"] == "non_200")
+
+    def canonicalized(self) -> Iterator[dict]:
+        return (row for row in self._issue_rows() if row["issue"] == "canonicalized")
+
+    def _issue_rows(self) -> Iterator[dict]:
+        with open(self._reconciler._issues_path, encoding="utf-8") as lines:
+            for line, in_sitemap in zip(lines, self._issue_in_sitemap):
+                if not in_sitemap:
+                    continue
+                url, status, final_url, final_status, canonical = line[:-1].split("\t")
+                if status != "200" or final_url:
+                    row = {"issue": "non_200", "url": url, "status_code": int(status) if status else None}
+                    if final_url:
+                        row.update(_redirect_fields(final_url, final_status))
+                    yield row
+                elif canonical:
+                    yield {"issue": "canonicalized", "url": url, "canonical": canonical}
+
+    def rows(self) -> Iterator[dict]:
+        """Every issue row, grouped by issue."""
+        yield from self.not_linked()
+        yield from self.not_in_sitemap()
+        yield from self.non_200()
+        yield from self.canonicalized()
+
+
+def _redirect_fields(final_url: str, final_status: str) -> dict:
+    return {"redirected_to": final_url, "final_status_code": int(final_status) if final_status else None}
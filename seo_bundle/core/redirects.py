@@ -0,0 +1,230 @@
+"""
+core/redirects.py
+
+Redirect chain resolution with a shared hop cache.
+
+Each hop is requested on its own (HEAD, without following redirects) and
+its outcome -- status code and Location, or the network error -- is kept
+in an LRU cache keyed by URL. Links that share hops (http -> https,
+www -> apex, a moved section) therefore cost one request per distinct hop
+across a whole batch, and repeated lookups are answered from memory
+without touching the network. Network errors and 5xx responses are
+transient, so they are only kept for error_ttl seconds.
+
+Chains are followed until a non-redirect response, a URL already in the
+chain (a loop), or max_hops redirects (too long).
+"""
+
+import math
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urljoin
+
+import requests
+
+from core import http_client
+from core.config import REDIRECT_CONFIG
+from core.urls import normalize_url
+
+REDIRECT_STATUSES = frozenset({301, 302, 303, 307, 308})
+
+# (status code or None, absolute Location or None, error message or None)
+Hop = Tuple[Optional[int], Optional[str], Optional[str]]
+
+
+class RedirectChain:
+    """
+    The redirects followed from one URL.
+
+    Attributes:
+        url: The URL that was resolved.
+        hops: (url, status_code) of every response, the final one included;
+            status_code is None for a hop that failed with a network error.
+        loop: True if a redirect led back to a URL already in the chain.
+        too_long: True if the chain was cut off after max_hops redirects.
+        error: The network error of the last hop, if any.
+    """
+
+    __slots__ = ("url", "hops", "loop", "too_long", "error")
+
+    def __init__(self, url: str):
+        self.url = url
+        self.hops: List[Tuple[str, Optional[int]]] = []
+        self.loop = False
+        self.too_long = False
+        self.error: Optional[str] = None
+
+    @property
+    def final_url(self) -> str:
+        return self.hops[-1][0] if self.hops else self.url
+
+    @property
+    def status_code(self) -> Optional[int]:
+        return self.hops[-1][1] if self.hops else None
+
+    @property
+    def redirects(self) -> int:
+        return sum(1 for _, status in self.hops if status in REDIRECT_STATUSES)
+
+    def to_dict(self) -> dict:
+        result = {
+            "url": self.url,
+            "final_url": self.final_url,
+            "status_code": self.status_code,
+            "redirects": self.redirects,
+            "redirect_chain": [{"url": url, "status_code": status} for url, status in self.hops],
+        }
+        if self.loop:
+            result["loop"] = True
+        if self.too_long:
+            result["too_many_redirects"] = True
+        if self.error is not None:
+            result["error"] = self.error
+        return result
+
+
+class RedirectResolver:
+    """
+    Follows redirect chains hop by hop, caching every hop. Safe to use from
+    several threads; a hop is requested once even when many chains reach it
+    at the same time.
+
+    Args:
+        timeout: Seconds per request.
+        max_hops: Redirects followed before giving up on a chain.
+        max_entries: Hops kept in the cache.
+        workers: Concurrent requests in resolve_many().
+        error_ttl: Seconds to keep a hop that failed with a network error or
+            a 5xx response (0 to never cache them). Other hops are kept until
+            they are evicted.
+    """
+
+    def __init__(self, timeout: Optional[float] = None, max_hops: Optional[int] = None,
+                 max_entries: Optional[int] = None, workers: Optional[int] = None,
+                 error_ttl: Optional[float] = None):
+        self.timeout = timeout
+        self.max_hops = max_hops if max_hops is not None else REDIRECT_CONFIG["max_hops"]
+        self.max_entries = max_entries or REDIRECT_CONFIG["max_entries"]
+        self.workers = workers or REDIRECT_CONFIG["workers"]
+        self.error_ttl = error_ttl if error_ttl is not None else REDIRECT_CONFIG["error_ttl"]
+        # key -> (expiry on the time.monotonic() clock, hop)
+        self._hops: "OrderedDict[str, Tuple[float, Hop]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._fetch_locks: Dict[str, threading.Lock] = {}
+        self.stats = {"fetches": 0, "hits": 0}
+
+    def __getstate__(self) -> dict:
+        # Locks cannot be pickled; a copy sent to a worker process gets fresh ones
+        state = self.__dict__.copy()
+        del state["_lock"]
+        state["_fetch_locks"] = {}
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._hops)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._hops.clear()
+
+    def resolve(self, url: str) -> RedirectChain:
+        """Follow the redirects of one URL."""
+        chain = RedirectChain(url)
+        seen = set()
+        current = url
+        while True:
+            key = normalize_url(current, strip_tracking=False, sort_query=False)
+            if key in seen:
+                chain.loop = True
+                break
+            seen.add(key)
+            status, location, error = self.hop(current)
+            chain.hops.append((current, status))
+            if error is not None:
+                chain.error = error
+                break
+            if location is None:
+                break
+            if len(chain.hops) > self.max_hops:
+                chain.too_long = True
+                break
+            current = location
+        return chain
+
+    def resolve_many(self, urls: Iterable[str]) -> List[RedirectChain]:
+        """
+        Follow the redirects of many URLs concurrently. Returns one chain per
+        URL, in input order; duplicate URLs are resolved once.
+        """
+        urls = list(urls)
+        unique = list(dict.fromkeys(urls))
+        if len(unique) <= 1 or self.workers <= 1:
+            chains = {url: self.resolve(url) for url in unique}
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.workers, len(unique))) as executor:
+                chains = dict(zip(unique, executor.map(self.resolve, unique)))
+        return [chains[url] for url in urls]
+
+    def hop(self, url: str) -> Hop:
+        """
+        Status code and redirect target of a single URL (or the error that
+        prevented the request), from the cache when possible.
+        """
+        key = normalize_url(url, strip_tracking=False, sort_query=False)
+        hop = self._cached(key)
+        if hop is not None:
+            return hop
+        with self._lock:
+            fetch_lock = self._fetch_locks.setdefault(key, threading.Lock())
+        with fetch_lock:
+            # Another thread may have requested it while this one waited
+            hop = self._cached(key)
+            if hop is None:
+                hop = self._fetch(url)
+                status, _, error = hop
+                if error is not None or (status is not None and status >= 500):
+                    if self.error_ttl > 0:
+                        self.store(key, hop, self.error_ttl)
+                else:
+                    self.store(key, hop)
+        with self._lock:
+            self._fetch_locks.pop(key, None)
+        return hop
+
+    def _cached(self, key: str) -> Optional[Hop]:
+        with self._lock:
+            entry = self._hops.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self._hops[key]
+                return None
+            self._hops.move_to_end(key)
+            self.stats["hits"] += 1
+            return entry[1]
+
+    def store(self, key: str, hop: Hop, ttl: Optional[float] = None) -> None:
+        """Cache a hop, for ttl seconds or, by default, until it is evicted."""
+        with self._lock:
+            self._hops[key] = (math.inf if ttl is None else time.monotonic() + ttl, hop)
+            self._hops.move_to_end(key)
+            while len(self._hops) > self.max_entries:
+                self._hops.popitem(last=False)
+
+    def _fetch(self, url: str) -> Hop:
+        self.stats["fetches"] += 1
+        try:
+            response = http_client.head_or_get(url, timeout=self.timeout, allow_redirects=False)
+        except requests.exceptions.RequestException as e:
+            return None, None, str(e)
+        location = response.headers.get("Location")
+        if response.status_code in REDIRECT_STATUSES and location:
+            return response.status_code, urljoin(url, location.strip()), None
+        return response.status_code, None, None
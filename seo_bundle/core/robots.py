@@ -0,0 +1,306 @@
+"""
+core/robots.py
+
+robots.txt parsing and matching (RFC 9309).
+
+    parse_robots(text)      RobotsRules: groups of user-agents with their
+                            Allow/Disallow rules and Crawl-delay, plus the
+                            Sitemap lines
+    RobotsRules.matcher()   the compiled rules for one crawler
+    RobotsCache             fetches robots.txt once per host and keeps the
+                            parsed rules for a TTL; is_allowed(url, agent)
+
+Matching follows the RFC: the group whose user-agent equals the crawler's
+product token is used (all such groups merged), otherwise the "*" groups.
+The longest matching rule wins, Allow wins a tie, and a path with no
+matching rule is allowed. "*" matches any run of characters and a trailing
+"$" anchors the rule at the end of the path. Rules are compiled once per
+agent into an ordered list of prefix checks and regexes, so a check is a
+dictionary lookup plus a few string comparisons.
+"""
+
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import quote, urlsplit
+
+import requests
+
+from core import http_client
+from core.config import HTTP_CONFIG, ROBOTS_CONFIG
+from core.urls import url_origin
+
+# Characters left as they are when percent-encoding rule paths
+_SAFE_PATH_CHARS = "/?=&%:@!$'()*+,;~-._"
+_LINE = re.compile(r"^\s*([A-Za-z-]+)\s*:\s*(.*?)\s*$")
+
+
+def agent_token(user_agent: str) -> str:
+    """The product token of a User-Agent string, lowercased: "Googlebot/2.1 (...)" -> "googlebot"."""
+    return re.split(r"[/\s;(]", user_agent.strip(), maxsplit=1)[0].lower() or "*"
+
+
+class RobotsGroup:
+    """One group of a robots.txt: the user-agents it applies to and their rules."""
+
+    __slots__ = ("agents", "rules", "crawl_delay")
+
+    def __init__(self):
+        self.agents: List[str] = []
+        self.rules: List[Tuple[bool, str]] = []  # (allow, path pattern) in file order
+        self.crawl_delay: Optional[float] = None
+
+    def to_dict(self) -> dict:
+        return {
+            "user_agents": self.agents,
+            "rules": [{"allow": allow, "path": path} for allow, path in self.rules],
+            "crawl_delay": self.crawl_delay,
+        }
+
+
+class RobotsMatcher:
+    """
+    The rules that apply to one crawler, compiled for matching.
+
+    Rules are ordered longest first (Allow before Disallow at equal length),
+    so the first rule that matches decides.
+    """
+
+    __slots__ = ("_rules", "crawl_delay", "allow_all", "disallow_all")
+
+    def __init__(self, rules: List[Tuple[bool, str]], crawl_delay: Optional[float] = None,
+                 disallow_all: bool = False):
+        compiled = []
+        for allow, pattern in rules:
+            if not pattern:
+                continue  # "Disallow:" with no path means nothing is disallowed
+            if "*" in pattern or pattern.endswith("$"):
+                anchored = pattern.endswith("$")
+                body = pattern[:-1] if anchored else pattern
+                regex = re.compile(".*?".join(re.escape(part) for part in body.split("*")) + ("$" if anchored else ""),
+                                   re.DOTALL)
+                compiled.append((len(pattern), allow, None, regex.match))
+            else:
+                compiled.append((len(pattern), allow, pattern, None))
+        compiled.sort(key=lambda rule: (-rule[0], not rule[1]))
+        self._rules = [(allow, prefix, match) for _, allow, prefix, match in compiled]
+        self.crawl_delay = crawl_delay
+        self.disallow_all = disallow_all
+        self.allow_all = not disallow_all and not any(not allow for allow, _, _ in self._rules)
+
+    def is_allowed(self, path: str) -> bool:
+        """Whether a path (with its query string, if any) may be crawled."""
+        if self.allow_all:
+            return True
+        if self.disallow_all:
+            return path == "/robots.txt"
+        if path == "/robots.txt":
+            return True
+        for allow, prefix, match in self._rules:
+            if (path.startswith(prefix) if match is None else match(path) is not None):
+                return allow
+        return True
+
+
+class RobotsRules:
+    """
+    A parsed robots.txt.
+
+    Attributes:
+        groups: The groups in file order.
+        sitemaps: URLs from Sitemap lines.
+        disallow_all: True when the file could not be fetched because of a
+            server error, in which case the RFC says to assume everything is
+            disallowed.
+    """
+
+    def __init__(self, groups: Optional[List[RobotsGroup]] = None, sitemaps: Optional[List[str]] = None,
+                 disallow_all: bool = False):
+        self.groups = groups or []
+        self.sitemaps = sitemaps or []
+        self.disallow_all = disallow_all
+        self._matchers: Dict[str, RobotsMatcher] = {}
+
+    def matcher(self, agent: Optional[str] = None) -> RobotsMatcher:
+        """Compiled rules for a crawler (User-Agent string or product token; default: our own User-Agent)."""
+        token = agent_token(agent or HTTP_CONFIG["user_agent"])
+        matcher = self._matchers.get(token)
+        if matcher is None:
+            groups = [group for group in self.groups if token in group.agents]
+            if not groups:
+                groups = [group for group in self.groups if "*" in group.agents]
+            rules = [rule for group in groups for rule in group.rules]
+            delays = [group.crawl_delay for group in groups if group.crawl_delay is not None]
+            matcher = RobotsMatcher(rules, crawl_delay=max(delays) if delays else None,
+                                    disallow_all=self.disallow_all)
+            self._matchers[token] = matcher
+        return matcher
+
+    def is_allowed(self, url: str, agent: Optional[str] = None) -> bool:
+        """Whether a URL (or a path starting with "/") may be crawled by an agent."""
+        return self.matcher(agent).is_allowed(_path_of(url))
+
+    def crawl_delay(self, agent: Optional[str] = None) -> Optional[float]:
+        return self.matcher(agent).crawl_delay
+
+    def to_dict(self) -> dict:
+        return {
+            "groups": [group.to_dict() for group in self.groups],
+            "sitemaps": self.sitemaps,
+            "disallow_all": self.disallow_all,
+        }
+
+
+def _path_of(url: str) -> str:
+    if url.startswith("/"):
+        return url
+    parts = urlsplit(url)
+    path = parts.path or "/"
+    return f"{path}?{parts.query}" if parts.query else path
+
+
+def _encode_path(path: str) -> str:
+    # Rules may be written with raw UTF-8; URLs arrive percent-encoded
+    return path if path.isascii() else quote(path, safe=_SAFE_PATH_CHARS)
+
+
+def parse_robots(text: str) -> RobotsRules:
+    """
+    Parse robots.txt content. Unknown lines are ignored, as are rules that
+    appear before any User-agent line.
+    """
+    groups: List[RobotsGroup] = []
+    sitemaps: List[str] = []
+    group: Optional[RobotsGroup] = None
+    in_agents = False  # the previous meaningful line was a User-agent line
+
+    for raw_line in text[:ROBOTS_CONFIG["max_bytes"]].splitlines():
+        match = _LINE.match(raw_line.split("#", 1)[0])
+        if not match:
+            continue
+        key, value = match.group(1).lower(), match.group(2)
+        if key == "sitemap":
+            if value:
+                sitemaps.append(value)
+            continue
+        if key in ("user-agent", "useragent"):
+            if not in_agents:
+                group = RobotsGroup()
+                groups.append(group)
+            group.agents.append(agent_token(value) if value != "*" else "*")
+            in_agents = True
+            continue
+        if key not in ("allow", "disallow", "crawl-delay"):
+            continue
+        in_agents = False
+        if group is None:
+            continue
+        if key == "crawl-delay":
+            try:
+                group.crawl_delay = float(value)
+            except ValueError:
+                pass
+        else:
+            group.rules.append((key == "allow", _encode_path(value)))
+    return RobotsRules(groups, sitemaps)
+
+
+class RobotsCache:
+    """
+    robots.txt rules per host, fetched on first use and kept for a TTL.
+
+    Following RFC 9309, a 4xx response means everything is allowed, and a
+    5xx response or a network error means everything is disallowed (cached
+    for the shorter error_ttl so the host is asked again soon). Safe to use
+    from several threads; a host's robots.txt is fetched once even when
+    many threads ask for it at the same time.
+
+    Args:
+        ttl: Seconds to keep rules from a fetched robots.txt.
+        error_ttl: Seconds to keep the disallow-all rules after a failed fetch.
+        max_hosts: Hosts kept; the least recently used are dropped beyond this.
+        timeout: Seconds per robots.txt request.
+    """
+
+    def __init__(self, ttl: Optional[float] = None, error_ttl: Optional[float] = None,
+                 max_hosts: Optional[int] = None, timeout: Optional[float] = None):
+        self.ttl = ttl if ttl is not None else ROBOTS_CONFIG["ttl"]
+        self.error_ttl = error_ttl if error_ttl is not None else ROBOTS_CONFIG["error_ttl"]
+        self.max_hosts = max_hosts or ROBOTS_CONFIG["max_hosts"]
+        self.timeout = timeout
+        self._entries: "OrderedDict[str, Tuple[float, RobotsRules]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._fetch_locks: Dict[str, threading.Lock] = {}
+        self.stats = {"fetches": 0, "hits": 0}
+
+    def __getstate__(self) -> dict:
+        # Locks cannot be pickled; a copy sent to a worker process gets fresh ones
+        state = self.__dict__.copy()
+        del state["_lock"]
+        state["_fetch_locks"] = {}
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def rules_for(self, url: str) -> RobotsRules:
+        """The robots.txt rules of a URL's host, fetching them if needed."""
+        origin = url_origin(url)
+        rules = self._cached(origin)
+        if rules is not None:
+            return rules
+        with self._lock:
+            fetch_lock = self._fetch_locks.setdefault(origin, threading.Lock())
+        with fetch_lock:
+            # Another thread may have fetched it while this one waited
+            rules = self._cached(origin)
+            if rules is None:
+                rules, ttl = self._fetch(origin)
+                self.store(origin, rules, ttl)
+        with self._lock:
+            self._fetch_locks.pop(origin, None)
+        return rules
+
+    def peek(self, url: str) -> Optional[RobotsRules]:
+        """The cached rules of a URL's host, or None if they would have to be fetched."""
+        return self._cached(url_origin(url))
+
+    def _cached(self, origin: str) -> Optional[RobotsRules]:
+        with self._lock:
+            entry = self._entries.get(origin)
+            if entry is None or entry[0] < time.monotonic():
+                return None
+            self._entries.move_to_end(origin)
+            self.stats["hits"] += 1
+            return entry[1]
+
+    def store(self, origin: str, rules: RobotsRules, ttl: Optional[float] = None) -> None:
+        """Cache rules for an origin (scheme://host[:port]), e.g. rules parsed from a file already fetched."""
+        with self._lock:
+            self._entries[origin] = (time.monotonic() + (self.ttl if ttl is None else ttl), rules)
+            self._entries.move_to_end(origin)
+            while len(self._entries) > self.max_hosts:
+                self._entries.popitem(last=False)
+
+    def _fetch(self, origin: str) -> Tuple[RobotsRules, float]:
+        self.stats["fetches"] += 1
+        try:
+            response = http_client.get(origin + "/robots.txt", timeout=self.timeout)
+        except requests.exceptions.RequestException:
+            return RobotsRules(disallow_all=True), self.error_ttl
+        if 200 <= response.status_code < 300:
+            return parse_robots(response.text), self.ttl
+        if 400 <= response.status_code < 500:
+            return RobotsRules(), self.ttl
+        return RobotsRules(disallow_all=True), self.error_ttl
+
+    def is_allowed(self, url: str, agent: Optional[str] = None) -> bool:
+        """Whether a URL may be crawled by an agent (default: our own User-Agent)."""
+        return self.rules_for(url).is_allowed(url, agent)
+
+    def crawl_delay(self, url: str, agent: Optional[str] = None) -> Optional[float]:
+        """The Crawl-delay that applies to an agent on a URL's host, if any."""
+        return self.rules_for(url).crawl_delay(agent)
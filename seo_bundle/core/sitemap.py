@@ -0,0 +1,334 @@
+"""
+core/sitemap.py
+
+Streaming sitemap reader.
+
+Sitemaps are downloaded in chunks and fed to an incremental lxml parser;
+each <url> or <sitemap> element is turned into an entry and cleared as soon
+as it ends, so memory stays flat no matter how large the file is. Gzipped
+sitemaps (.xml.gz, or any body starting with the gzip magic bytes) are
+decompressed on the fly.
+
+<sitemapindex> files are followed: their child sitemaps are read
+concurrently by a small thread pool, and page entries are handed to the
+caller through a bounded queue (one batch per downloaded chunk), so a slow
+consumer holds the readers back instead of buffering entries.
+
+Every file read is recorded as a SitemapFile with the problems found in it,
+including the protocol limits of 50,000 entries and 50 MB (uncompressed)
+per file.
+"""
+
+import queue
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Iterator, List, Optional
+
+import requests
+from lxml import etree
+
+from core import http_client
+from core.config import HTTP_CONFIG, SITEMAP_CONFIG, STREAMING_CONFIG
+
+GZIP_MAGIC = b"\x1f\x8b"
+
+# Problems recorded per file beyond this are counted but not described
+MAX_ERRORS_PER_FILE = 20
+
+
+class SitemapEntry:
+    """A <url> of a sitemap: the page location, its <lastmod> (as written) and the sitemap it came from."""
+
+    __slots__ = ("loc", "lastmod", "sitemap")
+
+    def __init__(self, loc: str, lastmod: Optional[str], sitemap: str):
+        self.loc = loc
+        self.lastmod = lastmod
+        self.sitemap = sitemap
+
+    def __repr__(self):
+        return f"SitemapEntry({self.loc!r}, lastmod={self.lastmod!r})"
+
+
+class SitemapFile:
+    """
+    What was found in one sitemap file.
+
+    Attributes:
+        url: The sitemap URL.
+        kind: "urlset", "sitemapindex", or None if the root element was not read.
+        status_code: HTTP status, or None if the request failed.
+        compressed: True if the body was gzipped.
+        size: Uncompressed bytes read.
+        entries: Number of <url> (or, for an index, <sitemap>) entries with a <loc>.
+        errors: Descriptions of the problems found.
+    """
+
+    __slots__ = ("url", "kind", "status_code", "compressed", "size", "entries", "errors", "error_count")
+
+    def __init__(self, url: str):
+        self.url = url
+        self.kind = None
+        self.status_code = None
+        self.compressed = False
+        self.size = 0
+        self.entries = 0
+        self.errors: List[str] = []
+        self.error_count = 0
+
+    def add_error(self, message: str) -> None:
+        self.error_count += 1
+        if len(self.errors) < MAX_ERRORS_PER_FILE:
+            self.errors.append(message)
+
+    @property
+    def ok(self) -> bool:
+        return self.error_count == 0
+
+    def to_dict(self) -> dict:
+        return {
+            "url": self.url,
+            "kind": self.kind,
+            "status_code": self.status_code,
+            "compressed": self.compressed,
+            "size": self.size,
+            "entries": self.entries,
+            "errors": self.errors,
+            "error_count": self.error_count,
+        }
+
+
+def _loc_and_lastmod(element):
+    """Stripped <loc> ("" if missing) and <lastmod> (None if missing) of an entry, in any namespace."""
+    loc, lastmod = "", None
+    for child in element:
+        tag = child.tag
+        if not isinstance(tag, str):
+            continue
+        name = tag.rpartition("}")[2]
+        if name == "loc":
+            loc = (child.text or "").strip()
+        elif name == "lastmod":
+            lastmod = (child.text or "").strip()
+    return loc, lastmod
+
+
+def _body_chunks(response, report: SitemapFile) -> Iterator[bytes]:
+    """
+    The response body in chunks of at most STREAMING_CONFIG["chunk_size"]
+    bytes, gunzipped if it starts with the gzip magic bytes.
+    """
+    chunk_size = STREAMING_CONFIG["chunk_size"]
+    decompressor = None
+    for chunk in response.iter_content(chunk_size=chunk_size):
+        if decompressor is None and not report.compressed and not report.size and chunk.startswith(GZIP_MAGIC):
+            report.compressed = True
+            decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        if decompressor is None:
+            yield chunk
+            continue
+        # Bounded output per call, so a highly compressed body does not inflate in one piece
+        data = decompressor.decompress(chunk, chunk_size)
+        yield data
+        while decompressor.unconsumed_tail:
+            data = decompressor.decompress(decompressor.unconsumed_tail, chunk_size)
+            yield data
+
+
+class _Stopped(Exception):
+    """The consumer went away; the reader should stop."""
+
+
+class SitemapReader:
+    """
+    Reads sitemaps and sitemap indexes, yielding page entries as they are parsed.
+
+    Args:
+        timeout: Per-request timeout in seconds.
+        workers: Sitemap files downloaded and parsed at the same time.
+        max_sitemaps: Stop following index files after this many sitemap files.
+        max_urls: Entries allowed per file before it is reported (protocol: 50,000).
+        max_bytes: Uncompressed bytes allowed per file before it is reported (protocol: 50 MB).
+
+    After (or during) iteration, ``files`` lists a SitemapFile for every
+    sitemap read, in completion order, ``sitemaps_found`` counts the files
+    queued so far and ``skipped_sitemaps`` those left out by max_sitemaps.
+    """
+
+    def __init__(self, timeout: Optional[float] = None, workers: Optional[int] = None,
+                 max_sitemaps: Optional[int] = None, max_urls: Optional[int] = None,
+                 max_bytes: Optional[int] = None):
+        self.timeout = timeout or HTTP_CONFIG["timeout"]
+        self.workers = workers or SITEMAP_CONFIG["workers"]
+        self.max_sitemaps = max_sitemaps or SITEMAP_CONFIG["max_sitemaps"]
+        self.max_urls = max_urls or SITEMAP_CONFIG["max_urls"]
+        self.max_bytes = max_bytes or SITEMAP_CONFIG["max_bytes"]
+        self.files: List[SitemapFile] = []
+        self.sitemaps_found = 0
+        self.skipped_sitemaps = 0
+
+    def iter_entries(self, sitemap_urls: Iterable[str]) -> Iterator[SitemapEntry]:
+        """
+        Yield the page entries of the given sitemaps, following index files.
+        Each sitemap URL is read at most once.
+        """
+        results: queue.Queue = queue.Queue(maxsize=SITEMAP_CONFIG["queue_batches"])
+        stop = threading.Event()
+        seen = set()
+        pending = 0
+        executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="sitemap")
+
+        def submit(url: str, parent: Optional[str]) -> None:
+            nonlocal pending
+            if url in seen:
+                return
+            if len(seen) >= self.max_sitemaps:
+                self.skipped_sitemaps += 1
+                return
+            seen.add(url)
+            self.sitemaps_found += 1
+            pending += 1
+            executor.submit(self._read_file, url, parent, results, stop)
+
+        try:
+            for url in sitemap_urls:
+                submit(url, None)
+            while pending:
+                kind, value = results.get()
+                if kind == "urls":
+                    yield from value
+                elif kind == "sitemaps":
+                    parent, locs = value
+                    for loc in locs:
+                        submit(loc, parent)
+                else:
+                    pending -= 1
+                    self.files.append(value)
+        finally:
+            stop.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _read_file(self, url: str, parent: Optional[str], results: queue.Queue, stop: threading.Event) -> None:
+        """Download and parse one sitemap on a worker thread, putting its entries on the results queue."""
+        report = SitemapFile(url)
+
+        def put(item) -> None:
+            while True:
+                if stop.is_set():
+                    raise _Stopped()
+                try:
+                    results.put(item, timeout=0.1)
+                    return
+                except queue.Full:
+                    continue
+
+        try:
+            self._parse(url, parent, report, put)
+        except _Stopped:
+            return
+        except requests.exceptions.RequestException as e:
+            report.add_error(f"Could not fetch sitemap: {e}")
+        except Exception as e:
+            # Reported rather than raised, so the consumer still hears that this file is done
+            report.add_error(f"Unexpected error while reading sitemap: {e}")
+        try:
+            put(("done", report))
+        except _Stopped:
+            pass
+
+    def _parse(self, url: str, parent: Optional[str], report: SitemapFile, put) -> None:
+        response = http_client.get(url, timeout=self.timeout, stream=True)
+        try:
+            report.status_code = response.status_code
+            if response.status_code != 200:
+                report.add_error(f"HTTP status {response.status_code}")
+                return
+
+            # Only entry elements produce events; their <loc>/<lastmod> children are read from the element
+            parser = etree.XMLPullParser(events=("end",), tag=("{*}url", "{*}sitemap"), resolve_entities=False,
+                                         no_network=True, huge_tree=True, remove_comments=True)
+            for chunk in _body_chunks(response, report):
+                report.size += len(chunk)
+                try:
+                    parser.feed(chunk)
+                except etree.XMLSyntaxError as e:
+                    # Keep the entries parsed before the error
+                    self._handle_events(parser, url, parent, report, put)
+                    report.add_error(f"Malformed XML: {e}")
+                    return
+                if not self._handle_events(parser, url, parent, report, put):
+                    return
+            try:
+                root = parser.close()
+            except etree.XMLSyntaxError as e:
+                root = None
+                report.add_error(f"Malformed XML: {e}")
+            if self._handle_events(parser, url, parent, report, put) and report.kind is None and root is not None:
+                self._check_root(root, parent, report)
+        except zlib.error as e:
+            report.add_error(f"Corrupt gzip data: {e}")
+        finally:
+            response.close()
+
+        if report.kind is None and report.error_count == 0:
+            report.add_error("Empty sitemap")
+        if report.entries > self.max_urls:
+            report.add_error(f"{report.entries} entries; the protocol allows at most {self.max_urls} per file")
+        if report.size > self.max_bytes:
+            report.add_error(f"{report.size} bytes uncompressed; the protocol allows at most {self.max_bytes}")
+
+    @staticmethod
+    def _check_root(root, parent: Optional[str], report: SitemapFile) -> bool:
+        """Record the kind of sitemap from its root element; False if it is not a sitemap."""
+        kind = etree.QName(root).localname
+        if kind not in ("urlset", "sitemapindex"):
+            report.add_error(f"Root element is <{kind}>, not <urlset> or <sitemapindex>")
+            return False
+        report.kind = kind
+        if kind == "sitemapindex" and parent is not None:
+            report.add_error(f"Sitemap index nested in the sitemap index {parent}")
+        return True
+
+    def _handle_events(self, parser, url: str, parent: Optional[str], report: SitemapFile, put) -> bool:
+        """
+        Turn the finished <url>/<sitemap> elements into one batch of entries
+        and free them. Returns False if the root is not a sitemap.
+        """
+        batch = []
+        for _, element in parser.read_events():
+            root = element.getparent()
+            if root is None or root.getparent() is not None:
+                continue  # not an entry, e.g. an extension element that happens to be called <url>
+            if report.kind is None and not self._check_root(root, parent, report):
+                return False
+
+            name = element.tag.rpartition("}")[2]
+            expected = "sitemap" if report.kind == "sitemapindex" else "url"
+            loc, lastmod = _loc_and_lastmod(element)
+            if name != expected:
+                report.add_error(f"<{name}> entry in a <{report.kind}>")
+            elif not loc:
+                report.add_error(f"<{name}> entry without a <loc> (line {element.sourceline})")
+            else:
+                report.entries += 1
+                if name == "url":
+                    batch.append(SitemapEntry(loc, lastmod, url))
+                else:
+                    batch.append(loc)
+            # The entry has been used: drop it and anything before it so the tree stays empty
+            element.clear()
+            while element.getprevious() is not None:
+                del root[0]
+
+        if batch:
+            put(("urls", batch) if report.kind == "urlset" else ("sitemaps", (url, batch)))
+        return True
+
+
+def default_sitemap_url(site: str) -> str:
+    """The conventional sitemap location of a site: /sitemap.xml at its root, or the URL itself if it is a sitemap."""
+    if site.lower().endswith((".xml", ".xml.gz")):
+        return site
+    return site.rstrip("/") + "/sitemap.xml"
+
@@ -0,0 +1,149 @@
+"""
+core/status_check.py
+
+HTTP status checks without downloading bodies.
+
+Each URL is requested with HEAD (a streamed GET closed after the headers
+when the server does not support HEAD), so a check costs one round trip
+per redirect and no body bytes. StatusChecker runs large batches -- e.g.
+every URL of a sitemap -- concurrently with a bounded number of requests
+in flight overall and per host, and yields results as they complete.
+"""
+
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import requests
+
+from core import http_client
+from core.urls import url_host
+
+
+class StatusResult:
+    """
+    Outcome of one status check.
+
+    Attributes:
+        url: The URL checked.
+        status_code: Status of the final response; None if the request failed.
+        final_url: URL of the final response (after redirects, if followed).
+        redirects: Number of redirects followed.
+        header_ms: Milliseconds until the headers of the final response
+            arrived, redirects included.
+        error: The network error, if the request failed.
+    """
+
+    __slots__ = ("url", "status_code", "final_url", "redirects", "header_ms", "error")
+
+    def __init__(self, url: str, status_code: Optional[int] = None, final_url: Optional[str] = None,
+                 redirects: int = 0, header_ms: float = 0.0, error: Optional[str] = None):
+        self.url = url
+        self.status_code = status_code
+        self.final_url = final_url or url
+        self.redirects = redirects
+        self.header_ms = header_ms
+        self.error = error
+
+    def to_dict(self) -> dict:
+        result = {
+            "url": self.url,
+            "status_code": self.status_code,
+            "final_url": self.final_url,
+            "redirects": self.redirects,
+            "header_ms": self.header_ms,
+        }
+        if self.error is not None:
+            result["error"] = self.error
+        return result
+
+
+def check_status(url: str, timeout: Optional[float] = None, follow_redirects: bool = True) -> StatusResult:
+    """Status code, final URL and header time of one URL, without reading its body."""
+    start = time.perf_counter()
+    try:
+        response = http_client.head_or_get(url, timeout=timeout, allow_redirects=follow_redirects)
+    except requests.exceptions.RequestException as e:
+        return StatusResult(url, header_ms=round((time.perf_counter() - start) * 1000, 1), error=str(e))
+    return StatusResult(
+        url,
+        status_code=response.status_code,
+        final_url=response.url,
+        redirects=len(response.history),
+        header_ms=round((time.perf_counter() - start) * 1000, 1),
+    )
+
+
+class StatusChecker:
+    """
+    Concurrent status checks for many URLs.
+
+    Args:
+        workers: Requests in flight overall.
+        per_host: Requests in flight per host, so one slow host does not
+            take every worker and each host's keep-alive pool is reused.
+        timeout: Seconds per request (default: HTTP_CONFIG["timeout"]).
+        follow_redirects: Report the status of the redirect target instead
+            of the redirect itself.
+    """
+
+    def __init__(self, workers: int = 32, per_host: int = 8, timeout: Optional[float] = None,
+                 follow_redirects: bool = True):
+        self.workers = workers
+        self.per_host = per_host
+        self.timeout = timeout
+        self.follow_redirects = follow_redirects
+        self._host_limits: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> dict:
+        # Locks cannot be pickled; a copy sent to a worker process gets fresh ones
+        state = self.__dict__.copy()
+        del state["_lock"]
+        state["_host_limits"] = {}
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def check(self, url: str) -> StatusResult:
+        """Check one URL, waiting for a free slot on its host."""
+        host = url_host(url)
+        with self._lock:
+            limit = self._host_limits.get(host)
+            if limit is None:
+                limit = self._host_limits[host] = threading.BoundedSemaphore(self.per_host)
+        with limit:
+            return check_status(url, timeout=self.timeout, follow_redirects=self.follow_redirects)
+
+    def iter_check(self, urls: Iterable[str]) -> Iterator[Tuple[int, StatusResult]]:
+        """
+        Yield (input position, result) in completion order. URLs are read
+        from the iterable as slots free up, so a long input is never held
+        in memory as pending requests.
+        """
+        urls = iter(enumerate(urls))
+        max_pending = self.workers * 2
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="status") as executor:
+            pending = {}
+            try:
+                while True:
+                    for index, url in urls:
+                        pending[executor.submit(self.check, url)] = index
+                        if len(pending) >= max_pending:
+                            break
+                    if not pending:
+                        return
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield pending.pop(future), future.result()
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def check_many(self, urls: Iterable[str]) -> List[StatusResult]:
+        """Check many URLs; results in input order."""
+        results = sorted(self.iter_check(urls), key=lambda item: item[0])
+        return [result for _, result in results]
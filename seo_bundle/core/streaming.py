@@ -0,0 +1,188 @@
+"""
+core/streaming.py
+
+Streaming extraction for very large pages.
+
+The response body is read in chunks and fed to an incremental lxml parser
+whose events go straight into a PageIndex (see core/extract.py). No element
+tree is built and the body is not kept, so memory stays flat regardless of
+page size. Reading stops after a configurable number of bytes and the
+document is flagged as truncated.
+"""
+
+import time
+from typing import Dict, List, Optional
+
+import requests
+from lxml import etree
+
+from core import http_client
+from core.config import HTTP_CONFIG, STREAMING_CONFIG
+from core.document import PageDocument
+from core.extract import TEXT_TAGS, PageIndex
+
+# Trailing bytes checked for an unfinished tag at the end of each chunk (longer than "</script>")
+TAG_HOLDBACK = 16
+
+
+class IndexTarget:
+    """
+    lxml parser target that files elements into a PageIndex as they are parsed.
+
+    Elements in TEXT_TAGS are held open until their end tag so their text can
+    be collected; everything else is filed on its start tag. Nested text
+    elements (a heading inside a heading) are filed in start-tag order, the
+    same order a tree walk would produce.
+    """
+
+    def __init__(self):
+        self.index = PageIndex()
+        # Open text-collecting elements: [start position, tag, attrs, text pieces]
+        self._open: List[list] = []
+        # Closed elements waiting for their enclosing text element to close
+        self._closed: List[list] = []
+        self._buffer: List[str] = []
+        self._position = 0
+
+    def _flush(self) -> None:
+        # Text nodes can arrive in several data() calls; strip each node once it is complete.
+        if not self._buffer:
+            return
+        data = "".join(self._buffer)
+        self._buffer = []
+        for entry in self._open:
+            entry[3].append(data if entry[1] == "script" else data.strip())
+
+    def _file(self, entry: list) -> None:
+        self._closed.append(entry)
+        if not self._open:
+            for _, tag, attrs, pieces in sorted(self._closed, key=lambda e: e[0]):
+                self.index.add(tag, attrs, "".join(pieces))
+            self._closed = []
+
+    def start(self, tag, attrib) -> None:
+        self._flush()
+        if not isinstance(tag, str):
+            return
+        tag = tag.lower()
+        attrs: Dict[str, str] = dict(attrib)
+        if tag in TEXT_TAGS:
+            self._open.append([self._position, tag, attrs, []])
+            self._position += 1
+        elif tag in ("img", "meta", "link"):
+            self.index.add(tag, attrs)
+
+    def end(self, tag) -> None:
+        self._flush()
+        if not isinstance(tag, str):
+            return
+        tag = tag.lower()
+        # Close the innermost open element with this tag (the parser closes unclosed ones for us).
+        for position in range(len(self._open) - 1, -1, -1):
+            if self._open[position][1] == tag:
+                self._file(self._open.pop(position))
+                break
+
+    def data(self, data: str) -> None:
+        if self._open:
+            self._buffer.append(data)
+
+    def comment(self, text: str) -> None:
+        self._flush()
+
+    def close(self) -> PageIndex:
+        self._flush()
+        # Anything still open at the end of a truncated body is filed with the text seen so far.
+        while self._open:
+            self._file(self._open.pop())
+        return self.index
+
+
+class StreamingIndexer:
+    """
+    Incremental parser that turns chunks of HTML into a PageIndex.
+
+    Usage:
+        indexer = StreamingIndexer(encoding="utf-8")
+        for chunk in chunks:
+            indexer.feed(chunk)
+        index = indexer.close()
+    """
+
+    def __init__(self, encoding: Optional[str] = None):
+        self._target = IndexTarget()
+        self._parser = etree.HTMLParser(target=self._target, encoding=encoding)
+        self._carry = b""
+
+    def feed(self, chunk: bytes) -> None:
+        chunk = self._carry + chunk
+        # libxml2's push parser misses a </script> or </style> end tag that is split
+        # across two feeds, so hold back a trailing partial tag until the next chunk.
+        cut = chunk.rfind(b"<", max(0, len(chunk) - TAG_HOLDBACK))
+        if cut == -1:
+            self._carry = b""
+        else:
+            chunk, self._carry = chunk[:cut], chunk[cut:]
+        if chunk:
+            self._parser.feed(chunk)
+
+    def close(self) -> PageIndex:
+        if self._carry:
+            self._parser.feed(self._carry)
+            self._carry = b""
+        try:
+            return self._parser.close()
+        except etree.XMLSyntaxError:
+            # Raised for an empty body; there is nothing to index
+            return self._target.close()
+
+
+def stream_document(url: str, timeout: Optional[float] = None, max_bytes: Optional[int] = None,
+                    chunk_size: Optional[int] = None, session: Optional[requests.Session] = None) -> PageDocument:
+    """
+    Fetch a URL and index it while it downloads, without keeping the body.
+
+    The returned document has ``index`` filled in and ``streamed`` set; its
+    ``content`` is empty and the tree-based views (text, soup, tree) are not
+    available. If the body exceeds max_bytes (default
+    STREAMING_CONFIG["max_body_bytes"]) reading stops there and
+    ``doc.truncated`` is True.
+
+    Raises:
+        requests.exceptions.RequestException: If the page could not be fetched.
+    """
+    max_bytes = max_bytes or STREAMING_CONFIG["max_body_bytes"]
+    chunk_size = chunk_size or STREAMING_CONFIG["chunk_size"]
+
+    start = time.perf_counter()
+    response = http_client.get(url, timeout=timeout or HTTP_CONFIG["timeout"], stream=True, session=session)
+    indexer = StreamingIndexer(encoding=response.encoding)
+    received = 0
+    truncated = False
+    try:
+        for chunk in response.iter_content(chunk_size=chunk_size):
+            remaining = max_bytes - received
+            if len(chunk) > remaining:
+                chunk = chunk[:remaining]
+                truncated = True
+            received += len(chunk)
+            indexer.feed(chunk)
+            if truncated:
+                break
+    finally:
+        response.close()
+    index = indexer.close()
+    elapsed = time.perf_counter() - start
+
+    return PageDocument(
+        url=url,
+        content=b"",
+        status_code=response.status_code,
+        headers=response.headers,
+        final_url=response.url,
+        encoding=response.encoding,
+        elapsed=elapsed,
+        index=index,
+        truncated=truncated,
+        redirect_status=response.history[0].status_code if response.history else None,
+    )
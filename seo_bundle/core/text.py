@@ -0,0 +1,66 @@
+"""
+core/text.py
+
+The text stage shared by the content tools.
+
+A page's visible text (doc.visible_text: script, style and template
+contents excluded, whitespace collapsed) is split into sentences and word
+tokens once per document and memoized as doc.page_text, so the word count,
+frequency, density, position and readability tools all see the same words:
+
+    tokens      lowercased words: runs of letters and digits, with inner
+                apostrophes, hyphens, dots and commas kept ("don't",
+                "e-mail", "3.5", "1,000")
+    sentences   (start, end) token ranges; a sentence ends at ".", "!",
+                "?" or "…" followed by whitespace or the end of the text
+"""
+
+import re
+from typing import List, Tuple
+
+_WORD = re.compile(r"\w+(?:['’.,-]\w+)*")
+# Sentence terminators, with closing quotes and brackets, followed by whitespace or the end
+_SENTENCE_END = re.compile(r"(?<=[.!?…])[\"'”’)\]]*\s+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens of a text."""
+    return _WORD.findall(text.lower())
+
+
+class PageText:
+    """
+    Clean text of a page with its tokens and sentence boundaries.
+
+    Attributes:
+        text: The visible text, whitespace collapsed.
+        tokens: Lowercased word tokens in text order.
+        sentences: (start, end) ranges into tokens, one per sentence that
+            contains at least one word.
+    """
+
+    __slots__ = ("text", "tokens", "sentences")
+
+    def __init__(self, text: str):
+        self.text = text
+        self.tokens: List[str] = []
+        self.sentences: List[Tuple[int, int]] = []
+        findall = _WORD.findall
+        tokens = self.tokens
+        for sentence in _SENTENCE_END.split(text.lower()):
+            start = len(tokens)
+            tokens.extend(findall(sentence))
+            if len(tokens) > start:
+                self.sentences.append((start, len(tokens)))
+
+    @property
+    def word_count(self) -> int:
+        return len(self.tokens)
+
+    @property
+    def sentence_count(self) -> int:
+        return len(self.sentences)
+
+    def sentence_tokens(self, i: int) -> List[str]:
+        start, end = self.sentences[i]
+        return self.tokens[start:end]
@@ -0,0 +1,217 @@
+"""
+core/tfidf.py
+
+Keyword density and TF-IDF over a corpus of pages (e.g. a crawled site).
+
+Pages are tokenized into one shared vocabulary and stored as a sparse
+document-term matrix in compressed sparse rows (CSR): the terms of page i
+are ``indices[indptr[i]:indptr[i + 1]]`` (int32 term ids) with their
+counts in ``data``. Everything after tokenizing is vectorized with numpy,
+so 100k pages of a few hundred words are analyzed in seconds:
+
+    density()               count / page length, per (page, term)
+    document_frequency()    pages each term appears on
+    tfidf()                 count x idf, L2-normalized per page
+    top_terms()             the n best terms of every page by any weight,
+                            e.g. the most frequent or the most distinctive
+                            (high TF-IDF: frequent here, rare elsewhere)
+"""
+
+from array import array
+from collections import Counter
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from core.text import tokenize
+
+
+class TermMatrixBuilder:
+    """Collects tokenized pages into a shared vocabulary."""
+
+    def __init__(self):
+        self._vocab: Dict[str, int] = {}
+        self.terms: List[str] = []
+        self.urls: List[str] = []
+        self._indptr = array("q", [0])
+        self._indices = array("i")
+        self._data = array("i")
+        self._lengths = array("q")
+
+    def __len__(self) -> int:
+        return len(self.urls)
+
+    def add_document(self, url: str, text: str) -> int:
+        """Tokenize and add a page's text; returns its row number."""
+        return self.add_tokens(url, tokenize(text))
+
+    def add_tokens(self, url: str, tokens: List[str]) -> int:
+        """Add an already tokenized page; returns its row number."""
+        counts = Counter(tokens)
+        vocab = self._vocab
+        # New terms get ids in order of first occurrence, so ties between terms keep page order
+        for term in [term for term in counts if term not in vocab]:
+            vocab[term] = len(self.terms)
+            self.terms.append(term)
+        self._indices.extend(map(vocab.__getitem__, counts))
+        self._data.extend(counts.values())
+        self._indptr.append(len(self._indices))
+        self._lengths.append(len(tokens))
+        self.urls.append(url)
+        return len(self.urls) - 1
+
+    def build(self) -> "TermMatrix":
+        return TermMatrix(
+            urls=list(self.urls),
+            terms=list(self.terms),
+            indptr=np.array(self._indptr, dtype=np.int64),
+            indices=np.array(self._indices, dtype=np.int32),
+            data=np.array(self._data, dtype=np.int32),
+            lengths=np.array(self._lengths, dtype=np.int64),
+        )
+
+
+class TermMatrix:
+    """
+    A built document-term matrix.
+
+    Attributes:
+        urls: URL of each row.
+        terms: Term of each column.
+        indptr: int64 array of n_docs + 1 row offsets into indices/data.
+        indices: int32 term ids, grouped by page.
+        data: int32 counts aligned with indices.
+        lengths: Tokens per page.
+    """
+
+    def __init__(self, urls: List[str], terms: List[str], indptr: np.ndarray, indices: np.ndarray,
+                 data: np.ndarray, lengths: np.ndarray):
+        self.urls = urls
+        self.terms = terms
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self.lengths = lengths
+        self._rows: Optional[np.ndarray] = None
+        self._term_ids: Optional[Dict[str, int]] = None
+
+    @property
+    def n_docs(self) -> int:
+        return len(self.urls)
+
+    @property
+    def n_terms(self) -> int:
+        return len(self.terms)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes used by the arrays (the strings not included)."""
+        return self.indptr.nbytes + self.indices.nbytes + self.data.nbytes + self.lengths.nbytes
+
+    @property
+    def rows(self) -> np.ndarray:
+        """Row (page) of every stored entry, aligned with indices."""
+        if self._rows is None:
+            self._rows = np.repeat(np.arange(self.n_docs, dtype=np.int32), np.diff(self.indptr))
+        return self._rows
+
+    def term_id(self, term: str) -> Optional[int]:
+        if self._term_ids is None:
+            self._term_ids = {term: i for i, term in enumerate(self.terms)}
+        return self._term_ids.get(term.lower())
+
+    def density(self) -> np.ndarray:
+        """Percentage of each page's words that each stored term makes up, aligned with indices."""
+        return self.data * 100.0 / np.maximum(self.lengths, 1)[self.rows]
+
+    def document_frequency(self) -> np.ndarray:
+        """Number of pages each term appears on."""
+        return np.bincount(self.indices, minlength=self.n_terms)
+
+    def idf(self) -> np.ndarray:
+        """Smoothed inverse document frequency, ln((1 + n) / (1 + df)) + 1, of every term."""
+        return np.log((1.0 + self.n_docs) / (1.0 + self.document_frequency())) + 1.0
+
+    def tfidf(self, sublinear: bool = False) -> np.ndarray:
+        """
+        TF-IDF of every stored entry, aligned with indices, with each page's
+        vector scaled to unit length. sublinear uses 1 + ln(count) as the
+        term frequency, damping words repeated many times on one page.
+        """
+        tf = 1.0 + np.log(self.data) if sublinear else self.data.astype(np.float64)
+        weights = tf * self.idf()[self.indices]
+        norms = np.sqrt(np.bincount(self.rows, weights=weights * weights, minlength=self.n_docs))
+        weights /= np.maximum(norms, 1e-12)[self.rows]
+        return weights
+
+    def keyword_density(self, keyword: str) -> np.ndarray:
+        """Density (percent) of one word on every page."""
+        term = self.term_id(keyword)
+        counts = np.zeros(self.n_docs)
+        if term is not None:
+            hits = self.indices == term
+            counts = np.bincount(self.rows[hits], weights=self.data[hits], minlength=self.n_docs)
+        return counts * 100.0 / np.maximum(self.lengths, 1)
+
+    def top_terms(self, weights: np.ndarray, n: int = 10) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        The n highest-weighted entries of every page (ties keep page order).
+        Returns (rows, positions): positions index indices/data/weights,
+        grouped by row with the best entry first.
+        """
+        # Two stable sorts: by weight, then by row (an integer radix sort), which keeps
+        # each row's entries in descending weight order
+        order = np.argsort(-weights, kind="stable")
+        order = order[np.argsort(self.rows[order], kind="stable")]
+        rows = self.rows[order]
+        rank = np.arange(len(order)) - self.indptr[rows]
+        keep = rank < n
+        return rows[keep], order[keep]
+
+    def report(self, top: int = 10, sublinear: bool = False) -> Iterator[dict]:
+        """
+        One row per page: its word count, most frequent words with their
+        density, and most distinctive words (highest TF-IDF) with the
+        number of pages they appear on.
+        """
+        weights = self.tfidf(sublinear=sublinear)
+        frequent_rows, frequent = self.top_terms(self.data, top)
+        distinctive_rows, distinctive = self.top_terms(weights, top)
+        frequent_ptr = np.searchsorted(frequent_rows, np.arange(self.n_docs + 1)).tolist()
+        distinctive_ptr = np.searchsorted(distinctive_rows, np.arange(self.n_docs + 1)).tolist()
+
+        # Only the selected entries are converted to Python objects
+        terms = self.terms
+        frequent_words = [terms[t] for t in self.indices[frequent].tolist()]
+        frequent_counts = self.data[frequent].tolist()
+        frequent_density = np.round(self.density()[frequent], 2).tolist()
+        distinctive_words = [terms[t] for t in self.indices[distinctive].tolist()]
+        distinctive_counts = self.data[distinctive].tolist()
+        distinctive_tfidf = np.round(weights[distinctive], 4).tolist()
+        distinctive_pages = self.document_frequency()[self.indices[distinctive]].tolist()
+        lengths = self.lengths.tolist()
+
+        for i, url in enumerate(self.urls):
+            f = range(frequent_ptr[i], frequent_ptr[i + 1])
+            d = range(distinctive_ptr[i], distinctive_ptr[i + 1])
+            yield {
+                "url": url,
+                "total_words": lengths[i],
+                "top_words": [
+                    {"word": frequent_words[p], "count": frequent_counts[p], "density_percent": frequent_density[p]}
+                    for p in f
+                ],
+                "distinctive_words": [
+                    {"word": distinctive_words[p], "count": distinctive_counts[p], "tfidf": distinctive_tfidf[p],
+                     "pages": distinctive_pages[p]}
+                    for p in d
+                ],
+            }
+
+
+def build_term_matrix(pages: Iterable[Tuple[str, str]]) -> TermMatrix:
+    """Tokenize (url, text) pairs into a TermMatrix."""
+    builder = TermMatrixBuilder()
+    for url, text in pages:
+        builder.add_document(url, text)
+    return builder.build()
@@ -0,0 +1,128 @@
+"""
+core/urls.py
+
+Shared URL normalization and link resolution.
+
+Every link tool and the crawler resolve hrefs the same way:
+
+    resolve_url(base, href)   absolute, normalized http(s) URL of a link, or
+                              None for empty, fragment-only and non-HTTP links
+                              (javascript:, mailto:, tel:, data:, ...)
+    normalize_url(url)        lowercase scheme and host, drop default ports and
+                              the fragment, "/" for an empty path, drop tracking
+                              query parameters and sort the rest by name
+    url_host(url)             host[:port] used to tell internal from external links
+    url_origin(url)           scheme://host[:port]
+
+Paths, including trailing slashes, are left as they are: /about and /about/
+may be different pages.
+
+Results are memoized in bounded LRU caches (URL_CONFIG["memo_size"] entries
+each), since the same navigation and footer links repeat on every page of a
+site. Root-relative and absolute hrefs are memoized independently of the
+page they appear on, so they hit the cache across a whole crawl.
+"""
+
+import re
+from functools import lru_cache
+from typing import Optional
+from urllib.parse import unquote_plus, urljoin, urlsplit, urlunsplit
+
+from core.config import URL_CONFIG
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+_SCHEME = re.compile(r"[A-Za-z][A-Za-z0-9+.-]*:")
+_TRACKING_PREFIXES = tuple(name[:-1] for name in URL_CONFIG["tracking_params"] if name.endswith("*"))
+_TRACKING_NAMES = frozenset(name for name in URL_CONFIG["tracking_params"] if not name.endswith("*"))
+_MEMO_SIZE = URL_CONFIG["memo_size"]
+
+
+def _is_tracking_param(pair: str) -> bool:
+    name = unquote_plus(pair.split("=", 1)[0]).lower()
+    return name in _TRACKING_NAMES or name.startswith(_TRACKING_PREFIXES)
+
+
+@lru_cache(maxsize=_MEMO_SIZE)
+def normalize_url(url: str, strip_tracking: bool = True, sort_query: bool = True) -> str:
+    """
+    Normalize an absolute URL (see the module docstring).
+
+    Args:
+        url: The URL to normalize.
+        strip_tracking: Drop the query parameters listed in URL_CONFIG["tracking_params"].
+        sort_query: Sort query parameters by name (repeated names keep their order).
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    netloc = parts.netloc
+    if netloc:
+        userinfo, _, hostport = netloc.rpartition("@")
+        try:
+            port = parts.port
+        except ValueError:
+            port = None
+        if port is not None and port == DEFAULT_PORTS.get(scheme):
+            hostport = hostport.rsplit(":", 1)[0]
+        netloc = (userinfo + "@" if userinfo else "") + hostport.lower()
+    path = parts.path or ("/" if netloc else "")
+
+    query = parts.query
+    if query:
+        pairs = [pair for pair in query.split("&") if pair]
+        if strip_tracking:
+            pairs = [pair for pair in pairs if not _is_tracking_param(pair)]
+        if sort_query:
+            pairs.sort(key=lambda pair: pair.split("=", 1)[0])
+        query = "&".join(pairs)
+    return urlunsplit((scheme, netloc, path, query, ""))
+
+
+@lru_cache(maxsize=_MEMO_SIZE)
+def url_host(url: str) -> str:
+    """Lowercase host[:port] of a URL, without userinfo or a default port."""
+    return urlsplit(normalize_url(url, strip_tracking=False, sort_query=False)).netloc.rpartition("@")[2]
+
+
+@lru_cache(maxsize=_MEMO_SIZE)
+def url_origin(url: str) -> str:
+    """scheme://host[:port] of a URL."""
+    parts = urlsplit(url)
+    return f"{parts.scheme.lower()}://{url_host(url)}"
+
+
+@lru_cache(maxsize=_MEMO_SIZE)
+def _resolve(base: str, href: str) -> Optional[str]:
+    url = urljoin(base, href) if base else href
+    if not url.lower().startswith(("http://", "https://")):
+        return None
+    return normalize_url(url)
+
+
+def resolve_url(base: str, href: str) -> Optional[str]:
+    """
+    Resolve an href found on the page at base to a normalized absolute URL.
+
+    Returns None for empty and fragment-only hrefs and for links that do not
+    resolve to http(s).
+    """
+    href = href.strip()
+    if not href or href[0] == "#":
+        return None
+    if _SCHEME.match(href):
+        # Absolute: the page does not matter
+        return _resolve("", href)
+    if href[0] == "/":
+        # Root- or network-path-relative: only the page's origin matters
+        return _resolve(url_origin(base), href)
+    return _resolve(base, href)
+
+
+def memo_stats() -> dict:
+    """Hit and miss counts of the memo caches."""
+    return {fn.__name__.lstrip("_"): fn.cache_info()._asdict() for fn in (normalize_url, _resolve, url_host, url_origin)}
+
+
+def clear_memo() -> None:
+    for fn in (normalize_url, _resolve, url_host, url_origin):
+        fn.cache_clear()
@@ -0,0 +1,158 @@
+"""
+core/urlset.py
+
+Memory-compact sets of seen URLs for crawling.
+
+A Python set of URL strings costs well over 100 bytes per URL, which adds
+up to gigabytes on large crawls. Two smaller structures are provided:
+
+    HashedUrlSet  64-bit hashes of the URLs in an array-backed open-addressing
+                  table (linear probing). About 16-32 bytes per URL; a false match
+                  needs a 64-bit hash collision, so it is effectively exact.
+    BloomFilter   A fixed-size bit array sized for a target false-positive
+                  rate, about 1.2 bytes per URL at 1%. "Seen" answers may be
+                  wrong at that rate, so some new URLs get skipped.
+
+Both hash the URL string as given, so normalize URLs before adding them.
+"""
+
+import hashlib
+import math
+from array import array
+from typing import Iterable
+
+EMPTY = 0
+
+
+def url_hash(url: str) -> int:
+    """Return a non-zero 64-bit hash of a URL (blake2b, stable across runs and processes)."""
+    value = int.from_bytes(hashlib.blake2b(url.encode("utf-8"), digest_size=8).digest(), "little")
+    return value or 1
+
+
+def _zeroed_slots(size: int) -> array:
+    return array("Q", (EMPTY,)) * size
+
+
+class HashedUrlSet:
+    """
+    Set of URLs stored as 64-bit hashes in an open-addressing table.
+
+    Args:
+        capacity: Initial number of slots (rounded up to a power of two).
+        max_load: Fraction of slots that may be filled before the table doubles.
+    """
+
+    def __init__(self, capacity: int = 1 << 16, max_load: float = 0.5):
+        if not 0 < max_load < 1:
+            raise ValueError("max_load must be between 0 and 1")
+        self.max_load = max_load
+        self._slots = _zeroed_slots(1 << max(4, math.ceil(math.log2(max(capacity, 2)))))
+        self._mask = len(self._slots) - 1
+        self._count = 0
+
+    def _find(self, h: int) -> int:
+        """Index of h's slot, or of the empty slot where it would go."""
+        slots, mask = self._slots, self._mask
+        i = (h ^ (h >> 29)) & mask
+        while True:
+            value = slots[i]
+            if value == h or value == EMPTY:
+                return i
+            i = (i + 1) & mask
+
+    def add(self, url: str) -> bool:
+        """Add a URL; returns True if it was not already present."""
+        return self.add_hash(url_hash(url))
+
+    def add_hash(self, h: int) -> bool:
+        """Add a URL by its url_hash(); returns True if it was not already present."""
+        i = self._find(h)
+        if self._slots[i] == h:
+            return False
+        self._slots[i] = h
+        self._count += 1
+        if self._count > self.max_load * len(self._slots):
+            self._grow()
+        return True
+
+    def update(self, urls: Iterable[str]) -> None:
+        for url in urls:
+            self.add(url)
+
+    def __contains__(self, url: str) -> bool:
+        h = url_hash(url)
+        return self._slots[self._find(h)] == h
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _grow(self) -> None:
+        old = self._slots
+        self._slots = _zeroed_slots(len(old) * 2)
+        self._mask = len(self._slots) - 1
+        for h in old:
+            if h != EMPTY:
+                self._slots[self._find(h)] = h
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes used by the table."""
+        return len(self._slots) * self._slots.itemsize
+
+
+class BloomFilter:
+    """
+    Bloom filter for URLs with a configurable false-positive rate.
+
+    Args:
+        capacity: Number of URLs the filter is sized for. Adding more raises
+            the false-positive rate above error_rate.
+        error_rate: Target probability that an unseen URL is reported as seen.
+    """
+
+    def __init__(self, capacity: int = 1_000_000, error_rate: float = 0.01):
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate must be between 0 and 1")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(64, math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self._count = 0
+
+    def _positions(self, url: str):
+        # Double hashing: k bit positions from the two halves of one 64-bit hash
+        h = url_hash(url)
+        h1, h2 = h & 0xFFFFFFFF, (h >> 32) | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, url: str) -> bool:
+        """Add a URL; returns True if it was (probably) not present before."""
+        new = False
+        bits = self._bits
+        for pos in self._positions(url):
+            byte, mask = pos >> 3, 1 << (pos & 7)
+            if not bits[byte] & mask:
+                bits[byte] |= mask
+                new = True
+        if new:
+            self._count += 1
+        return new
+
+    def update(self, urls: Iterable[str]) -> None:
+        for url in urls:
+            self.add(url)
+
+    def __contains__(self, url: str) -> bool:
+        bits = self._bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(url))
+
+    def __len__(self) -> int:
+        """Approximate number of distinct URLs added."""
+        return self._count
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes used by the bit array."""
+        return len(self._bits)
@@ -4,29 +4,77 @@ core/utils.py
 Common utility functions for the SEO toolkit.
 """
 
+import re
 import requests
-from bs4 import BeautifulSoup
-from typing import Optional
-import streamlit as st
+from core import http_client
+from core.config import HTML_PARSER, HTTP_CONFIG
+from bs4 import BeautifulSoup, CData, NavigableString
+from typing import Iterable, Optional, Union
 
-def get_page_content(url: str) -> Optional[BeautifulSoup]:
+try:
+    import lxml.html
+except ImportError:
+    lxml = None
+
+PARSER_BACKENDS = ("lxml", "html.parser")
+
+_WHITESPACE = re.compile(r"\s+")
+
+def resolve_parser(backend: Optional[str] = None) -> str:
+    """
+    Return the BeautifulSoup backend to use: the requested one (or HTML_PARSER),
+    falling back to "html.parser" when lxml is not installed.
+    """
+    backend = backend or HTML_PARSER
+    if backend not in PARSER_BACKENDS:
+        raise ValueError(f"Unknown parser backend '{backend}'. Choose one of: {', '.join(PARSER_BACKENDS)}")
+    if backend == "lxml" and lxml is None:
+        return "html.parser"
+    return backend
+
+def make_soup(markup: Union[str, bytes], backend: Optional[str] = None) -> BeautifulSoup:
+    """
+    Parse HTML into a BeautifulSoup tree with the configured backend (lxml by default).
+    """
+    return BeautifulSoup(markup, resolve_parser(backend))
+
+def make_lxml_tree(markup: Union[str, bytes], encoding: Optional[str] = None):
+    """
+    Parse HTML directly into an lxml.html element tree, for tools that only need
+    XPath or CSS selector queries and not the BeautifulSoup API.
+
+    Raises:
+        ImportError: If lxml is not installed.
+    """
+    if lxml is None:
+        raise ImportError("lxml is required for make_lxml_tree()")
+    if isinstance(markup, str):
+        # lxml rejects str input that carries an XML encoding declaration, so always hand it bytes
+        markup, encoding = markup.encode("utf-8"), "utf-8"
+    if not markup.strip():
+        return lxml.html.Element("html")
+    parser = lxml.html.HTMLParser(encoding=encoding) if encoding else None
+    return lxml.html.document_fromstring(markup, parser=parser)
+
+def get_page_content(url: str, timeout: Optional[float] = None) -> Optional[BeautifulSoup]:
     """
     Fetch the HTML content of a URL and return a BeautifulSoup object.
-    Returns None if fetching fails.
+    Returns None if fetching fails. timeout defaults to HTTP_CONFIG["timeout"].
     """
     try:
-        response = requests.get(url, timeout=10)
+        response = http_client.get(url, timeout=timeout or HTTP_CONFIG["timeout"])
         response.raise_for_status()
-        return BeautifulSoup(response.text, "html.parser")
+        return make_soup(response.text)
     except requests.exceptions.RequestException as e:
         return None
 
-def fetch_url(url: str) -> Optional[requests.Response]:
+def fetch_url(url: str, timeout: Optional[float] = None) -> Optional[requests.Response]:
     """
     Fetch a URL and return the requests.Response object or None on error.
+    timeout defaults to HTTP_CONFIG["timeout"].
     """
     try:
-        response = requests.get(url, timeout=10)
+        response = http_client.get(url, timeout=timeout or HTTP_CONFIG["timeout"])
         response.raise_for_status()
         return response
     except requests.exceptions.RequestException:
@@ -35,19 +83,61 @@ def fetch_url(url: str) -> Optional[requests.Response]:
 def get_text_from_html(soup: BeautifulSoup) -> str:
     """
     Extract all visible text from a BeautifulSoup object, removing excess whitespace.
+    Only plain text and CDATA count: script, style and template contents and comments
+    are left out.
     """
-    text = soup.get_text(separator=" ", strip=True)
-    return " ".join(text.split())
+    text = soup.get_text(separator=" ", strip=True, types=(NavigableString, CData))
+    return _WHITESPACE.sub(" ", text)
+
+def get_text_excluding(soup: BeautifulSoup, exclude_tags: Iterable[str] = ("script", "style")) -> str:
+    """
+    Extract text like soup.get_text(separator=" "), skipping strings inside the given tags.
+    Unlike calling decompose() on those tags, this leaves the tree untouched so it can be shared.
+    """
+    excluded = set(exclude_tags)
+    return " ".join(
+        s for s in soup.find_all(string=True)
+        if type(s) in (NavigableString, CData) and s.parent.name not in excluded
+    )
 
 def render_tool_ui(tool_name: str, tool_description: str):
     """
     Render a standard UI for a tool page: title, description, URL input, and a run button.
     Returns the URL if the user hits the button, else None.
     """
+    # Imported here so the tools and the command-line runner never load Streamlit
+    import streamlit as st
+
     st.title(tool_name)
     st.info(tool_description)
     url = st.text_input("Enter URL to analyze")
     run = st.button("Run Analysis")
     if url and run:
         return url
-    return None
\ No newline at end of file
+    return None
+
+
+def streamlit_event_handler():
+    """
+    Return a tool event callback (see BaseTool.subscribe) that shows messages
+    and progress bars on the current Streamlit page.
+
+    Use it on the script thread, around a single run:
+        with tool.subscribed(streamlit_event_handler()):
+            result = tool.run(url)
+    """
+    import streamlit as st
+
+    show = {"info": st.info, "success": st.success, "warning": st.warning, "error": st.error}
+    bars = {}
+
+    def handle(tool, event: str, data: dict) -> None:
+        if event == "message":
+            show.get(data.get("level"), st.info)(data["text"])
+        elif event == "progress":
+            if tool.name not in bars:
+                bars[tool.name] = st.progress(0.0)
+            fraction = data["done"] / data["total"] if data.get("total") else 0.0
+            bars[tool.name].progress(min(fraction, 1.0), text=data.get("text", ""))
+
+    return handle
@@ -1,4 +1,7 @@
 import streamlit as st
+import requests
+from core.document import fetch_document
+from core.utils import streamlit_event_handler
 from tools.meta_title_length_checker.meta_title_length_checker import MetaTitleLengthChecker
 # Example: from tools.h1_tag_extractor.h1_tag_extractor import H1TagExtractor
 
@@ -16,10 +19,22 @@ if st.button("Analyze"):
     if not url:
         st.error("Please enter a valid URL.")
     else:
+        # Fetch the page once and share it with every tool that analyzes pages
+        try:
+            doc = fetch_document(url)
+        except requests.exceptions.RequestException as e:
+            doc = None
+            fetch_error = e
         for tool_name, tool in TOOLS.items():
             with st.expander(tool_name):
                 st.write(f"**Description:** {tool.description}")
-                result = tool.run(url)
+                with tool.subscribed(streamlit_event_handler()):
+                    if not tool.accepts_document:
+                        result = tool.run(url)
+                    elif doc is None:
+                        result = tool.fetch_error(url, fetch_error)
+                    else:
+                        result = tool.run_document(doc)
                 if "error" in result:
                     st.error(result["error"])
                 else:
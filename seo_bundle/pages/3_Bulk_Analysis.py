@@ -1,5 +1,8 @@
 import streamlit as st
 import pandas as pd
+from contextlib import closing
+from core.config import STREAMING_CONFIG
+from core.fetch_engine import FetchEngine
 from tools.meta_title_length_checker.meta_title_length_checker import MetaTitleLengthChecker
 # Add other tools as you implement them
 
@@ -14,6 +17,12 @@ st.title("Bulk Analysis")
 uploaded_file = st.file_uploader("Upload a CSV with a column named 'url'", type=["csv"])
 
 tool_choice = st.selectbox("Choose a tool to run", list(TOOLS.keys()))
+concurrency = st.slider("Concurrent requests", min_value=1, max_value=128, value=32)
+per_host = st.slider("Concurrent requests per host", min_value=1, max_value=64, value=8)
+stream = st.checkbox(
+    f"Streaming mode (for very large pages; reads at most {STREAMING_CONFIG['max_body_bytes'] // (1024 * 1024)} MB per page)",
+    value=False
+)
 
 if uploaded_file:
     try:
@@ -22,14 +31,17 @@ if uploaded_file:
             st.error("CSV must contain a 'url' column.")
         else:
             if st.button("Run Bulk Analysis"):
-                tool = TOOLS[tool_choice]
-                results = []
-                for url in df["url"]:
-                    res = tool.run(url)
-                    results.append({
-                        "url": url,
-                        **{k: v for k, v in res.items() if k != "error"}
-                    })
+                with closing(FetchEngine(concurrency=concurrency, per_host=per_host, stream=stream)) as engine:
+                    urls = df["url"].tolist()
+                    progress = st.progress(0.0)
+                    results = [None] * len(urls)
+                    for done, (index, url, tool_results) in enumerate(engine.run_tools({tool_choice: TOOLS[tool_choice]}, urls), start=1):
+                        res = tool_results[tool_choice]
+                        results[index] = {
+                            "url": url,
+                            **{k: v for k, v in res.items() if k != "error"}
+                        }
+                        progress.progress(done / len(urls), text=f"Analyzed {done} of {len(urls)} URLs")
                 results_df = pd.DataFrame(results)
                 st.dataframe(results_df)
                 csv = results_df.to_csv(index=False).encode('utf-8')
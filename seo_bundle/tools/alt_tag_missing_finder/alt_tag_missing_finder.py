@@ -5,26 +5,26 @@ Finds all <img> tags missing the alt attribute or with empty alt text.
 """
 
 from tools.base_tool import BaseTool
-from core.utils import get_page_content
+from core.document import PageDocument
 
 class AltTagMissingFinder(BaseTool):
+    streamable = True
+
     def __init__(self):
         super().__init__(
             name="Alt Tag Missing Finder",
             description="Finds all images missing alt attribute or with empty alt text."
         )
 
-    def run(self, url: str) -> dict:
+    def run_document(self, doc: PageDocument) -> dict:
         """
         Returns a list of image tags missing alt or with empty alt.
         """
-        soup = get_page_content(url)
-        if not soup:
+        if not doc.ok:
             return {"error": "Could not fetch page content."}
-
         missing = []
-        for img in soup.find_all("img"):
-            if not img.has_attr("alt") or not img["alt"].strip():
+        for img in doc.index.images:
+            if "alt" not in img or not img["alt"].strip():
                 src = img.get("src", "")
                 missing.append({"src": src, "alt": img.get("alt", "")})
 
@@ -4,29 +4,41 @@ Anchor Text Analyzer Tool
 This tool extracts and analyzes all anchor (<a>) tags on a webpage, collecting their anchor text,
 destination URLs, and categorizing anchor texts (empty, generic, branded, etc.).
 Useful for understanding the distribution and quality of link anchor text on the page.
+
+In aggregation mode (an AnchorIndex passed in) every analyzed page is also added to a
+site-wide index of target URL -> anchor text counts; see core/anchor_index.py.
 """
 
+from typing import Optional
 from tools.base_tool import BaseTool
-from core.utils import get_page_content
-from urllib.parse import urlparse, urljoin
+from core.anchor_index import GENERIC_ANCHOR_TEXTS, AnchorIndex
+from core.document import PageDocument
+from core.urls import resolve_url, url_host
 
 class AnchorTextAnalyzer(BaseTool):
-    def __init__(self):
+    streamable = True
+
+    def __init__(self, anchor_index: Optional[AnchorIndex] = None):
         super().__init__(
             name="Anchor Text Analyzer",
             description="Analyzes all anchor (<a>) tags' text and destination URLs on the web page."
         )
+        # Site-wide aggregation; pages analyzed in worker processes are not added to it
+        self.anchor_index = anchor_index
 
-    def run(self, url: str) -> dict:
+    def run_document(self, doc: PageDocument) -> dict:
         """
         Fetch the page, extract all anchor <a> tags, and analyze their anchor text.
         Returns a dict summarizing anchor text types and distribution.
         """
-        soup = get_page_content(url)
-        if not soup:
+        if not doc.ok:
             return {"error": "Could not fetch page content."}
+        # Relative links resolve against the URL the page was served from, after redirects
+        url = doc.final_url
 
-        anchors = soup.find_all("a", href=True)
+        anchors = doc.index.anchors
+        if self.anchor_index is not None:
+            self.anchor_index.add_page(url, anchors)
         total = len(anchors)
         empty_text = []
         generic = []
@@ -35,15 +47,14 @@ class AnchorTextAnalyzer(BaseTool):
         others = []
 
         # Basic lists for generic and branded text
-        generic_texts = {"click here", "more", "read more", "learn more", "here", "this link", "link"}
-        parsed_url = urlparse(url)
-        domain = parsed_url.netloc.lower()
+        generic_texts = GENERIC_ANCHOR_TEXTS
+        domain = url_host(url)
 
         anchor_data = []
 
-        for a in anchors:
-            text = a.get_text(strip=True)
-            href = urljoin(url, a['href'].strip())
+        for raw_href, text in anchors:
+            # Non-HTTP and fragment-only hrefs are reported as written
+            href = resolve_url(url, raw_href) or raw_href.strip()
             anchor_info = {
                 "text": text,
                 "href": href
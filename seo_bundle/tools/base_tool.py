@@ -4,22 +4,105 @@ tools/base_tool.py
 Abstract base class for all SEO tools.
 """
 
-from abc import ABC, abstractmethod
+from abc import ABC
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+import requests
+
+from core.document import PageDocument, fetch_document
+
+# Event callbacks are called as callback(tool, event, data). Events emitted by tools:
+#   "message":  data = {"level": "info" | "success" | "warning" | "error", "text": str}
+#   "progress": data = {"done": int, "total": int, "text": str}
+ToolCallback = Callable[["BaseTool", str, dict], None]
 
 class BaseTool(ABC):
+    # True if run_document() only reads doc.index (plus status and URL), so the tool
+    # also works on documents indexed while streaming (see core/streaming.py).
+    streamable = False
+
     def __init__(self, name: str, description: str):
         self.name = name
         self.description = description
+        self._subscribers = []
 
-    @abstractmethod
-    def run(self, url: str) -> dict:
+    def run(self, url: str, **options) -> dict:
         """
         Execute the tool's logic on a given URL.
 
+        The default implementation fetches the page once and hands it to
+        run_document(). Tools whose input is not a page URL override this.
+
         Args:
             url: The URL of the page to analyze.
+            **options: Tool-specific options forwarded to run_document().
+
+        Returns:
+            A dictionary containing the results of the analysis.
+        """
+        try:
+            doc = fetch_document(url)
+        except requests.exceptions.RequestException as e:
+            return self.fetch_error(url, e)
+        return self.run_document(doc, **options)
+
+    def run_document(self, doc: PageDocument, **options) -> dict:
+        """
+        Execute the tool's logic on an already fetched page.
+
+        Args:
+            doc: The fetched page, shared with any other tool analyzing it.
 
         Returns:
             A dictionary containing the results of the analysis.
         """
-        pass
\ No newline at end of file
+        raise NotImplementedError(f"{self.name} does not analyze fetched pages.")
+
+    def fetch_error(self, url: str, error: Exception) -> dict:
+        """
+        Result returned by run() when the page could not be downloaded.
+        """
+        return {"error": "Could not fetch page content."}
+
+    def subscribe(self, callback: ToolCallback) -> None:
+        """
+        Register a callback for this tool's progress and message events.
+
+        Tools never talk to a UI themselves; a Streamlit page (or any other
+        caller) subscribes here instead. Callbacks run on the thread that
+        emits the event.
+        """
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: ToolCallback) -> None:
+        """Remove a callback registered with subscribe()."""
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    @contextmanager
+    def subscribed(self, callback: ToolCallback) -> Iterator["BaseTool"]:
+        """Subscribe a callback for the duration of a with block."""
+        self.subscribe(callback)
+        try:
+            yield self
+        finally:
+            self.unsubscribe(callback)
+
+    def emit(self, event: str, **data) -> None:
+        """Send an event to every subscriber; a no-op when nobody is listening."""
+        if not self._subscribers:
+            return
+        for callback in list(self._subscribers):
+            callback(self, event, data)
+
+    def __getstate__(self) -> dict:
+        # Subscribers usually hold UI objects; a tool sent to a worker process goes without them
+        state = self.__dict__.copy()
+        state["_subscribers"] = []
+        return state
+
+    @property
+    def accepts_document(self) -> bool:
+        """True if this tool can analyze a shared PageDocument."""
+        return type(self).run_document is not BaseTool.run_document
@@ -4,76 +4,119 @@ tools/broken_link_checker/broken_link_checker.py
 Broken Link Checker Tool.
 """
 
-import streamlit as st
+import threading
+import time
 import requests
-from bs4 import BeautifulSoup, SoupStrainer
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from core import http_client
+from core.document import PageDocument
+from core.urls import url_host
 from tools.base_tool import BaseTool
 
 class BrokenLinkChecker(BaseTool):
-    def __init__(self):
+    streamable = True
+
+    def __init__(self, max_workers: int = 16, per_host: int = 4, timeout: float = 5):
         super().__init__(
             name="Broken Link Checker",
             description="Scans a page for broken internal and external links."
         )
+        self.max_workers = max_workers
+        self.per_host = per_host
+        self.timeout = timeout
 
-    def run(self, url: str) -> dict:
+    def run_document(self, doc: PageDocument) -> dict:
         """
         Scans a page for broken links.
+
+        Identical hrefs are checked once. Links are checked concurrently with a bounded
+        worker pool and at most `per_host` requests in flight per host, so each host's
+        keep-alive pool is reused instead of opening new connections.
         """
-        st.text("BrokenLinkChecker tool is running...") # Added for debugging
-        broken_links = []
-        try:
-            st.info(f"Fetching content from: {url}")
-            response = requests.get(url, timeout=10)
-            if response.status_code != 200:
-                return {
-                    "status": "Error",
-                    "message": f"Could not fetch page content. Status code: {response.status_code}"
-                }
-            
-            # Parse only the links from the HTML to save time and resources
-            links_only = SoupStrainer('a')
-            soup = BeautifulSoup(response.text, 'html.parser', parse_only=links_only)
-            
-            for link in soup.find_all('a', href=True):
-                href = link['href']
-                # Ignore mailto, javascript, and other non-HTTP links
-                if href.startswith('http'):
-                    try:
-                        st.text(f"Checking link: {href}")
-                        link_response = requests.head(href, timeout=5, allow_redirects=True)
-                        if link_response.status_code >= 400:
-                            broken_links.append({
-                                "url": href,
-                                "status_code": link_response.status_code
-                            })
-                    except requests.exceptions.RequestException as e:
-                        broken_links.append({
-                            "url": href,
-                            "status_code": "Error",
-                            "error_message": str(e)
-                        })
-            
-            if not broken_links:
-                return {
-                    "status": "Success",
-                    "message": "No broken links found on the page."
-                }
-            else:
-                return {
-                    "status": "Warning",
-                    "message": f"Found {len(broken_links)} broken links.",
-                    "broken_links": broken_links
-                }
-        
-        except requests.exceptions.RequestException as e:
+        if doc.status_code != 200:
             return {
                 "status": "Error",
-                "message": f"An error occurred while fetching the page: {e}"
+                "message": f"Could not fetch page content. Status code: {doc.status_code}"
             }
 
+        # Ignore mailto, javascript, and other non-HTTP links; keep first-seen order
+        hrefs = list(dict.fromkeys(
+            href for href, _ in doc.index.anchors if href.startswith('http')
+        ))
+
+        # Group by host so requests to the same host are issued back to back
+        by_host = defaultdict(list)
+        for href in hrefs:
+            by_host[url_host(href)].append(href)
+        host_limits = {host: threading.BoundedSemaphore(self.per_host) for host in by_host}
+        ordered = [(host, href) for host, links in by_host.items() for href in links]
+
+        checked = []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [executor.submit(self._check_link, href, host_limits[host]) for host, href in ordered]
+            # Progress is emitted from the calling thread, so subscribers never run on a worker
+            for done, future in enumerate(as_completed(futures), start=1):
+                result = future.result()
+                checked.append(result)
+                self.emit("progress", done=done, total=len(futures), text=f"Checked {result['url']}")
+
+        # Report in page order
+        position = {href: i for i, href in enumerate(hrefs)}
+        checked.sort(key=lambda result: position[result["url"]])
+        broken_links = [
+            result for result in checked
+            if result["status_code"] == "Error" or result["status_code"] >= 400
+        ]
+        checked_links = [
+            {"url": r["url"], "status_code": r["status_code"], "latency_ms": r["latency_ms"]} for r in checked
+        ]
+
+        if not broken_links:
+            return {
+                "status": "Success",
+                "message": "No broken links found on the page.",
+                "checked_links": checked_links
+            }
+        else:
+            return {
+                "status": "Warning",
+                "message": f"Found {len(broken_links)} broken links.",
+                "broken_links": broken_links,
+                "checked_links": checked_links
+            }
+
+    def _check_link(self, href: str, host_limit: threading.BoundedSemaphore) -> dict:
+        """
+        Check one link and return its status code and latency.
+        Falls back to a streamed GET, closed after the headers, when the server rejects HEAD.
+        """
+        with host_limit:
+            start = time.perf_counter()
+            try:
+                response = http_client.head_or_get(href, timeout=self.timeout, allow_redirects=True)
+                status_code = response.status_code
+                error_message = None
+            except requests.exceptions.RequestException as e:
+                status_code = "Error"
+                error_message = str(e)
+            latency_ms = round((time.perf_counter() - start) * 1000, 1)
+
+        result = {"url": href, "status_code": status_code, "latency_ms": latency_ms}
+        if error_message is not None:
+            result["error_message"] = error_message
+        return result
+
+    def fetch_error(self, url: str, error: Exception) -> dict:
+        return {
+            "status": "Error",
+            "message": f"An error occurred while fetching the page: {error}"
+        }
+
 # Streamlit UI (for testing or as a standalone tool page)
 if __name__ == "__main__":
+    import streamlit as st
+
     st.title("Broken Link Checker")
     st.write("Enter a URL to scan for broken links.")
     url = st.text_input("Enter URL", placeholder="https://www.example.com")
@@ -6,26 +6,27 @@ It helps ensure canonicalization is set for SEO best practices.
 """
 
 from tools.base_tool import BaseTool
-from core.utils import get_page_content
+from core.document import PageDocument
 
 class CanonicalTagChecker(BaseTool):
+    streamable = True
+
     def __init__(self):
         super().__init__(
             name="Canonical Tag Checker",
             description="Checks for the presence and value of the canonical link tag."
         )
 
-    def run(self, url: str) -> dict:
+    def run_document(self, doc: PageDocument) -> dict:
         """
         Fetch the page, extract the canonical tag, and provide its value.
         Returns a dict with the canonical URL (if any) and a status message.
         """
-        soup = get_page_content(url)
-        if not soup:
+        if not doc.ok:
             return {"error": "Could not fetch page content."}
-
-        tag = soup.find("link", rel="canonical")
-        canonical_url = tag["href"].strip() if tag and tag.has_attr("href") else ""
+        canonical_links = doc.index.links_with_rel("canonical")
+        tag = canonical_links[0] if canonical_links else None
+        canonical_url = tag["href"].strip() if tag and "href" in tag else ""
 
         if canonical_url:
             status = "Found"
@@ -4,9 +4,8 @@ tools/css_minifier/css_minifier.py
 CSS Minifier Tool.
 """
 
-import streamlit as st
-import requests
 import cssmin
+from core.document import PageDocument
 from tools.base_tool import BaseTool
 
 class CssMinifier(BaseTool):
@@ -16,17 +15,18 @@ class CssMinifier(BaseTool):
             description="Minifies CSS content to reduce file size and improve page load time."
         )
 
-    def run(self, url: str) -> dict:
+    def run_document(self, doc: PageDocument) -> dict:
         """
         Minifies the CSS content from a given URL.
         """
-        st.text("CssMinifier tool is running...")
         try:
-            st.info(f"Fetching content from: {url}")
-            response = requests.get(url, timeout=10)
-            response.raise_for_status() # Raise an exception for bad status codes
+            if not doc.ok:
+                return {
+                    "status": "Error",
+                    "message": f"An error occurred while fetching the page: HTTP {doc.status_code}"
+                }
 
-            original_css = response.text
+            original_css = doc.text
             minified_css = cssmin.cssmin(original_css)
 
             if not minified_css:
@@ -43,19 +43,22 @@ class CssMinifier(BaseTool):
                 "reduction_percent": (1 - (len(minified_css) / len(original_css))) * 100,
                 "minified_css": minified_css
             }
-        except requests.exceptions.RequestException as e:
-            return {
-                "status": "Error",
-                "message": f"An error occurred while fetching the page: {e}"
-            }
         except Exception as e:
             return {
                 "status": "Error",
                 "message": f"An unexpected error occurred: {e}"
             }
 
+    def fetch_error(self, url: str, error: Exception) -> dict:
+        return {
+            "status": "Error",
+            "message": f"An error occurred while fetching the page: {error}"
+        }
+
 # Streamlit UI (for testing or as a standalone tool page)
 if __name__ == "__main__":
+    import streamlit as st
+
     st.title("CSS Minifier")
     st.write("Enter a URL to minify its CSS content.")
     url = st.text_input("Enter URL", placeholder="https://www.example.com/styles.css")
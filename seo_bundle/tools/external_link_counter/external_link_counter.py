@@ -6,43 +6,37 @@ on a web page. It helps you analyze your outbound linking structure for SEO.
 """
 
 from tools.base_tool import BaseTool
-from core.utils import get_page_content
-from urllib.parse import urlparse, urljoin
+from core.document import PageDocument
+from core.urls import resolve_url, url_host
 
 class ExternalLinkCounter(BaseTool):
+    streamable = True
+
     def __init__(self):
         super().__init__(
             name="External Link Counter",
             description="Counts the number of external links on the web page."
         )
 
-    def run(self, url: str) -> dict:
+    def run_document(self, doc: PageDocument) -> dict:
         """
         Fetch the page, parse all <a> tags, and count how many are external links.
         Returns a dict with the total external link count and a sample list.
         """
-        soup = get_page_content(url)
-        if not soup:
+        if not doc.ok:
             return {"error": "Could not fetch page content."}
+        # Relative URLs resolve against the URL the page was served from, after redirects
+        url = doc.final_url
 
-        parsed_url = urlparse(url)
-        base_domain = parsed_url.netloc
+        page_host = url_host(url)
 
         external_links = []
 
-        for a in soup.find_all("a", href=True):
-            href = a["href"].strip()
-            # Ignore empty, anchor, or javascript links
-            if not href or href.startswith("#") or href.lower().startswith("javascript:"):
-                continue
-
-            # Normalize link
-            full_url = urljoin(url, href)
-            parsed_link = urlparse(full_url)
-
-            # External if it has a netloc and it's not the base domain
-            if parsed_link.netloc and parsed_link.netloc != base_domain:
-                external_links.append(full_url)
+        for raw_href, _ in doc.index.anchors:
+            # Resolved against the page; empty, fragment-only and non-HTTP links give None
+            link = resolve_url(url, raw_href)
+            if link is not None and url_host(link) != page_host:
+                external_links.append(link)
 
         # Remove duplicates, keep order
         seen = set()
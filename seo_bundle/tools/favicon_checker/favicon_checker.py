@@ -7,24 +7,28 @@ It also tries common fallback file locations if no tag is found.
 """
 
 from tools.base_tool import BaseTool
-from core.utils import get_page_content, fetch_url
-from urllib.parse import urljoin, urlparse
+from core.document import PageDocument
+from core.utils import fetch_url
+from core.urls import resolve_url, url_origin
 
 class FaviconChecker(BaseTool):
+    streamable = True
+
     def __init__(self):
         super().__init__(
             name="Favicon Checker",
             description="Checks for the presence and accessibility of favicon on the web page."
         )
 
-    def run(self, url: str) -> dict:
+    def run_document(self, doc: PageDocument) -> dict:
         """
         Checks HTML for favicon link tags, and tests typical fallback favicon locations.
         Returns a dict with favicon URLs found and their HTTP status.
         """
-        soup = get_page_content(url)
-        if not soup:
+        if not doc.ok:
             return {"error": "Could not fetch page content."}
+        # Relative URLs resolve against the URL the page was served from, after redirects
+        url = doc.final_url
 
         favicon_urls = []
 
@@ -38,17 +42,15 @@ class FaviconChecker(BaseTool):
         ]
         # Extract favicon URLs from <link rel=...> tags
         for rel in rels:
-            tag = soup.find("link", rel=lambda x: x and rel in x.lower())
-            if tag and tag.has_attr("href"):
-                favicon_url = urljoin(url, tag["href"].strip())
-                if favicon_url not in favicon_urls:
+            tag = next((link for link in doc.index.links if rel in " ".join(link.get("rel", "").split()).lower()), None)
+            if tag and "href" in tag:
+                favicon_url = resolve_url(url, tag["href"])
+                if favicon_url and favicon_url not in favicon_urls:
                     favicon_urls.append(favicon_url)
 
         # If no favicon found in HTML, try the default /favicon.ico
         if not favicon_urls:
-            parsed = urlparse(url)
-            root = f"{parsed.scheme}://{parsed.netloc}"
-            favicon_urls.append(urljoin(root, "/favicon.ico"))
+            favicon_urls.append(url_origin(url) + "/favicon.ico")
 
         # Check accessibility for each favicon URL
         results = []
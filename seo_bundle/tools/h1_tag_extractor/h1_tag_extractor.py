@@ -6,26 +6,25 @@ parses it, and returns a list of all H1 headings found.
 """
 
 from tools.base_tool import BaseTool
-from core.utils import get_page_content
+from core.document import PageDocument
 
 class H1TagExtractor(BaseTool):
+    streamable = True
+
     def __init__(self):
         super().__init__(
             name="H1 Tag Extractor",
             description="Extracts and displays all H1 tags from the web page."
         )
 
-    def run(self, url: str) -> dict:
+    def run_document(self, doc: PageDocument) -> dict:
         """
         Fetch the page, find all <h1> tags, and return their contents.
         Returns a dict with the list of H1 tags and count.
         """
-        soup = get_page_content(url)
-        if not soup:
+        if not doc.ok:
             return {"error": "Could not fetch page content."}
-
-        h1_tags = soup.find_all('h1')
-        h1_texts = [tag.get_text(strip=True) for tag in h1_tags]
+        h1_texts = [text for level, text in doc.index.headings if level == 1]
 
         return {
             "h1_tags": h1_texts,
@@ -6,36 +6,34 @@ It helps you identify heading hierarchy issues, missing headings, and provides a
 """
 
 from tools.base_tool import BaseTool
-from core.utils import get_page_content
+from core.document import PageDocument
 
 class HeadingTagStructureAnalyzer(BaseTool):
+    streamable = True
+
     def __init__(self):
         super().__init__(
             name="Heading Tag Structure Analyzer (H1–H6)",
             description="Analyzes and summarizes the usage and structure of H1–H6 tags on a web page."
         )
 
-    def run(self, url: str) -> dict:
+    def run_document(self, doc: PageDocument) -> dict:
         """
         Fetch the page, extract all H1–H6 tags, and analyze their structure.
         Returns a dict with counts, structure order, and potential issues.
         """
-        soup = get_page_content(url)
-        if not soup:
+        if not doc.ok:
             return {"error": "Could not fetch page content."}
-
-        heading_tags = ["h1", "h2", "h3", "h4", "h5", "h6"]
-        heading_counts = {tag.upper(): 0 for tag in heading_tags}
+        heading_counts = {f"H{level}": 0 for level in range(1, 7)}
         heading_order = []
         headings_detail = []
 
-        # Collect heading counts, order, and text
-        for tag in heading_tags:
-            for el in soup.find_all(tag):
-                text = el.get_text(strip=True)
-                heading_counts[tag.upper()] += 1
-                heading_order.append(tag.upper())
-                headings_detail.append({"level": tag.upper(), "text": text})
+        # Collect heading counts, order, and text in document order
+        for level, text in doc.index.headings:
+            tag = f"H{level}"
+            heading_counts[tag] += 1
+            heading_order.append(tag)
+            headings_detail.append({"level": tag, "text": text})
 
         # Analyze for issues
         issues = []
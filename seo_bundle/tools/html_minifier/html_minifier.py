@@ -4,9 +4,7 @@ tools/html_minifier/html_minifier.py
 HTML Minifier Tool.
 """
 
-import streamlit as st
-import requests
-from bs4 import BeautifulSoup
+from core.document import PageDocument
 from tools.base_tool import BaseTool
 
 class HtmlMinifier(BaseTool):
@@ -16,41 +14,44 @@ class HtmlMinifier(BaseTool):
             description="Minifies HTML content to reduce file size and improve page load time."
         )
 
-    def run(self, url: str) -> dict:
+    def run_document(self, doc: PageDocument) -> dict:
         """
         Minifies the HTML content of a given URL.
         """
-        st.text("HtmlMinifier tool is running...")
         try:
-            st.info(f"Fetching content from: {url}")
-            response = requests.get(url, timeout=10)
-            response.raise_for_status() # Raise an exception for bad status codes (4xx or 5xx)
+            if not doc.ok:
+                return {
+                    "status": "Error",
+                    "message": f"An error occurred while fetching the page: HTTP {doc.status_code}"
+                }
 
-            # Use BeautifulSoup to parse the HTML and then get the minified version
-            soup = BeautifulSoup(response.text, 'html.parser')
-            minified_html = str(soup)
+            # Use the shared parse tree and serialize it back as the minified version
+            minified_html = str(doc.soup)
 
             return {
                 "status": "Success",
                 "message": "HTML minified successfully.",
-                "original_size": len(response.text),
+                "original_size": len(doc.text),
                 "minified_size": len(minified_html),
-                "reduction_percent": (1 - (len(minified_html) / len(response.text))) * 100,
+                "reduction_percent": (1 - (len(minified_html) / len(doc.text))) * 100,
                 "minified_html": minified_html
             }
-        except requests.exceptions.RequestException as e:
-            return {
-                "status": "Error",
-                "message": f"An error occurred while fetching the page: {e}"
-            }
         except Exception as e:
             return {
                 "status": "Error",
                 "message": f"An unexpected error occurred: {e}"
             }
 
+    def fetch_error(self, url: str, error: Exception) -> dict:
+        return {
+            "status": "Error",
+            "message": f"An error occurred while fetching the page: {error}"
+        }
+
 # Streamlit UI (for testing or as a standalone tool page)
 if __name__ == "__main__":
+    import streamlit as st
+
     st.title("HTML Minifier")
     st.write("Enter a URL to minify its HTML content.")
     url = st.text_input("Enter URL", placeholder="https://www.example.com")
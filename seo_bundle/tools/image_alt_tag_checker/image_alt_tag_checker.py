@@ -6,26 +6,26 @@ alt attributes or have empty alt attributes. Useful for accessibility and SEO.
 """
 
 from tools.base_tool import BaseTool
-from core.utils import get_page_content
+from core.document import PageDocument
 
 class ImageAltTagChecker(BaseTool):
+    streamable = True
+
     def __init__(self):
         super().__init__(
             name="Image Alt Tag Checker",
             description="Checks all images for missing or empty alt attributes."
         )
 
-    def run(self, url: str) -> dict:
+    def run_document(self, doc: PageDocument) -> dict:
         """
         Fetch the page, extract all <img> tags, and report images missing alt attributes
         or with empty alt attributes.
         Returns a dict summarizing the results.
         """
-        soup = get_page_content(url)
-        if not soup:
+        if not doc.ok:
             return {"error": "Could not fetch page content."}
-        
-        img_tags = soup.find_all('img')
+        img_tags = doc.index.images
         total_imgs = len(img_tags)
         missing_alt = []
         empty_alt = []
@@ -4,9 +4,8 @@ tools/js_minifier/js_minifier.py
 JS Minifier Tool.
 """
 
-import streamlit as st
-import requests
 import jsmin
+from core.document import PageDocument
 from tools.base_tool import BaseTool
 
 class JsMinifier(BaseTool):
@@ -16,17 +15,18 @@ class JsMinifier(BaseTool):
             description="Minifies JavaScript content to reduce file size and improve page load time."
         )
 
-    def run(self, url: str) -> dict:
+    def run_document(self, doc: PageDocument) -> dict:
         """
         Minifies the JavaScript content from a given URL.
         """
-        st.text("JsMinifier tool is running...")
         try:
-            st.info(f"Fetching content from: {url}")
-            response = requests.get(url, timeout=10)
-            response.raise_for_status() # Raise an exception for bad status codes
+            if not doc.ok:
+                return {
+                    "status": "Error",
+                    "message": f"An error occurred while fetching the page: HTTP {doc.status_code}"
+                }
 
-            original_js = response.text
+            original_js = doc.text
             minified_js = jsmin.jsmin(original_js)
 
             if not minified_js:
@@ -43,19 +43,22 @@ class JsMinifier(BaseTool):
                 "reduction_percent": (1 - (len(minified_js) / len(original_js))) * 100,
                 "minified_js": minified_js
             }
-        except requests.exceptions.RequestException as e:
-            return {
-                "status": "Error",
-                "message": f"An error occurred while fetching the page: {e}"
-            }
         except Exception as e:
             return {
                 "status": "Error",
                 "message": f"An unexpected error occurred: {e}"
             }
 
+    def fetch_error(self, url: str, error: Exception) -> dict:
+        return {
+            "status": "Error",
+            "message": f"An error occurred while fetching the page: {error}"
+        }
+
 # Streamlit UI (for testing or as a standalone tool page)
 if __name__ == "__main__":
+    import streamlit as st
+
     st.title("JS Minifier")
     st.write("Enter a URL to minify its JavaScript content.")
     url = st.text_input("Enter URL", placeholder="https://www.example.com/script.js")
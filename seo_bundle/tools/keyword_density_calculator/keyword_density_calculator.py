@@ -4,11 +4,17 @@ Keyword Density Calculator Tool
 This tool calculates the density of each word (or a user-supplied keyword)
 on a given web page. It fetches the HTML content, extracts visible text,
 tokenizes, and computes word frequencies and density percentages.
+
+run_many() analyzes a whole set of pages (e.g. a crawled site) at once and
+also reports each page's most distinctive words: those frequent on the page
+but rare across the set (TF-IDF, see core/tfidf.py).
 """
 
+from typing import Iterable, List
+
 from tools.base_tool import BaseTool
-from core.utils import get_page_content, get_text_from_html
-import re
+from core.document import PageDocument
+from core.tfidf import TermMatrixBuilder
 from collections import Counter
 
 class KeywordDensityCalculator(BaseTool):
@@ -18,24 +24,21 @@ class KeywordDensityCalculator(BaseTool):
             description="Calculates the frequency and density of words (or a keyword) on a page."
         )
 
-    def run(self, url: str, keyword: str = None) -> dict:
+    def run_document(self, doc: PageDocument, keyword: str = None) -> dict:
         """
         Analyze the page for keyword density.
 
         Args:
-            url (str): The URL of the webpage to analyze.
+            doc (PageDocument): The fetched webpage to analyze.
             keyword (str, optional): A specific keyword to check density for. If None, returns density for all words.
 
         Returns:
             dict: Results including word counts, total words, and density percentage.
         """
-        soup = get_page_content(url)
-        if not soup:
+        if not doc.ok:
             return {"error": "Could not fetch page content."}
 
-        text = get_text_from_html(soup).lower()
-        # Basic tokenization: split on non-alphanumeric, ignore very short words (<2 chars)
-        words = [w for w in re.findall(r'\b\w+\b', text) if len(w) > 1]
+        words = doc.page_text.tokens
         total_words = len(words)
 
         if total_words == 0:
@@ -65,4 +68,32 @@ class KeywordDensityCalculator(BaseTool):
                 "total_words": total_words,
                 "top_words": density_list,
                 "message": "Top 10 most frequent words and their density on the page."
-            }
\ No newline at end of file
+            }
+
+    def run_many(self, docs: Iterable[PageDocument], top: int = 10) -> List[dict]:
+        """
+        Analyze many pages together, in one shared vocabulary.
+
+        Returns one result per document, in input order: the fields of run_document()
+        plus "url" and "distinctive_words" (highest TF-IDF across the set, with the
+        number of pages each word appears on).
+        """
+        builder = TermMatrixBuilder()
+        errors = {}
+        for i, doc in enumerate(docs):
+            if not doc.ok:
+                errors[i] = {"url": doc.url, "error": "Could not fetch page content."}
+                builder.add_tokens(doc.url, [])
+            else:
+                builder.add_tokens(doc.url, doc.page_text.tokens)
+
+        results = []
+        for i, row in enumerate(builder.build().report(top=top)):
+            if i in errors:
+                results.append(errors[i])
+            elif not row["total_words"]:
+                results.append({"url": row["url"], "error": "No text found on the page."})
+            else:
+                row["message"] = f"Top {top} most frequent and most distinctive words on the page."
+                results.append(row)
+        return results
@@ -4,43 +4,62 @@ Keyword Position Estimator Tool
 Estimates the position (ranking) of a keyword in the page content by order of appearance.
 """
 
+from typing import Iterable, List, Optional
+
 from tools.base_tool import BaseTool
-from core.utils import get_page_content
-import re
+from core.document import PageDocument
 
 class KeywordPositionEstimator(BaseTool):
-    def __init__(self):
+    def __init__(self, keywords: Optional[List[str]] = None):
         super().__init__(
             name="Keyword Position Estimator",
             description="Estimates position of a keyword in the page's text (order of appearance)."
         )
+        # Looked up when run_document() is given no keyword (e.g. in a batch run, set by --keyword)
+        self.keywords = list(keywords) if keywords else None
 
-    def run(self, url: str) -> dict:
+    def run(self, url: str, keywords: Optional[List[str]] = None) -> dict:
         """
-        Expects 'keyword|||url' in the url parameter for this tool.
+        Expects 'keyword|||url' in the url parameter for this tool, or the plain
+        page URL with the keywords passed as a list in keywords (or set on the tool).
         Returns list of positions (zero-indexed word number where keyword appears).
         """
+        if keywords is not None:
+            return super().run(url, keywords=list(keywords))
+        if self.keywords and "|||" not in url:
+            return super().run(url)
         try:
             keyword, page_url = url.split("|||")
-            keyword = keyword.strip().lower()
         except Exception:
             return {"error": "Input must be 'keyword|||url'"}
 
-        soup = get_page_content(page_url)
-        if not soup:
-            return {"error": "Could not fetch page content."}
+        return super().run(page_url, keyword=keyword)
 
-        for script in soup(["script", "style"]):
-            script.decompose()
-        text = soup.get_text(separator=" ")
-        text = re.sub(r'[^\w\s]', '', text).lower()
-        words = text.split()
+    def run_document(self, doc: PageDocument, keyword: str = "", keywords: Optional[Iterable[str]] = None) -> dict:
+        """
+        Returns the positions of the keyword (one or more words) in an already
+        fetched page, its first position and whether the title and headings
+        contain it. With keywords, returns one such result per keyword. Without
+        either, the keywords set on the tool are used.
+        """
+        if not keyword and keywords is None:
+            keywords = self.keywords
+            if keywords is None:
+                return {"error": "No keyword given (pass keyword or keywords, or --keyword on the command line)."}
+        if not doc.ok:
+            return {"error": "Could not fetch page content."}
 
-        positions = [i for i, w in enumerate(words) if w == keyword]
+        index = doc.keyword_index
+        if keywords is not None:
+            results: List[dict] = [self._result(hit) for hit in index.lookup_many(keywords)]
+            found = sum(1 for hit in results if hit["occurrences"])
+            return {
+                "keywords": results,
+                "found": found,
+                "message": f"{found} of {len(results)} keyword(s) found in the page text."
+            }
+        return self._result(index.lookup(keyword))
 
-        return {
-            "keyword": keyword,
-            "positions": positions,
-            "occurrences": len(positions),
-            "message": f"Keyword '{keyword}' found {len(positions)} time(s)."
-        }
\ No newline at end of file
+    def _result(self, hit: dict) -> dict:
+        hit["message"] = f"Keyword '{hit['keyword']}' found {hit['occurrences']} time(s)."
+        return hit
@@ -4,38 +4,46 @@ Link Redirect Checker Tool
 Checks if a given URL or its links perform any redirects, and reports the redirect chain.
 """
 
+from typing import Iterable, List, Optional
+
 from tools.base_tool import BaseTool
-import requests
+from core.redirects import RedirectChain, RedirectResolver
 
 class LinkRedirectChecker(BaseTool):
-    def __init__(self):
+    def __init__(self, resolver: Optional[RedirectResolver] = None):
         super().__init__(
             name="Link Redirect Checker",
             description="Checks if the URL performs redirects and returns the redirect chain."
         )
+        # Hops are cached in the resolver, so URLs sharing redirects are only requested once
+        self.resolver = resolver or RedirectResolver(timeout=15)
 
     def run(self, url: str) -> dict:
         """
-        Follows redirects for the given URL and returns the chain.
+        Follows redirects for the given URL hop by hop (HEAD requests, no bodies)
+        and returns the chain.
+        """
+        return self._result(self.resolver.resolve(url))
+
+    def run_many(self, urls: Iterable[str]) -> List[dict]:
         """
-        try:
-            response = requests.get(url, allow_redirects=True, timeout=15)
-            history = response.history
-            chain = []
-            for resp in history:
-                chain.append({
-                    "url": resp.url,
-                    "status_code": resp.status_code
-                })
-            # Add the final destination
-            chain.append({
-                "url": response.url,
-                "status_code": response.status_code
-            })
-            message = f"Redirect chain has {len(chain)-1} redirect(s)." if len(chain) > 1 else "No redirects detected."
-            return {
-                "redirect_chain": chain,
-                "message": message
-            }
-        except Exception as e:
-            return {"error": str(e), "message": "Failed to check redirects."}
\ No newline at end of file
+        Checks many URLs concurrently; one result per URL, in input order.
+        """
+        return [self._result(chain) for chain in self.resolver.resolve_many(urls)]
+
+    def _result(self, chain: RedirectChain) -> dict:
+        if chain.error is not None and len(chain.hops) == 1:
+            return {"error": chain.error, "message": "Failed to check redirects."}
+        redirects = chain.redirects
+        if chain.loop:
+            message = f"Redirect loop detected after {redirects} redirect(s)."
+        elif chain.too_long:
+            message = f"Too many redirects: gave up after following {len(chain.hops) - 1}."
+        elif chain.error is not None:
+            message = f"Redirect chain has {redirects} redirect(s); the last one failed."
+        else:
+            message = f"Redirect chain has {redirects} redirect(s)." if redirects else "No redirects detected."
+        result = chain.to_dict()
+        del result["url"]
+        result["message"] = message
+        return result
@@ -7,30 +7,25 @@ the length and quality of the description.
 """
 
 from tools.base_tool import BaseTool
-from core.utils import get_page_content
-from bs4 import BeautifulSoup
-from typing import Optional
+from core.document import PageDocument
 
 class MetaDescriptionLengthChecker(BaseTool):
+    streamable = True
+
     def __init__(self):
         super().__init__(
             name="Meta Description Length Checker",
             description="Analyzes a page's meta description for optimal length (120-155 characters)."
         )
 
-    def run(self, url: str) -> dict:
+    def run_document(self, doc: PageDocument) -> dict:
         """
         Fetch the page, find the meta description, and check its length.
         Returns a dict with the description, its length, and a status message.
         """
-        soup = get_page_content(url)
-        if not soup:
+        if not doc.ok:
             return {"error": "Could not fetch page content."}
-
-        meta_desc_tag: Optional[BeautifulSoup] = soup.find('meta', attrs={'name': 'description'})
-        description: str = ""
-        if meta_desc_tag:
-            description = meta_desc_tag.get('content', '').strip()
+        description: str = (doc.index.meta_content(name='description') or "").strip()
 
         length: int = len(description)
 
@@ -4,25 +4,23 @@ tools/meta_title_length_checker/meta_title_length_checker.py
 Meta Title Length Checker Tool.
 """
 
-import streamlit as st
 from tools.base_tool import BaseTool
-from core.utils import get_page_content
+from core.document import PageDocument
 
 class MetaTitleLengthChecker(BaseTool):
+    streamable = True
+
     def __init__(self):
         super().__init__(
             name="Meta Title Length Checker",
             description="Analyzes a page's meta title for optimal length (30-60 characters)."
         )
 
-    def run(self, url: str) -> dict:
-        soup = get_page_content(url)
-        if not soup:
-            st.error("Could not fetch page content.")
+    def run_document(self, doc: PageDocument) -> dict:
+        if not doc.ok:
             return {"error": "Could not fetch page content."}
 
-        title_tag = soup.find('title')
-        title = title_tag.text.strip() if title_tag else ""
+        title = (doc.index.title or "").strip()
         length = len(title)
 
         if not title:
@@ -44,6 +42,8 @@ class MetaTitleLengthChecker(BaseTool):
 # Streamlit UI (for testing or as a standalone tool page)
 # This line has been corrected to use a standard Python check.
 if __name__ == "__main__":
+    import streamlit as st
+
     st.title("Meta Title Length Checker")
     st.write("Analyze the meta title length of any web page for optimal SEO.")
     url = st.text_input("Enter URL to analyze")
@@ -6,26 +6,26 @@ of mobile responsiveness.
 """
 
 from tools.base_tool import BaseTool
-from core.utils import get_page_content
+from core.document import PageDocument
 
 class MobileResponsiveCheck(BaseTool):
+    streamable = True
+
     def __init__(self):
         super().__init__(
             name="Mobile Responsive Check",
             description="Checks if the page includes a viewport meta tag for mobile responsiveness."
         )
 
-    def run(self, url: str) -> dict:
+    def run_document(self, doc: PageDocument) -> dict:
         """
         Checks for the viewport meta tag in the page's <head>.
         Returns a dict indicating presence and the tag's content value.
         """
-        soup = get_page_content(url)
-        if not soup:
+        if not doc.ok:
             return {"error": "Could not fetch page content."}
-
-        meta = soup.find("meta", attrs={"name": "viewport"}) or soup.find("meta", attrs={"name": "Viewport"})
-        if meta and meta.has_attr("content"):
+        meta = doc.index.meta_by_name.get("viewport") or doc.index.meta_by_name.get("Viewport")
+        if meta and "content" in meta:
             content = meta["content"]
             message = f"Viewport meta tag found: {content}"
             is_responsive = True
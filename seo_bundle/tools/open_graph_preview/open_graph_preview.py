@@ -5,30 +5,26 @@ Returns the core OG tags for visual preview in a card-style interface.
 """
 
 from tools.base_tool import BaseTool
-from core.utils import get_page_content
+from core.document import PageDocument
 
 class OpenGraphPreview(BaseTool):
+    streamable = True
+
     def __init__(self):
         super().__init__(
             name="Open Graph Preview",
             description="Returns key OG tags for visual preview card."
         )
 
-    def run(self, url: str) -> dict:
+    def run_document(self, doc: PageDocument) -> dict:
         """
         Extracts og:title, og:description, og:image, and og:url for preview.
         """
-        soup = get_page_content(url)
-        if not soup:
+        if not doc.ok:
             return {"error": "Could not fetch page content."}
-
         og_data = {}
         for prop in ["og:title", "og:description", "og:image", "og:url"]:
-            tag = soup.find("meta", property=prop)
-            if tag and tag.has_attr("content"):
-                og_data[prop] = tag["content"]
-            else:
-                og_data[prop] = ""
+            og_data[prop] = doc.index.meta_content(property=prop) or ""
 
         return {
             "og_title": og_data["og:title"],
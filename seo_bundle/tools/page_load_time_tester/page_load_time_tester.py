@@ -5,10 +5,11 @@ This tool measures the time it takes to fetch a page using HTTP requests.
 It helps you gauge the network load time (not full browser render time) for a given URL.
 """
 
-from tools.base_tool import BaseTool
-import time
 import requests
 
+from tools.base_tool import BaseTool
+from core.document import PageDocument, fetch_document
+
 class PageLoadTimeTester(BaseTool):
     def __init__(self):
         super().__init__(
@@ -16,28 +17,31 @@ class PageLoadTimeTester(BaseTool):
             description="Measures the HTTP response time to load the web page."
         )
 
-    def run(self, url: str) -> dict:
+    def run_document(self, doc: PageDocument) -> dict:
         """
-        Measures how long it takes to fetch the page's HTML content using a GET request.
+        Reports how long it took to fetch the page's HTML content using a GET request.
         Returns the load time in seconds (rounded), status code, and any errors.
+        A page served from the response cache is fetched again, bypassing the
+        cache, since its elapsed time is not a load time.
         """
-        try:
-            start_time = time.time()
-            response = requests.get(url, timeout=15)
-            end_time = time.time()
-            load_time = round(end_time - start_time, 3)
-            status_code = response.status_code
+        if doc.from_cache:
+            try:
+                doc = fetch_document(doc.url, cache=False)
+            except requests.exceptions.RequestException as e:
+                return self.fetch_error(doc.url, e)
+        load_time = round(doc.elapsed, 3)
+        status_code = doc.status_code
 
-            return {
-                "url": url,
-                "status_code": status_code,
-                "load_time_seconds": load_time,
-                "message": f"Page loaded in {load_time} seconds (HTTP status: {status_code})."
-            }
+        return {
+            "url": doc.url,
+            "status_code": status_code,
+            "load_time_seconds": load_time,
+            "message": f"Page loaded in {load_time} seconds (HTTP status: {status_code})."
+        }
 
-        except requests.exceptions.RequestException as e:
-            return {
-                "url": url,
-                "error": str(e),
-                "message": "An error occurred while measuring page load time."
-            }
\ No newline at end of file
+    def fetch_error(self, url: str, error: Exception) -> dict:
+        return {
+            "url": url,
+            "error": str(error),
+            "message": "An error occurred while measuring page load time."
+        }
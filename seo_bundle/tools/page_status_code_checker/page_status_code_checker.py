@@ -4,28 +4,39 @@ Page Status Code Checker Tool
 Checks and returns the HTTP status code for the provided URL.
 """
 
+from typing import Iterable, List
+
 from tools.base_tool import BaseTool
-from core.utils import fetch_url
+from core.status_check import StatusChecker, StatusResult, check_status
 
 class PageStatusCodeChecker(BaseTool):
-    def __init__(self):
+    def __init__(self, timeout: float = 10):
         super().__init__(
             name="Page Status Code Checker",
             description="Checks the HTTP status code for a given URL."
         )
+        self.timeout = timeout
 
     def run(self, url: str) -> dict:
         """
-        Fetches the URL and returns the status code and a message.
+        Requests the URL with HEAD (or a GET closed after the headers) and returns the
+        status code, 4xx and 5xx included, the final URL after redirects and the time
+        until the headers arrived.
+        """
+        return self._result(check_status(url, timeout=self.timeout))
+
+    def run_many(self, urls: Iterable[str], workers: int = 32, per_host: int = 8) -> List[dict]:
         """
-        response = fetch_url(url)
-        status_code = getattr(response, "status_code", None)
-        if status_code:
-            message = f"Status code: {status_code}"
+        Checks many URLs (e.g. every URL of a sitemap) concurrently; one result per URL,
+        in input order.
+        """
+        checker = StatusChecker(workers=workers, per_host=per_host, timeout=self.timeout)
+        return [self._result(result) for result in checker.check_many(urls)]
+
+    def _result(self, result: StatusResult) -> dict:
+        output = result.to_dict()
+        if result.status_code:
+            output["message"] = f"Status code: {result.status_code}"
         else:
-            message = "Could not fetch the status code."
-        return {
-            "url": url,
-            "status_code": status_code,
-            "message": message
-        }
\ No newline at end of file
+            output["message"] = "Could not fetch the status code."
+        return output
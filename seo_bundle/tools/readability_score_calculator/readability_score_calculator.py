@@ -1,58 +1,71 @@
 # tools/readability_score_calculator/readability_score_calculator.py
 
-import streamlit as st
 from tools.base_tool import BaseTool
-from core.utils import get_page_content, get_text_from_html
-import textstat
-from typing import Dict, Any
+from core.document import PageDocument
+from core.readability import ReadabilityScorer
+from typing import Dict, Any, Iterable, List, Optional
 
 class ReadabilityScoreCalculator(BaseTool):
     """
-    Analyzes a webpage's text content and calculates its readability score.
-    Uses the Flesch-Kincaid reading ease formula via the textstat library.
+    Analyzes a webpage's text content and calculates its readability scores:
+    Flesch reading ease, Flesch-Kincaid grade, Gunning Fog, SMOG and Coleman-Liau,
+    all from one pass over the page's words (see core/readability.py).
     """
-    def __init__(self):
+    def __init__(self, scorer: Optional[ReadabilityScorer] = None):
         super().__init__(
             name="Readability Score Calculator",
             description="Analyzes text content for readability using the Flesch-Kincaid formula."
         )
+        # Shares one syllable cache across every page this tool scores
+        self.scorer = scorer or ReadabilityScorer()
 
-    def run(self, url: str) -> Dict[str, Any]:
+    def run_document(self, doc: PageDocument) -> Dict[str, Any]:
         """
-        Fetches the webpage content, extracts clean text, and calculates the readability score.
+        Extracts clean text from a fetched webpage and calculates the readability scores.
         
         Args:
-            url (str): The URL of the page to analyze.
+            doc (PageDocument): The fetched page to analyze.
 
         Returns:
-            Dict[str, Any]: A dictionary containing the readability score and a message.
+            Dict[str, Any]: A dictionary containing the readability scores and a message.
         """
         try:
-            soup = get_page_content(url)
-            if not soup:
+            if not doc.ok:
                 return {"error": "Could not fetch page content."}
-            
-            # Extract clean, readable text from the HTML
-            text = get_text_from_html(soup)
 
-            if not text:
+            page_text = doc.page_text
+            if not page_text.tokens:
                 return {"error": "Could not extract readable text from the page."}
 
-            # Use the textstat library to calculate the Flesch-Kincaid reading ease score
-            flesch_reading_ease = textstat.flesch_reading_ease(text)
-            flesch_kincaid_grade = textstat.flesch_kincaid_grade(text)
-            
-            # Determine a message based on the score
-            if flesch_reading_ease >= 60:
-                message = "The text is relatively easy to read and understand for a general audience."
-            else:
-                message = "The text may be somewhat difficult to read. Consider simplifying sentences."
-
-            return {
-                "url": url,
-                "flesch_reading_ease": flesch_reading_ease,
-                "flesch_kincaid_grade": flesch_kincaid_grade,
-                "message": message
-            }
+            return self._result(doc.url, self.scorer.score(page_text))
         except Exception as e:
             return {"error": f"An unexpected error occurred: {str(e)}"}
+
+    def run_many(self, docs: Iterable[PageDocument], processes: int = 0) -> List[Dict[str, Any]]:
+        """
+        Scores many pages, in a process pool when processes > 0; one result per
+        document, in input order. The syllable cache is saved afterwards if it
+        has a path (READABILITY_CONFIG["syllable_cache_path"]).
+        """
+        docs = list(docs)
+        texts = [doc.page_text.text for doc in docs if doc.ok and doc.page_text.tokens]
+        scores = iter(list(self.scorer.score_many(texts, processes=processes)))
+        if self.scorer.cache.path:
+            self.scorer.cache.save()
+        results = []
+        for doc in docs:
+            if not doc.ok:
+                results.append({"url": doc.url, "error": "Could not fetch page content."})
+            elif not doc.page_text.tokens:
+                results.append({"url": doc.url, "error": "Could not extract readable text from the page."})
+            else:
+                results.append(self._result(doc.url, next(scores)))
+        return results
+
+    def _result(self, url: str, scores: dict) -> Dict[str, Any]:
+        # Determine a message based on the score
+        if scores["flesch_reading_ease"] >= 60:
+            message = "The text is relatively easy to read and understand for a general audience."
+        else:
+            message = "The text may be somewhat difficult to read. Consider simplifying sentences."
+        return {"url": url, **scores, "message": message}
@@ -0,0 +1,95 @@
+"""
+tools/registry.py
+
+Lazy registry of every tool, keyed by display name.
+
+Tool modules are only imported when a tool is first requested, so a caller
+that runs two tools does not pay for importing the other 38 (or for their
+dependencies).
+"""
+
+import importlib
+from typing import Dict, Tuple
+
+from tools.base_tool import BaseTool
+
+# Display name -> (package under tools/, class name). The package name doubles as the tool's id.
+TOOL_REGISTRY: Dict[str, Tuple[str, str]] = {
+    "Meta Title Length Checker": ("meta_title_length_checker", "MetaTitleLengthChecker"),
+    "Meta Description Length Checker": ("meta_description_length_checker", "MetaDescriptionLengthChecker"),
+    "Keyword Density Calculator": ("keyword_density_calculator", "KeywordDensityCalculator"),
+    "H1 Tag Extractor": ("h1_tag_extractor", "H1TagExtractor"),
+    "Image Alt Tag Checker": ("image_alt_tag_checker", "ImageAltTagChecker"),
+    "Word Count Checker": ("word_count_checker", "WordCountChecker"),
+    "URL Slug Optimizer": ("url_slug_optimizer", "URLSlugOptimizer"),
+    "Canonical Tag Checker": ("canonical_tag_checker", "CanonicalTagChecker"),
+    "Robots.txt Fetcher & Parser": ("robots_txt_fetcher_parser", "RobotsTxtFetcherParser"),
+    "Sitemap.xml Fetcher & Validator": ("sitemap_xml_fetcher_validator", "SitemapXmlFetcherValidator"),
+    "Broken Link Checker": ("broken_link_checker", "BrokenLinkChecker"),
+    "Page Load Time Tester": ("page_load_time_tester", "PageLoadTimeTester"),
+    "Internal Link Counter": ("internal_link_counter", "InternalLinkCounter"),
+    "External Link Counter": ("external_link_counter", "ExternalLinkCounter"),
+    "Anchor Text Analyzer": ("anchor_text_analyzer", "AnchorTextAnalyzer"),
+    "Favicon Checker": ("favicon_checker", "FaviconChecker"),
+    "Structured Data Finder": ("structured_data_json_ld_finder", "StructuredDataFinder"),
+    "Heading Tag Structure Analyzer": ("heading_tag_structure_analyzer", "HeadingTagStructureAnalyzer"),
+    "Mobile Responsive Check": ("mobile_responsive_check", "MobileResponsiveCheck"),
+    "Social Meta Tag Extractor": ("social_meta_tag_extractor", "SocialMetaTagExtractor"),
+    "Schema Markup Presence Checker": ("schema_markup_presence_checker", "SchemaMarkupPresenceChecker"),
+    "Link Redirect Checker": ("link_redirect_checker", "LinkRedirectChecker"),
+    "Page Status Code Checker": ("page_status_code_checker", "PageStatusCodeChecker"),
+    "Keyword Suggestions from Related Words": ("keyword_suggestions_from_related_words", "KeywordSuggestionsFromRelatedWords"),
+    "Readability Score Calculator": ("readability_score_calculator", "ReadabilityScoreCalculator"),
+    "Keyword Case Converter": ("keyword_case_converter", "KeywordCaseConverter"),
+    "HTML Minifier": ("html_minifier", "HtmlMinifier"),
+    "CSS Minifier": ("css_minifier", "CssMinifier"),
+    "JS Minifier": ("js_minifier", "JsMinifier"),
+    "SERP Preview Simulator": ("serp_preview_simulator", "SerpPreviewSimulator"),
+    "Open Graph Preview": ("open_graph_preview", "OpenGraphPreview"),
+    "Twitter Card Preview": ("twitter_card_preview", "TwitterCardPreview"),
+    "Alt Tag Missing Finder": ("alt_tag_missing_finder", "AltTagMissingFinder"),
+    "Word Frequency Counter": ("word_frequency_counter", "WordFrequencyCounter"),
+    "Keyword Position Estimator": ("keyword_position_estimator", "KeywordPositionEstimator"),
+    "Backlink List Parser": ("backlink_list_parser", "BacklinkListParser"),
+    "YouTube Video Tag Extractor": ("youtube_video_tag_extractor", "YoutubeVideoTagExtractor"),
+    "Text-to-Keyword Generator": ("text_to_keyword_generator", "TextToKeywordGenerator"),
+    "Domain Age Checker": ("domain_age_checker", "DomainAgeChecker"),
+    "Email Obfuscator Generator": ("email_obfuscator_generator", "EmailObfuscatorGenerator"),
+}
+
+TOOL_IDS: Dict[str, str] = {module: name for name, (module, _) in TOOL_REGISTRY.items()}
+
+
+def resolve_tool_name(key: str) -> str:
+    """
+    Return the display name for a tool given its display name, id (package
+    name, e.g. "h1_tag_extractor") or class name.
+
+    Raises:
+        KeyError: If no tool matches.
+    """
+    if key in TOOL_REGISTRY:
+        return key
+    if key in TOOL_IDS:
+        return TOOL_IDS[key]
+    for name, (_, class_name) in TOOL_REGISTRY.items():
+        if key == class_name:
+            return name
+    raise KeyError(f"Unknown tool: {key}")
+
+
+def load_tool_class(key: str) -> type:
+    """Import and return the class of a tool."""
+    module_name, class_name = TOOL_REGISTRY[resolve_tool_name(key)]
+    module = importlib.import_module(f"tools.{module_name}.{module_name}")
+    return getattr(module, class_name)
+
+
+def create_tool(key: str) -> BaseTool:
+    """Import a tool and return a new instance with default settings."""
+    return load_tool_class(key)()
+
+
+def create_all_tools() -> Dict[str, BaseTool]:
+    """Instantiate every registered tool, keyed by display name."""
+    return {name: create_tool(name) for name in TOOL_REGISTRY}
@@ -3,28 +3,41 @@ tools/robots_txt_fetcher_parser/robots_txt_fetcher_parser.py
 Robots.txt Fetcher & Parser Tool.
 """
 
-import streamlit as st
+from typing import Optional
+
 import requests
+from core import http_client
+from core.robots import RobotsCache, parse_robots
+from core.urls import url_origin
 from tools.base_tool import BaseTool
 
 class RobotsTxtFetcherParser(BaseTool):
     def __init__(self):
         super().__init__(
             name="Robots.txt Fetcher & Parser",
-            description="Fetches and displays the robots.txt file for a given URL."
+            description="Fetches and parses the robots.txt file for a given URL."
         )
+        # Shared by run() and is_allowed(), so a host's robots.txt is parsed once per TTL
+        self.robots = RobotsCache(timeout=5)
 
     def run(self, url: str) -> dict:
         """
-        Fetches the robots.txt file for a given URL and returns its content.
+        Fetches the robots.txt file of the URL's host and returns its content, its groups
+        (user-agents, Allow/Disallow rules, Crawl-delay) and Sitemap lines, and whether
+        the URL itself may be crawled by any crawler ("*").
         """
-        robots_url = url.rstrip('/') + '/robots.txt'
+        origin = url_origin(url)
+        robots_url = origin + '/robots.txt'
         try:
-            response = requests.get(robots_url, timeout=5)
+            response = http_client.get(robots_url, timeout=5)
             if response.status_code == 200:
+                rules = parse_robots(response.text)
+                self.robots.store(origin, rules)
                 return {
                     "status": "Found",
-                    "robots_txt_content": response.text
+                    "robots_txt_content": response.text,
+                    **rules.to_dict(),
+                    "url_allowed_for_all_agents": rules.is_allowed(url, "*"),
                 }
             else:
                 return {
@@ -37,12 +50,28 @@ class RobotsTxtFetcherParser(BaseTool):
                 "message": f"An error occurred while fetching robots.txt: {e}"
             }
 
+    def is_allowed(self, url: str, agent: Optional[str] = None) -> bool:
+        """
+        Whether `agent` (a User-Agent string or product token; default: this bundle's
+        User-Agent) may crawl `url`. The host's robots.txt is fetched on first use and
+        cached, so checking many URLs of a site costs one request.
+        """
+        return self.robots.is_allowed(url, agent)
+
 # Streamlit UI (for testing or as a standalone tool page)
 if __name__ == "__main__":
+    import streamlit as st
+
     st.title("Robots.txt Fetcher & Parser")
     st.write("Analyze the robots.txt file for any web page.")
     url = st.text_input("Enter URL to analyze")
+    agent = st.text_input("User-agent to check", value="*")
     if st.button("Fetch robots.txt") and url:
         tool = RobotsTxtFetcherParser()
         result = tool.run(url)
+        if result["status"] == "Found":
+            if tool.is_allowed(url, agent or "*"):
+                st.success(f"{agent or '*'} may crawl {url}")
+            else:
+                st.warning(f"{agent or '*'} may not crawl {url}")
         st.json(result)
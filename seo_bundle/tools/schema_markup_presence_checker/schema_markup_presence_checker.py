@@ -5,7 +5,7 @@ Checks if the page contains any schema.org markup via Microdata, RDFa, or JSON-L
 """
 
 from tools.base_tool import BaseTool
-from core.utils import get_page_content
+from core.document import PageDocument
 
 class SchemaMarkupPresenceChecker(BaseTool):
     def __init__(self):
@@ -14,14 +14,14 @@ class SchemaMarkupPresenceChecker(BaseTool):
             description="Checks for the presence of schema.org markup (Microdata, RDFa, or JSON-LD)."
         )
 
-    def run(self, url: str) -> dict:
+    def run_document(self, doc: PageDocument) -> dict:
         """
         Checks for schema.org in microdata, RDFa, or JSON-LD.
         Returns a dict indicating presence and examples.
         """
-        soup = get_page_content(url)
-        if not soup:
+        if not doc.ok:
             return {"error": "Could not fetch page content."}
+        soup = doc.soup
 
         found = False
         details = []
@@ -4,9 +4,7 @@ tools/serp_preview_simulator/serp_preview_simulator.py
 SERP Preview Simulator Tool.
 """
 
-import streamlit as st
-import requests
-from bs4 import BeautifulSoup
+from core.document import PageDocument
 from tools.base_tool import BaseTool
 
 class SerpPreviewSimulator(BaseTool):
@@ -16,17 +14,18 @@ class SerpPreviewSimulator(BaseTool):
             description="Simulates how a page title and description will look in Google SERP."
         )
 
-    def run(self, url: str) -> dict:
+    def run_document(self, doc: PageDocument) -> dict:
         """
         Fetches a page's title and description to simulate SERP preview.
         """
-        st.text("SerpPreviewSimulator tool is running...")
         try:
-            st.info(f"Fetching content from: {url}")
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
+            if not doc.ok:
+                return {
+                    "status": "Error",
+                    "message": f"An error occurred while fetching the page: HTTP {doc.status_code}"
+                }
 
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = doc.soup
             
             # Extract title tag
             title = soup.find('title').string if soup.find('title') else "No title found"
@@ -45,19 +44,22 @@ class SerpPreviewSimulator(BaseTool):
                 "page_title": title,
                 "meta_description": meta_description
             }
-        except requests.exceptions.RequestException as e:
-            return {
-                "status": "Error",
-                "message": f"An error occurred while fetching the page: {e}"
-            }
         except Exception as e:
             return {
                 "status": "Error",
                 "message": f"An unexpected error occurred: {e}"
             }
 
+    def fetch_error(self, url: str, error: Exception) -> dict:
+        return {
+            "status": "Error",
+            "message": f"An error occurred while fetching the page: {error}"
+        }
+
 # Streamlit UI (for testing or as a standalone tool page)
 if __name__ == "__main__":
+    import streamlit as st
+
     st.title("SERP Preview Simulator")
     st.write("Enter a URL to see how it might appear in Google search results.")
     url = st.text_input("Enter URL", placeholder="https://www.example.com")
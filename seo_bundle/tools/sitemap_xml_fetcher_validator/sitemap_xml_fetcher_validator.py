@@ -4,77 +4,106 @@ tools/sitemap_xml_fetcher_validator/sitemap_xml_fetcher_validator.py
 Sitemap XML Fetcher & Validator Tool.
 """
 
-import streamlit as st
-import requests
-from bs4 import BeautifulSoup
+from core.robots import RobotsCache
+from core.sitemap import SitemapReader, default_sitemap_url
 from tools.base_tool import BaseTool
 
+# URLs returned in the result; every URL is still counted and validated
+SAMPLE_URLS = 20
+
 class SitemapXmlFetcherValidator(BaseTool):
-    def __init__(self):
+    def __init__(self, timeout: float = 10):
         super().__init__(
             name="Sitemap.xml Fetcher & Validator",
             description="Fetches and validates the sitemap.xml file of a website."
         )
+        self.timeout = timeout
+        self.robots = RobotsCache(timeout=timeout)
 
     def run(self, url: str) -> dict:
         """
-        Fetches a sitemap.xml file and extracts all URLs.
+        Streams a site's sitemaps (those listed in its robots.txt, else /sitemap.xml, or the
+        given .xml/.xml.gz URL), follows sitemap index files and counts every URL, checking
+        each file against the protocol limits (50,000 URLs and 50 MB uncompressed).
         """
-        sitemap_url = url.rstrip('/') + '/sitemap.xml'
-        try:
-            st.info(f"Attempting to fetch sitemap from: {sitemap_url}")
-            response = requests.get(sitemap_url, timeout=10)
-            
-            if response.status_code != 200:
-                return {
-                    "status": "Error",
-                    "message": f"Could not fetch sitemap.xml. Status code: {response.status_code}"
-                }
-
-            sitemap_content = response.text
-            soup = BeautifulSoup(sitemap_content, 'xml')
-            
-            urls = []
-            for loc in soup.find_all('loc'):
-                urls.append(loc.text)
+        listed = []
+        if not url.lower().endswith((".xml", ".xml.gz")):
+            listed = list(dict.fromkeys(self.robots.rules_for(url).sitemaps))
+        sitemap_urls = listed or [default_sitemap_url(url)]
+        self.emit("message", level="info", text=f"Attempting to fetch sitemap from: {', '.join(sitemap_urls)}")
 
-            if not urls:
-                return {
-                    "status": "Valid",
-                    "message": "Sitemap.xml found, but no URLs were extracted. It may be empty or malformed."
-                }
-
-            return {
-                "status": "Valid",
-                "total_urls": len(urls),
-                "urls": urls[:20]  # Displaying the first 20 URLs for brevity
-            }
-
-        except requests.exceptions.RequestException as e:
-            return {
-                "status": "Error",
-                "message": f"An error occurred while fetching sitemap.xml: {e}"
-            }
+        reader = SitemapReader(timeout=self.timeout)
+        total_urls = 0
+        sample = []
+        files_done = 0
+        try:
+            for entry in reader.iter_entries(sitemap_urls):
+                total_urls += 1
+                if len(sample) < SAMPLE_URLS:
+                    sample.append(entry.loc)
+                if len(reader.files) != files_done:
+                    files_done = len(reader.files)
+                    self.emit("progress", done=files_done, total=reader.sitemaps_found,
+                              text=f"Read {files_done} sitemap file(s), {total_urls} URLs so far")
         except Exception as e:
             return {
                 "status": "Error",
                 "message": f"An unexpected error occurred during sitemap parsing: {e}"
             }
+        self.emit("progress", done=len(reader.files), total=reader.sitemaps_found,
+                  text=f"Read {len(reader.files)} sitemap file(s), {total_urls} URLs")
+
+        roots = [f for f in reader.files if f.url in sitemap_urls]
+        if roots and not any(root.status_code == 200 for root in roots):
+            root = roots[0]
+            name = "sitemap.xml" if root.url == default_sitemap_url(url) else root.url
+            message = (f"Could not fetch {name}. Status code: {root.status_code}" if root.status_code
+                       else root.errors[0])
+            return {"status": "Error", "message": message}
+
+        problems = [
+            {"sitemap": f.url, "errors": f.errors, "error_count": f.error_count}
+            for f in reader.files if not f.ok
+        ]
+        result = {
+            "status": "Invalid" if problems else "Valid",
+            "total_urls": total_urls,
+            "sitemaps_read": len(reader.files),
+            "sitemap_index": any(root.kind == "sitemapindex" for root in roots),
+            "listed_in_robots_txt": bool(listed),
+            "urls": sample,
+            "sitemaps": [f.to_dict() for f in reader.files[:50]],
+        }
+        if problems:
+            result["problems"] = problems
+        if reader.skipped_sitemaps:
+            result["sitemaps_not_read"] = reader.skipped_sitemaps
+        if not total_urls:
+            result["message"] = "Sitemap.xml found, but no URLs were extracted. It may be empty or malformed."
+        else:
+            result["message"] = (f"Found {total_urls} URLs in {len(reader.files)} sitemap file(s)"
+                                 + (f"; {len(problems)} file(s) have problems." if problems else "."))
+        return result
 
 # Streamlit UI (for testing or as a standalone tool page)
 if __name__ == "__main__":
+    import streamlit as st
+
     st.title("Sitemap.xml Fetcher & Validator")
     st.write("Enter a URL to fetch and validate its sitemap.xml file.")
     url = st.text_input("Enter URL", placeholder="https://www.example.com")
-    
+
     if st.button("Run Analysis") and url:
         tool = SitemapXmlFetcherValidator()
         result = tool.run(url)
-        
+
         st.subheader("Results")
         if result["status"] == "Error":
             st.error(result["message"])
-        elif "total_urls" in result:
+        elif result["status"] == "Invalid":
+            st.warning(result["message"])
+            st.json(result)
+        elif result["total_urls"]:
             st.success(f"Sitemap.xml successfully fetched and validated. Found {result['total_urls']} URLs.")
             st.json(result)
         else:
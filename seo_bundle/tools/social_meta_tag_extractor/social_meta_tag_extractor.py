@@ -5,28 +5,28 @@ Extracts Open Graph (OG) and Twitter Card meta tags for social sharing optimizat
 """
 
 from tools.base_tool import BaseTool
-from core.utils import get_page_content
+from core.document import PageDocument
 
 class SocialMetaTagExtractor(BaseTool):
+    streamable = True
+
     def __init__(self):
         super().__init__(
             name="Social Meta Tag Extractor",
             description="Extracts Open Graph and Twitter Card meta tags from the page."
         )
 
-    def run(self, url: str) -> dict:
+    def run_document(self, doc: PageDocument) -> dict:
         """
         Extracts OG and Twitter Card meta tags from the HTML.
         Returns a dict with all found social meta tags and their values.
         """
-        soup = get_page_content(url)
-        if not soup:
+        if not doc.ok:
             return {"error": "Could not fetch page content."}
-
         og_tags = {}
         twitter_tags = {}
 
-        for tag in soup.find_all("meta"):
+        for tag in doc.index.metas:
             prop = tag.get("property") or tag.get("name")
             if not prop:
                 continue
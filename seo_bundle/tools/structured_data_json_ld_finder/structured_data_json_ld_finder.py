@@ -4,76 +4,72 @@ tools/structured_data_json_ld_finder/structured_data_json_ld_finder.py
 Structured Data Finder Tool.
 """
 
-import streamlit as st
-import requests
-from bs4 import BeautifulSoup
 import json
+from core.document import PageDocument
 from tools.base_tool import BaseTool
 
 class StructuredDataFinder(BaseTool):
+    streamable = True
+
     def __init__(self):
         super().__init__(
             name="Structured Data Finder",
             description="Finds and extracts JSON-LD structured data from a webpage."
         )
 
-    def run(self, url: str) -> dict:
+    def run_document(self, doc: PageDocument) -> dict:
         """
         Finds and extracts JSON-LD structured data from a webpage.
         """
-        st.text("StructuredDataFinder tool is running...")
         structured_data_list = []
-        try:
-            st.info(f"Fetching content from: {url}")
-            response = requests.get(url, timeout=10)
-            if response.status_code != 200:
-                return {
-                    "status": "Error",
-                    "message": f"Could not fetch page content. Status code: {response.status_code}"
-                }
-
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            json_ld_scripts = soup.find_all('script', type='application/ld+json')
+        if doc.status_code != 200:
+            return {
+                "status": "Error",
+                "message": f"Could not fetch page content. Status code: {doc.status_code}"
+            }
 
-            if not json_ld_scripts:
-                return {
-                    "status": "Info",
-                    "message": "No JSON-LD structured data found on the page."
-                }
+        json_ld_scripts = doc.index.json_ld
 
-            for script in json_ld_scripts:
-                try:
-                    data = json.loads(script.string)
-                    structured_data_list.append(data)
-                except json.JSONDecodeError as e:
-                    structured_data_list.append({
-                        "error": "JSON Decode Error",
-                        "message": str(e),
-                        "script_content": script.string
-                    })
+        if not json_ld_scripts:
+            return {
+                "status": "Info",
+                "message": "No JSON-LD structured data found on the page."
+            }
 
-            if structured_data_list:
-                return {
-                    "status": "Success",
-                    "message": f"Found {len(structured_data_list)} JSON-LD structured data blocks.",
-                    "structured_data": structured_data_list
-                }
-            else:
-                return {
-                    "status": "Warning",
-                    "message": "Found <script type='application/ld+json'> tags, but could not parse the content.",
-                    "structured_data": structured_data_list
-                }
+        for script in json_ld_scripts:
+            try:
+                data = json.loads(script)
+                structured_data_list.append(data)
+            except json.JSONDecodeError as e:
+                structured_data_list.append({
+                    "error": "JSON Decode Error",
+                    "message": str(e),
+                    "script_content": script
+                })
 
-        except requests.exceptions.RequestException as e:
+        if structured_data_list:
             return {
-                "status": "Error",
-                "message": f"An error occurred while fetching the page: {e}"
+                "status": "Success",
+                "message": f"Found {len(structured_data_list)} JSON-LD structured data blocks.",
+                "structured_data": structured_data_list
+            }
+        else:
+            return {
+                "status": "Warning",
+                "message": "Found <script type='application/ld+json'> tags, but could not parse the content.",
+                "structured_data": structured_data_list
             }
 
+    def fetch_error(self, url: str, error: Exception) -> dict:
+        return {
+            "status": "Error",
+            "message": f"An error occurred while fetching the page: {error}"
+        }
+
 # Streamlit UI (for testing or as a standalone tool page)
 if __name__ == "__main__":
+    import streamlit as st
+
     st.title("Structured Data Finder")
     st.write("Enter a URL to find JSON-LD structured data.")
     url = st.text_input("Enter URL", placeholder="https://www.example.com")
@@ -5,7 +5,7 @@ Extracts the most frequent keywords from the given text (expects text in the URL
 """
 
 from tools.base_tool import BaseTool
-import re
+from core.text import tokenize
 from collections import Counter
 
 class TextToKeywordGenerator(BaseTool):
@@ -20,10 +20,7 @@ class TextToKeywordGenerator(BaseTool):
         Expects text in the 'url' parameter.
         Returns the most frequent keywords.
         """
-        text = url
-        text = re.sub(r'[^\w\s]', '', text)
-        text = text.lower()
-        words = text.split()
+        words = tokenize(url)
         # Remove common stopwords
         stopwords = set([
             "the", "and", "a", "an", "of", "to", "for", "in", "on", "at", "with", "is", "it", "by", "this", "that",
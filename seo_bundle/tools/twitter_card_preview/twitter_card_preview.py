@@ -5,30 +5,26 @@ Returns the core Twitter Card tags for visual preview in a card-style interface.
 """
 
 from tools.base_tool import BaseTool
-from core.utils import get_page_content
+from core.document import PageDocument
 
 class TwitterCardPreview(BaseTool):
+    streamable = True
+
     def __init__(self):
         super().__init__(
             name="Twitter Card Preview",
             description="Returns key Twitter Card tags for visual preview."
         )
 
-    def run(self, url: str) -> dict:
+    def run_document(self, doc: PageDocument) -> dict:
         """
         Extracts twitter:title, twitter:description, twitter:image, and twitter:card for preview.
         """
-        soup = get_page_content(url)
-        if not soup:
+        if not doc.ok:
             return {"error": "Could not fetch page content."}
-
         tw_data = {}
         for prop in ["twitter:title", "twitter:description", "twitter:image", "twitter:card"]:
-            tag = soup.find("meta", attrs={"name": prop})
-            if tag and tag.has_attr("content"):
-                tw_data[prop] = tag["content"]
-            else:
-                tw_data[prop] = ""
+            tw_data[prop] = doc.index.meta_content(name=prop) or ""
 
         return {
             "twitter_title": tw_data["twitter:title"],
@@ -6,7 +6,7 @@ It fetches the HTML content, extracts visible text, and returns the word count.
 """
 
 from tools.base_tool import BaseTool
-from core.utils import get_page_content, get_text_from_html
+from core.document import PageDocument
 
 class WordCountChecker(BaseTool):
     def __init__(self):
@@ -15,18 +15,15 @@ class WordCountChecker(BaseTool):
             description="Counts the total number of words on the web page."
         )
 
-    def run(self, url: str) -> dict:
+    def run_document(self, doc: PageDocument) -> dict:
         """
         Fetch the page, extract visible text, and count the number of words.
         Returns a dict with the total word count and a message.
         """
-        soup = get_page_content(url)
-        if not soup:
+        if not doc.ok:
             return {"error": "Could not fetch page content."}
 
-        text = get_text_from_html(soup)
-        words = text.split()
-        count = len(words)
+        count = doc.page_text.word_count
 
         return {
             "word_count": count,
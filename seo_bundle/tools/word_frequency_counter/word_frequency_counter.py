@@ -2,34 +2,36 @@
 Word Frequency Counter Tool
 
 Counts the frequency of each word in the visible text of the page.
+
+In aggregation mode (a WordFrequencySketch passed in) every analyzed page is also added to
+site-wide word and bigram counts kept in bounded memory; see core/heavy_hitters.py.
 """
 
+from typing import Optional
 from tools.base_tool import BaseTool
-from core.utils import get_page_content
-import re
+from core.document import PageDocument
+from core.heavy_hitters import WordFrequencySketch
 from collections import Counter
 
 class WordFrequencyCounter(BaseTool):
-    def __init__(self):
+    def __init__(self, sketch: Optional[WordFrequencySketch] = None):
         super().__init__(
             name="Word Frequency Counter",
             description="Counts the frequency of each word in the page's visible text."
         )
+        # Site-wide aggregation; pages analyzed in worker processes are not added to it
+        self.sketch = sketch
 
-    def run(self, url: str) -> dict:
+    def run_document(self, doc: PageDocument) -> dict:
         """
         Returns a frequency count of words in the page text.
         """
-        soup = get_page_content(url)
-        if not soup:
+        if not doc.ok:
             return {"error": "Could not fetch page content."}
 
-        for script in soup(["script", "style"]):
-            script.decompose()
-        text = soup.get_text(separator=" ")
-        text = re.sub(r'[^\w\s]', '', text)
-        text = text.lower()
-        words = text.split()
+        if self.sketch is not None:
+            self.sketch.add_page(doc.page_text)
+        words = doc.page_text.tokens
         freq = Counter(words)
         common = freq.most_common(20)
 
@@ -38,4 +40,14 @@ class WordFrequencyCounter(BaseTool):
             "unique_words": len(freq),
             "top_20_words": common,
             "message": "Word frequency analysis complete."
-        }
\ No newline at end of file
+        }
+
+    def site_summary(self, top: int = 20) -> dict:
+        """
+        Site-level top words and bigrams of every page analyzed so far (aggregation mode only).
+        """
+        if self.sketch is None:
+            return {"error": "No site-wide counts: the tool was created without a WordFrequencySketch."}
+        summary = self.sketch.top(top)
+        summary["message"] = f"Top {top} words and bigrams across {summary['pages']} page(s)."
+        return summary
@@ -4,9 +4,8 @@ tools/youtube_video_tag_extractor/youtube_video_tag_extractor.py
 YouTube Video Tag Extractor Tool.
 """
 
-import streamlit as st
-import requests
 import re
+from core.document import PageDocument
 from tools.base_tool import BaseTool
 
 class YoutubeVideoTagExtractor(BaseTool):
@@ -20,21 +19,27 @@ class YoutubeVideoTagExtractor(BaseTool):
         """
         Extracts tags from a YouTube video page.
         """
-        st.text("YoutubeVideoTagExtractor tool is running...")
         if "youtube.com/watch" not in url:
             return {
                 "status": "Error",
                 "message": "Invalid URL. Please provide a valid YouTube video URL."
             }
-        
+        return super().run(url)
+
+    def run_document(self, doc: PageDocument) -> dict:
+        """
+        Extracts tags from an already fetched YouTube video page.
+        """
         try:
-            st.info(f"Fetching content from: {url}")
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
+            if not doc.ok:
+                return {
+                    "status": "Error",
+                    "message": f"An error occurred while fetching the page: HTTP {doc.status_code}"
+                }
 
             # YouTube page source often contains a 'keywords' meta tag
             # We can use a regex to find this tag and extract the content
-            tags_match = re.search(r'\"keywords\":\[(.*?)\]', response.text)
+            tags_match = re.search(r'\"keywords\":\[(.*?)\]', doc.text)
 
             if tags_match:
                 tags_string = tags_match.group(1)
@@ -51,19 +56,22 @@ class YoutubeVideoTagExtractor(BaseTool):
                     "status": "Info",
                     "message": "No tags found for this video."
                 }
-        except requests.exceptions.RequestException as e:
-            return {
-                "status": "Error",
-                "message": f"An error occurred while fetching the page: {e}"
-            }
         except Exception as e:
             return {
                 "status": "Error",
                 "message": f"An unexpected error occurred: {e}"
             }
 
+    def fetch_error(self, url: str, error: Exception) -> dict:
+        return {
+            "status": "Error",
+            "message": f"An error occurred while fetching the page: {error}"
+        }
+
 # Streamlit UI (for testing or as a standalone tool page)
 if __name__ == "__main__":
+    import streamlit as st
+
     st.title("YouTube Video Tag Extractor")
     st.write("Enter a YouTube video URL to extract its tags.")
     url = st.text_input("Enter URL", placeholder="https://www.youtube.com/watch?v=dQw4w9WgXcQ")